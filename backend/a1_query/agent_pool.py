@@ -0,0 +1,156 @@
+import asyncio
+import queue
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+from phi.agent import Agent
+
+
+class AgentPool:
+    """Thread-safe pool of long-lived agents built by one factory.
+
+    A phidata ``Agent`` keeps per-run state (memory, run ids), so a single
+    instance must not serve two queries at once. The pool hands each caller
+    an exclusive agent, builds at most ``size`` of them, and clears an
+    agent's memory before returning it so runs do not leak into each other.
+    """
+
+    def __init__(self, factory: Callable[[], Agent], size: int = 4):
+        self.factory = factory
+        self.size = size
+        # Idle agents (most recently released last) and the build count, both guarded by ``_cond``;
+        # threads wait on it for either an idle agent or a free build slot
+        self._idle: List[Agent] = []
+        self._created = 0
+        self._cond = threading.Condition()
+        # Coroutines waiting on a busy pool, each woken on its own loop when an agent is released
+        self._waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+
+    def warm_up(self, count: Optional[int] = None) -> int:
+        """Build agents ahead of the first query; returns how many are idle"""
+        target = min(self.size, count if count is not None else self.size)
+        while True:
+            with self._cond:
+                if self._created >= target:
+                    break
+                self._created += 1
+            self._put(self._build())
+        with self._cond:
+            return len(self._idle)
+
+    @contextmanager
+    def acquire(self, timeout: Optional[float] = None) -> Iterator[Agent]:
+        """Borrow an agent, waiting for one to be released if all are busy"""
+        agent = self._checkout(timeout)
+        try:
+            yield agent
+        finally:
+            self._release(agent)
+
+    @asynccontextmanager
+    async def aacquire(self, timeout: Optional[float] = None) -> AsyncIterator[Agent]:
+        """``acquire`` for coroutines: a busy pool is waited on without blocking the event loop.
+
+        New agents are built in a worker thread; waiters sleep until a
+        release (from any thread or loop) wakes them.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while True:
+            agent, build = self._reserve()
+            if agent is not None:
+                break
+            if build:
+                agent = await asyncio.to_thread(self._build)
+                break
+            waiter = loop.create_future()
+            with self._cond:
+                self._waiters.append((loop, waiter))
+                # A release between the reservation and registering would otherwise go unnoticed
+                if self._idle or self._created < self.size:
+                    _wake(waiter)
+            remaining = None if deadline is None else deadline - loop.time()
+            try:
+                await asyncio.wait_for(waiter, remaining)
+            except BaseException as e:
+                with self._cond:
+                    if (loop, waiter) in self._waiters:
+                        self._waiters.remove((loop, waiter))
+                if waiter.done() and not waiter.cancelled():
+                    # Woken but leaving anyway: pass the wake-up on to the next waiter
+                    self._notify()
+                if isinstance(e, asyncio.TimeoutError):
+                    raise queue.Empty from None
+                raise
+        try:
+            yield agent
+        finally:
+            self._release(agent)
+
+    def _checkout(self, timeout: Optional[float]) -> Agent:
+        """An idle agent or a newly built one, waiting until either is possible; ``queue.Empty`` on timeout"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                agent, build = self._reserve_locked()
+                if agent is not None or build:
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise queue.Empty
+                self._cond.wait(remaining)
+        return agent if agent is not None else self._build()
+
+    def _reserve(self) -> Tuple[Optional[Agent], bool]:
+        """An idle agent, or ``(None, True)`` with a build slot counted while under ``size``"""
+        with self._cond:
+            return self._reserve_locked()
+
+    def _reserve_locked(self) -> Tuple[Optional[Agent], bool]:
+        if self._idle:
+            return self._idle.pop(), False
+        build = self._created < self.size
+        if build:
+            self._created += 1
+        return None, build
+
+    def _build(self) -> Agent:
+        """Run the factory for a slot already counted in ``_created``, giving the slot back if it fails"""
+        try:
+            return self.factory()
+        except Exception:
+            with self._cond:
+                self._created -= 1
+            self._notify()
+            raise
+
+    def _release(self, agent: Agent):
+        agent.memory.clear()
+        self._put(agent)
+
+    def _put(self, agent: Agent):
+        with self._cond:
+            self._idle.append(agent)
+        self._notify()
+
+    def _notify(self):
+        """Wake one waiting thread and the longest-waiting coroutine still waiting"""
+        with self._cond:
+            self._cond.notify()
+            while self._waiters:
+                loop, waiter = self._waiters.popleft()
+                if not waiter.done() and not loop.is_closed():
+                    loop.call_soon_threadsafe(_wake, waiter)
+                    return
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {"size": self.size, "created": self._created, "idle": len(self._idle)}
+
+
+def _wake(waiter: asyncio.Future):
+    if not waiter.done():
+        waiter.set_result(None)
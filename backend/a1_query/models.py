@@ -22,7 +22,7 @@ class QueryParameters(BaseModel):
         default_factory=dict,
         description="Mapped entity IDs: drivers, constructors, circuits"
     )
-    metrics: List[Literal["results", "qualifying", "laps", "pitstops", "standings", "status"]] = Field(
+    metrics: List[Literal["results", "qualifying", "laps", "pitstops", "standings", "progression", "status"]] = Field(
         default_factory=list,
         description="Required data types from endpoints.md"
     )
@@ -35,6 +35,11 @@ class QueryParameters(BaseModel):
         description="Whether comparison between entities is needed"
     )
 
+class SQLPlan(BaseModel):
+    """SQL answering a query over the tables its endpoints were loaded into"""
+    sql: str = Field(description="One SELECT statement over the listed tables")
+    explanation: str = Field(default="", description="How the statement answers the query")
+
 class EndpointInfo(BaseModel):
     """Detailed information about an endpoint"""
     url: str = Field(description="Complete Ergast API URL")
@@ -0,0 +1,123 @@
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+from api.mappings import DRIVER_DISPLAY_TO_API, DRIVER_IDS
+from .driver_mapping import DriverIDMapper
+from .models import QueryParameters
+
+DEFAULT_CACHE_FILE = Path.home() / ".cache" / "f1_pipeline" / "query_cache.json"
+
+
+def _build_alias_table() -> Dict[str, str]:
+    """Spoken driver names (``lewis hamilton``, ``oscar piastri``) to Ergast IDs"""
+    aliases = {}
+    for source in (DriverIDMapper.DRIVER_MAPPINGS, DRIVER_IDS, DRIVER_DISPLAY_TO_API):
+        for alias, ergast_id in source.items():
+            aliases[alias.replace("_", " ")] = ergast_id
+    return aliases
+
+
+DRIVER_ALIASES = _build_alias_table()
+# Longest aliases first so "carlos sainz jr" wins over "carlos sainz"
+ALIAS_PATTERN = re.compile(
+    r"\b(" + "|".join(re.escape(a) for a in sorted(DRIVER_ALIASES, key=len, reverse=True)) + r")\b"
+)
+POSSESSIVE_PATTERN = re.compile(r"['’]s\b")
+# Punctuation that changes the question: "2019-2023" is a range, "2019, 2023" two seasons
+RANGE_PATTERN = re.compile(r"[-–—]")
+LIST_PATTERN = re.compile(r"[,&]")
+PUNCTUATION_PATTERN = re.compile(r"[^\w\s]")
+
+
+def normalize_query(query: str) -> str:
+    """Canonical form of a query: lowercase, ranges as "to", lists as "and", no other punctuation, driver IDs"""
+    text = POSSESSIVE_PATTERN.sub("", query.lower())
+    text = LIST_PATTERN.sub(" and ", RANGE_PATTERN.sub(" to ", text))
+    text = " ".join(PUNCTUATION_PATTERN.sub(" ", text).split())
+    return ALIAS_PATTERN.sub(lambda m: DRIVER_ALIASES[m.group(1)], text)
+
+
+class QueryCache:
+    """Maps query text to the ``QueryParameters`` the understanding agent extracted.
+
+    Lookups try the raw query first, then its normalized form, so
+    "Lewis Hamilton's 2023 results" and "hamilton 2023 results?" share one
+    entry. Entries are kept in LRU order, expire after ``max_age`` seconds
+    (relative phrases like "this season" depend on the date) and are
+    persisted to a JSON file so they survive restarts.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path, None] = None,
+        max_entries: int = 1024,
+        max_age: float = 7 * 24 * 60 * 60,
+    ):
+        self.path = Path(path or os.getenv("F1_QUERY_CACHE") or DEFAULT_CACHE_FILE)
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()  # normalized -> {params, created}
+        self._exact: Dict[str, str] = {}  # raw query -> normalized key
+        self._stats = {"exact_hits": 0, "normalized_hits": 0, "misses": 0}
+        self._load()
+
+    def get(self, query: str) -> Optional[QueryParameters]:
+        with self._lock:
+            key = self._exact.get(query)
+            kind = "exact_hits"
+            if key is None:
+                key = normalize_query(query)
+                kind = "normalized_hits"
+            entry = self._entries.get(key)
+            if entry is None or time.time() - entry["created"] > self.max_age:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._exact[query] = key
+            self._stats[kind] += 1
+            return QueryParameters.model_validate(entry["params"])
+
+    def put(self, query: str, params: QueryParameters):
+        key = normalize_query(query)
+        with self._lock:
+            self._entries[key] = {"params": params.model_dump(), "created": time.time()}
+            self._entries.move_to_end(key)
+            self._exact[query] = key
+            while len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                self._exact = {q: k for q, k in self._exact.items() if k != evicted}
+            self._save()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._exact.clear()
+            self._save()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._stats, "entries": len(self._entries)}
+
+    def _load(self):
+        try:
+            data = json.loads(self.path.read_text())
+        except (FileNotFoundError, ValueError):
+            return
+        for key, entry in data.get("entries", {}).items():
+            self._entries[key] = entry
+        self._exact = {q: k for q, k in data.get("exact", {}).items() if k in self._entries}
+
+    def _save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump({"entries": self._entries, "exact": self._exact}, f)
+        os.replace(tmp, self.path)
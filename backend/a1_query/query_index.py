@@ -1,3 +1,4 @@
+import logging
 from typing import Dict, List, Optional
 import os
 import json
@@ -8,6 +9,8 @@ INDEX_DIR = Path(__file__).parent.parent.parent / "eval"
 INDEX_DIR.mkdir(exist_ok=True, parents=True)
 INDEX_FILE = INDEX_DIR / "query_index.json"
 
+logger = logging.getLogger(__name__)
+
 class QueryIndex:
     def __init__(self):
         self.queries: Dict[int, Dict] = {}
@@ -51,7 +54,7 @@ class QueryIndex:
             with open(INDEX_FILE, 'r') as f:
                 self.queries = json.load(f)
         else:
-            print(f"Warning: Query index file not found at {INDEX_FILE}")
+            logger.warning("Query index file not found at %s", INDEX_FILE)
             self.queries = {"total_queries": 0, "queries": {}}
         
     def _save_index(self):
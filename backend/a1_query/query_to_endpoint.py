@@ -1,3 +1,4 @@
+import logging
 from typing import List, Dict, Optional, Literal, Any
 from pydantic import BaseModel, Field
 from phi.agent import Agent
@@ -6,19 +7,43 @@ import os
 from dotenv import load_dotenv
 from .query_index import query_index
 from .url_builder import ErgastURLBuilder
+from api.endpoint import Endpoint
+from a2_transform.sql import describe_tables
+from telemetry import span
+from .query_cache import QueryCache
+from .agent_pool import AgentPool
+from .rule_parser import RuleBasedQueryParser
 from .models import (
     QueryParameters,
     EndpointInfo,
     F1QueryResponse,
-    QueryType
+    QueryType,
+    SQLPlan,
 )
 
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Get API key from environment variable
 openai = OpenAIChat(api_key=os.getenv('OPENAI_API_KEY'))
 
+# Parsed parameters for previously seen queries, shared across calls
+query_cache = QueryCache()
+
+# Deterministic parser tried before the LLM for templated queries
+rule_parser = RuleBasedQueryParser()
+
+# Year "this season", "last 5 seasons", ... resolve against; ``None`` follows the clock
+current_year: Optional[int] = None
+
+def set_current_year(year: Optional[int]):
+    """Resolve relative time scopes against ``year`` (``None`` restores the clock), e.g. for replayed benchmarks"""
+    global current_year, rule_parser
+    current_year = year
+    rule_parser = RuleBasedQueryParser(current_year=year)
+
 class EntityInfo(BaseModel):
     """Information about entities in the query"""
     drivers: List[str] = Field(default_factory=list, description="List of driver IDs (e.g., lewis_hamilton)")
@@ -59,6 +84,7 @@ def create_understanding_agent():
             "   - Race results → metrics=['results']",
             "   - Qualifying → metrics=['qualifying']",
             "   - Standings → metrics=['standings']",
+            "   - Standings after every round (title fight over a season) → metrics=['progression']",
             "   - Status/DNF → metrics=['status']",
             "",
             "4. Output Format:",
@@ -136,44 +162,147 @@ def create_endpoint_agent():
         ]
     )
 
-def process_query(query: str) -> List[str]:
-    """Process an F1 query and return relevant Ergast API endpoint URLs"""
+def create_sql_agent():
+    """Create an agent that answers a query with SQL over the loaded F1 tables"""
+    return Agent(
+        model=openai,
+        description="You are a Formula 1 analyst who answers questions with SQL over in-memory tables",
+        output_model=SQLPlan,
+        instructions=[
+            "SQL Rules:",
+            "1. Use only the tables and columns listed in the prompt; write a single SELECT statement",
+            "2. Join results, qualifying and sprint_results on (season, round, driver_id)",
+            "3. Standings tables hold one row per entity after a round; use the latest round for season totals",
+            "4. Driver and constructor IDs are lowercase with underscores (max_verstappen, red_bull)",
+            "5. Aggregate in SQL (COUNT, AVG, SUM, GROUP BY) rather than returning raw rows",
+        ]
+    )
+
+# Long-lived agents reused across queries instead of being rebuilt per call.
+# Only the understanding agent runs on the query path; endpoints come from ErgastURLBuilder.
+understanding_agents = AgentPool(create_understanding_agent)
+# Only used by F1QueryProcessor.execute_sql without explicit SQL, so built on first use
+sql_agents = AgentPool(create_sql_agent)
+
+def warm_up_agents(count: Optional[int] = None):
+    """Build pooled agents up front so the first query only pays for the model call"""
+    understanding_agents.warm_up(count)
+
+def _understanding_prompt(query: str) -> str:
+    return f"""
+                Analyze this Formula 1 query:
+                "{query}"
+
+                Follow the systematic analysis framework to determine exact data requirements.
+                Ensure all identifiers are properly formatted (lowercase with underscores).
+                Consider any implicit requirements that might need filtering or post-processing.
+                """
+
+def _known_parameters(query: str) -> Optional[QueryParameters]:
+    """Parameters resolved without the LLM: cached from an earlier query, or rule-parsed"""
+    with span("parse_params") as parse_span:
+        params = query_cache.get(query)
+        if params is not None:
+            parse_span.set(source="cache")
+            parse_span.add(cache_hits=1)
+            return params
+        parse_span.add(cache_misses=1)
+        params = rule_parser.parse_confident(query)
+        parse_span.set(source="rules" if params is not None else "llm")
+        return params
+
+def _agent_parameters(query: str, params_response) -> QueryParameters:
+    params = params_response.content
+    if isinstance(params, QueryParameters):
+        query_cache.put(query, params)
+    return params
+
+def _build_endpoints(query: str, params: QueryParameters) -> List[Endpoint]:
+    logger.debug(
+        "Extracted parameters: primary_entity=%s entity_ids=%s metrics=%s time_scope=%s comparison=%s",
+        params.primary_entity, params.entity_ids, params.metrics, params.time_scope, params.comparison,
+    )
+    
+    # New rule-based URL construction
+    url_builder = ErgastURLBuilder(current_year=current_year)
+    endpoints = url_builder.build_endpoints(params)
+    
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Query: %s\nRequired endpoints:\n%s", query, "\n".join(f"- {e}" for e in endpoints))
+    
+    return endpoints
+
+def process_query(query: str) -> List[Endpoint]:
+    """Process an F1 query and return descriptors of the relevant Ergast API endpoints"""
     try:
-        # Step 1: Extract structured parameters using the understanding agent
-        understanding_agent = create_understanding_agent()
-        params_response = understanding_agent.run(f"""
-        Analyze this Formula 1 query:
-        "{query}"
-
-        Follow the systematic analysis framework to determine exact data requirements.
-        Ensure all identifiers are properly formatted (lowercase with underscores).
-        Consider any implicit requirements that might need filtering or post-processing.
-        """)
-        
-        # Debug logging
-        print("\nExtracted Parameters:")
-        print(f"Primary Entity: {params_response.content.primary_entity}")
-        print(f"Entity IDs: {params_response.content.entity_ids}")
-        print(f"Metrics: {params_response.content.metrics}")
-        print(f"Time Scope: {params_response.content.time_scope}")
-        print(f"Comparison: {params_response.content.comparison}")
-        
-        # New rule-based URL construction
-        url_builder = ErgastURLBuilder()
-        endpoints = url_builder.build_endpoints(params_response.content)
-        
-        # Output results
-        print(f"\nQuery: {query}")
-        print("Required Endpoints:")
-        for endpoint in endpoints:
-            print(f"- {endpoint}")
+        with span("process_query"):
+            # Step 1: Reuse parameters from an earlier query, or parse templated queries locally
+            params = _known_parameters(query)
+            if params is None:
+                # Step 1b: Extract structured parameters using the understanding agent
+                with understanding_agents.acquire() as understanding_agent, span("llm"):
+                    params = _agent_parameters(query, understanding_agent.run(_understanding_prompt(query)))
+            
+            return _build_endpoints(query, params)
         
-        return endpoints
+    except Exception as e:
+        logger.exception("Error processing query: %s", query)
+        return []
+
+async def aprocess_query(query: str) -> List[Endpoint]:
+    """``process_query`` for the event loop: the LLM call is awaited instead of blocking a thread"""
+    try:
+        with span("process_query"):
+            params = _known_parameters(query)
+            if params is None:
+                async with understanding_agents.aacquire() as understanding_agent:
+                    with span("llm"):
+                        params = _agent_parameters(query, await understanding_agent.arun(_understanding_prompt(query)))
+            
+            return _build_endpoints(query, params)
         
     except Exception as e:
-        print(f"Error processing query: {str(e)}")
+        logger.exception("Error processing query: %s", query)
         return []
 
+def _sql_prompt(query: str, tables: Dict[str, int]) -> str:
+    loaded = [name for name, rows in tables.items() if rows]
+    return f"""
+                Answer this Formula 1 query with SQL:
+                "{query}"
+
+                Tables (name(column TYPE, ...)):
+                {describe_tables(loaded or None)}
+                """
+
+def _planned_sql(query: str, plan_response) -> Optional[str]:
+    plan = plan_response.content
+    if not isinstance(plan, SQLPlan):
+        logger.warning("SQL agent returned no plan for query: %s", query)
+        return None
+    logger.debug("Query: %s\nSQL: %s", query, plan.sql)
+    return plan.sql
+
+def process_sql(query: str, tables: Dict[str, int]) -> Optional[str]:
+    """SQL answering ``query`` over ``tables`` (name -> rows loaded), or ``None`` when none was planned"""
+    try:
+        with span("process_sql"), sql_agents.acquire() as sql_agent, span("llm"):
+            return _planned_sql(query, sql_agent.run(_sql_prompt(query, tables)))
+    except Exception:
+        logger.exception("Error planning SQL for query: %s", query)
+        return None
+
+async def aprocess_sql(query: str, tables: Dict[str, int]) -> Optional[str]:
+    """``process_sql`` for the event loop"""
+    try:
+        with span("process_sql"):
+            async with sql_agents.aacquire() as sql_agent:
+                with span("llm"):
+                    return _planned_sql(query, await sql_agent.arun(_sql_prompt(query, tables)))
+    except Exception:
+        logger.exception("Error planning SQL for query: %s", query)
+        return None
+
 def test_queries(indices: List[int]):
     """Test the F1 query processor with query indices"""
     queries = query_index.get_queries(indices)
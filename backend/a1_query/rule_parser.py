@@ -0,0 +1,160 @@
+import datetime
+import re
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+
+from api.mappings import (
+    CIRCUIT_IDS,
+    CIRCUIT_NAME_TO_ID,
+    CONSTRUCTOR_NAME_TO_ID,
+    DRIVER_DISPLAY_TO_API,
+    get_circuit_api_id,
+)
+from .models import QueryParameters
+
+
+def _alternation(names) -> re.Pattern:
+    """Word-bounded regex matching any of ``names``, longest first"""
+    ordered = sorted(names, key=len, reverse=True)
+    return re.compile(r"\b(" + "|".join(re.escape(n) for n in ordered) + r")\b")
+
+
+def _driver_aliases() -> Dict[str, str]:
+    """Full display names plus unambiguous surnames to Ergast driver IDs"""
+    aliases = dict(DRIVER_DISPLAY_TO_API)
+    for display, api_id in DRIVER_DISPLAY_TO_API.items():
+        aliases.setdefault(display.split()[-1], api_id)
+    return aliases
+
+
+DRIVER_ALIASES = _driver_aliases()
+CIRCUIT_ALIASES = {**{c.replace("_", " "): c for c in CIRCUIT_IDS}, **CIRCUIT_NAME_TO_ID}
+
+DRIVER_PATTERN = _alternation(DRIVER_ALIASES)
+CONSTRUCTOR_PATTERN = _alternation(CONSTRUCTOR_NAME_TO_ID)
+CIRCUIT_PATTERN = _alternation(CIRCUIT_ALIASES)
+
+YEAR_RANGE_PATTERN = re.compile(r"\b(?:from\s+)?((?:19|20)\d{2})\s*(?:-|to|until|through)\s*((?:19|20)\d{2})\b")
+SINCE_PATTERN = re.compile(r"\bsince\s+((?:19|20)\d{2})\b")
+LAST_N_PATTERN = re.compile(r"\b(?:last|past)\s+(\d+)\s+(?:seasons|years)\b")
+LAST_DECADE_PATTERN = re.compile(r"\b(?:last|past) decade\b")
+YEAR_PATTERN = re.compile(r"\b((?:19|20)\d{2})\b")
+CURRENT_SEASON_PATTERN = re.compile(r"\b(this season|current season|in a given season|in a season)\b")
+LAST_SEASON_PATTERN = re.compile(r"\b(last season|previous season)\b")
+
+METRIC_PATTERNS = [
+    ("results", re.compile(r"\b(results?|wins?|won|winning|victor(?:y|ies)|podiums?|finish(?:es|ed|ing)?|points|win rate|win percentage)\b")),
+    ("qualifying", re.compile(r"\b(qualifying|pole(?: positions?)?|poles|grid)\b")),
+    ("progression", re.compile(r"\b(progression|round by round|after (?:each|every) round)\b")),
+    ("standings", re.compile(r"\b(standings?|championships?|rank(?:ing)?|leads?)\b")),
+    ("status", re.compile(r"\b(dnfs?|retire(?:ment|ments|d)?|status|reliability)\b")),
+    ("laps", re.compile(r"\b(lap ?times?|fastest laps?|laps?)\b")),
+    ("pitstops", re.compile(r"\b(pit ?stops?)\b")),
+]
+
+# Concepts the Ergast endpoints cannot answer directly; these need the LLM
+AMBIGUOUS_PATTERN = re.compile(
+    r"\b(wet|rain\w*|dry|weather|safety cars?|tyres?|tires?|temperature|sectors?|yellow flags?|rookie|"
+    r"teammates?|street circuits?|correlation|consistency|strategy|strategies|era|debut|closest|"
+    r"improved|best|better|dominated|would|if|ever|history|where|without)\b"
+)
+# Open-ended time spans the agent resolves better than a default year
+VAGUE_TIME_PATTERN = re.compile(r"\b(historical|career|all time|each season|every season|past seasons|over the years)\b")
+
+
+def normalize_text(query: str) -> str:
+    """Lowercase ASCII text with possessives and punctuation stripped"""
+    text = unicodedata.normalize("NFKD", query).encode("ascii", "ignore").decode("ascii").lower()
+    text = re.sub(r"'s\b", "", text)
+    text = re.sub(r"[^\w\s-]", " ", text)
+    return " ".join(text.split())
+
+
+class RuleBasedQueryParser:
+    """Deterministic parser for templated queries ("X's race results in YEAR").
+
+    Entities come from the static tables in ``api.mappings``; metrics and
+    time scope from keyword patterns. ``parse`` returns the parameters with
+    a confidence score so the caller can fall back to the LLM when the query
+    strays outside what the templates understand.
+    """
+
+    CONFIDENCE_THRESHOLD = 0.8
+
+    def __init__(self, current_year: Optional[int] = None):
+        self.current_year = current_year or datetime.datetime.now().year
+
+    def parse(self, query: str) -> Tuple[Optional[QueryParameters], float]:
+        text = normalize_text(query)
+
+        drivers = self._unique(DRIVER_ALIASES[m] for m in DRIVER_PATTERN.findall(text))
+        constructors = self._unique(CONSTRUCTOR_NAME_TO_ID[m] for m in CONSTRUCTOR_PATTERN.findall(text))
+        circuits = self._unique(
+            get_circuit_api_id(CIRCUIT_ALIASES[m]) for m in CIRCUIT_PATTERN.findall(text)
+        )
+        metrics = [name for name, pattern in METRIC_PATTERNS if pattern.search(text)]
+        time_scope, explicit_time = self._parse_time_scope(text)
+
+        if not metrics:
+            return None, 0.0
+
+        confidence = 1.0
+        if AMBIGUOUS_PATTERN.search(text):
+            confidence -= 0.5
+        if not (drivers or constructors or circuits or explicit_time):
+            confidence -= 0.4
+        if not explicit_time:
+            # Without a season the default year is a guess; let the agent pick the span
+            confidence -= 0.5 if VAGUE_TIME_PATTERN.search(text) else 0.3
+        if len(metrics) > 2:
+            confidence -= 0.1
+
+        if drivers:
+            primary_entity = "driver"
+        elif constructors:
+            primary_entity = "constructor"
+        elif circuits:
+            primary_entity = "circuit"
+        else:
+            primary_entity = "season"
+
+        entity_ids = {
+            "drivers": drivers,
+            "constructors": constructors,
+            "circuits": circuits,
+        }
+        params = QueryParameters(
+            primary_entity=primary_entity,
+            entity_ids={k: v for k, v in entity_ids.items() if v},
+            metrics=metrics,
+            time_scope=time_scope,
+            comparison=len(drivers) + len(constructors) > 1,
+        )
+        return params, max(confidence, 0.0)
+
+    def parse_confident(self, query: str) -> Optional[QueryParameters]:
+        """Parameters only when the parse clears ``CONFIDENCE_THRESHOLD``"""
+        params, confidence = self.parse(query)
+        return params if confidence >= self.CONFIDENCE_THRESHOLD else None
+
+    def _parse_time_scope(self, text: str) -> Tuple[Dict, bool]:
+        """Time scope in the shape the understanding agent emits, and whether it was explicit"""
+        if match := YEAR_RANGE_PATTERN.search(text):
+            return {"range": [int(match.group(1)), int(match.group(2))]}, True
+        if match := SINCE_PATTERN.search(text):
+            return {"range": [int(match.group(1)), self.current_year]}, True
+        if match := LAST_N_PATTERN.search(text):
+            return {"last": int(match.group(1))}, True
+        if LAST_DECADE_PATTERN.search(text):
+            return {"last": 10}, True
+        if years := YEAR_PATTERN.findall(text):
+            return {"years": [int(y) for y in self._unique(years)]}, True
+        if LAST_SEASON_PATTERN.search(text):
+            return {"years": [self.current_year - 1]}, True
+        if CURRENT_SEASON_PATTERN.search(text):
+            return {"years": [self.current_year]}, True
+        return {"years": [self.current_year]}, False
+
+    @staticmethod
+    def _unique(values) -> List[str]:
+        return list(dict.fromkeys(values))
@@ -1,19 +1,44 @@
+import logging
 from typing import List, Dict, Optional
-from urllib.parse import urlencode
+from collections import OrderedDict
 import datetime
+from a2_transform.transformers.standings import PROGRESSION_KINDS
+from api.endpoint import BASE_URL, Endpoint, get_base_url
+from telemetry import span
 from .models import QueryParameters
 from .driver_mapping import DriverIDMapper
 from .url_validator import ErgastEndpointValidator
 
+logger = logging.getLogger(__name__)
+
 class ErgastURLBuilder:
-    BASE_URL = "http://ergast.com/api/f1"
+    BASE_URL = BASE_URL
+    validator = ErgastEndpointValidator()
+
+    # Planning cost model: a request costs about as much as 200 rows of payload
+    REQUEST_COST = 1.0
+    ROW_COST = 1.0 / 200
+    ROUNDS_PER_SEASON = 22
+    GRID_SIZE = 20
+    SEASON_PAGE_LIMIT = 1000
+    # Per-entity season endpoints that can be served by one season-wide call
+    COALESCIBLE_RESOURCES = ('results', 'qualifying')
+    ENTITY_FILTER_COLUMNS = {'drivers': 'driver_id', 'constructors': 'constructor_id'}
+    ENTITY_ROWS_PER_SEASON = {'drivers': ROUNDS_PER_SEASON, 'constructors': 2 * ROUNDS_PER_SEASON}
     
-    def __init__(self):
-        self.current_year = datetime.datetime.now().year
+    def __init__(self, base_url: Optional[str] = None, current_year: Optional[int] = None):
+        self.base_url = base_url or get_base_url()
+        self.current_year = current_year or datetime.datetime.now().year
         self.primary_entity = None
 
-    def build_endpoints(self, params: QueryParameters) -> List[str]:
+    def build_endpoints(self, params: QueryParameters) -> List[Endpoint]:
         """Main entry point for endpoint construction"""
+        with span("build_endpoints") as build_span:
+            endpoints = self._build_endpoints(params)
+            build_span.set(endpoints=len(endpoints))
+            return endpoints
+
+    def _build_endpoints(self, params: QueryParameters) -> List[Endpoint]:
         endpoints = []
         
         # Parse temporal parameters
@@ -34,7 +59,69 @@ class ErgastURLBuilder:
                 metric, years, rounds, drivers, constructors, circuits
             )
         
-        return self._validate_endpoints(endpoints)
+        return self._validate_endpoints(self._plan_endpoints(endpoints))
+
+    def _plan_endpoints(self, endpoints: List[Endpoint]) -> List[Endpoint]:
+        """De-duplicate endpoints and merge per-entity calls into season-wide ones.
+
+        Per-driver/constructor results or qualifying endpoints for one season
+        are replaced by a single ``/{year}/{resource}.json`` call when the cost
+        model says one larger payload beats several round trips. The entity
+        selection moves into the endpoint's local filters (``driver_id``,
+        ``constructor_id``) that the processor applies to the DataFrame.
+        """
+        unique = list(dict.fromkeys(endpoints))
+
+        groups = OrderedDict()
+        for endpoint in unique:
+            entity_type = self._single_entity(endpoint)
+            if entity_type and endpoint.kind in self.COALESCIBLE_RESOURCES and endpoint.round is None:
+                groups.setdefault((endpoint.season, endpoint.kind, entity_type), []).append(endpoint)
+
+        replacements = {}
+        for (year, resource, entity_type), members in groups.items():
+            season_wide = Endpoint(kind=resource, season=year, base_url=self.base_url)
+            if season_wide in unique:
+                # Already fetching the whole season; the entity calls are redundant
+                merged = None
+            elif self._season_call_is_cheaper(entity_type, len(members)):
+                field = entity_type[:-1]
+                ids = [getattr(ep, field) for ep in members]
+                if entity_type == 'drivers':
+                    ids = [DriverIDMapper.get_ergast_id(i) for i in ids]
+                merged = Endpoint(
+                    kind=resource,
+                    season=year,
+                    params=(('limit', str(self.SEASON_PAGE_LIMIT)),),
+                    filters=((self.ENTITY_FILTER_COLUMNS[entity_type], tuple(dict.fromkeys(ids))),),
+                    base_url=self.base_url,
+                )
+            else:
+                continue
+            for endpoint in members:
+                replacements[endpoint] = merged
+
+        planned = []
+        for endpoint in unique:
+            endpoint = replacements.get(endpoint, endpoint)
+            if endpoint and endpoint not in planned:
+                planned.append(endpoint)
+        return planned
+
+    @staticmethod
+    def _single_entity(endpoint: Endpoint) -> Optional[str]:
+        """'drivers' / 'constructors' when the endpoint is narrowed to exactly that one entity"""
+        if endpoint.circuit is None and (endpoint.driver is None) != (endpoint.constructor is None):
+            return 'drivers' if endpoint.driver else 'constructors'
+        return None
+
+    def _season_call_is_cheaper(self, entity_type: str, entity_count: int) -> bool:
+        """Compare N per-entity requests against one season-wide request"""
+        per_entity = entity_count * (
+            self.REQUEST_COST + self.ENTITY_ROWS_PER_SEASON[entity_type] * self.ROW_COST
+        )
+        season_wide = self.REQUEST_COST + self.ROUNDS_PER_SEASON * self.GRID_SIZE * self.ROW_COST
+        return season_wide < per_entity
 
     def _build_metric_endpoints(self, metric, years, rounds, drivers, constructors, circuits):
         """Router for different metric types"""
@@ -42,6 +129,7 @@ class ErgastURLBuilder:
             'results': self._build_results_endpoints,
             'qualifying': self._build_qualifying_endpoints,
             'standings': self._build_standings_endpoints,
+            'progression': self._build_progression_endpoints,
             'status': self._build_status_endpoints,
             'laps': self._build_lap_endpoints,
             'pitstops': self._build_pitstop_endpoints
@@ -61,19 +149,24 @@ class ErgastURLBuilder:
             for year in years:
                 if rounds:
                     for round_num in rounds:
-                        urls.append(f"{self.BASE_URL}/{year}/{round_num}/circuits/{circuit}/results.json")
+                        urls.append(self._endpoint('results', year, round_num, circuit=circuit))
                 else:
-                    urls.append(f"{self.BASE_URL}/{year}/circuits/{circuit}/results.json")
+                    urls.append(self._endpoint('results', year, circuit=circuit))
         
         # Driver-based queries
         for driver in drivers:
             for year in years:
-                urls.append(f"{self.BASE_URL}/{year}/drivers/{driver}/results.json")
+                urls.append(self._endpoint('results', year, driver=driver))
         
         # Constructor-based queries
         for constructor in constructors:
             for year in years:
-                urls.append(f"{self.BASE_URL}/{year}/constructors/{constructor}/results.json")
+                urls.append(self._endpoint('results', year, constructor=constructor))
+        
+        # Season-wide queries ("Who won the most races in 2023?")
+        if not (circuits or drivers or constructors):
+            for year in years:
+                urls.append(self._endpoint('results', year))
         
         return urls
 
@@ -88,9 +181,24 @@ class ErgastURLBuilder:
         for year in years:
             # Get general standings and filter by entity in transformer
             if self.primary_entity == 'driver' or drivers:
-                urls.append(f"{self.BASE_URL}/{year}/driverStandings.json")
+                urls.append(self._endpoint('driverStandings', year))
             elif self.primary_entity == 'constructor' or constructors:
-                urls.append(f"{self.BASE_URL}/{year}/constructorStandings.json")
+                urls.append(self._endpoint('constructorStandings', year))
+        
+        return urls
+
+    def _build_progression_endpoints(self, years, rounds, drivers, constructors, circuits):
+        """Construct standings-after-every-round endpoints, narrowed locally to the queried entities"""
+        urls = []
+        
+        if self.primary_entity == 'constructor' or (constructors and not drivers):
+            kind, entity_type, ids = 'constructorStandingsByRound', 'constructors', constructors
+        else:
+            kind, entity_type, ids = 'driverStandingsByRound', 'drivers', [DriverIDMapper.get_ergast_id(d) for d in drivers]
+        filters = ((self.ENTITY_FILTER_COLUMNS[entity_type], tuple(dict.fromkeys(ids))),) if ids else ()
+        
+        for year in years:
+            urls.append(Endpoint(kind=kind, season=int(year), filters=filters, base_url=self.base_url))
         
         return urls
 
@@ -102,22 +210,20 @@ class ErgastURLBuilder:
             # Driver-specific qualifying
             if drivers:
                 for driver in drivers:
-                    # Debug print
-                    print(f"Original driver ID: {driver}")
                     ergast_driver = ErgastEndpointValidator.DRIVER_MAPPINGS.get(driver, driver)
-                    print(f"Mapped driver ID: {ergast_driver}")
-                    urls.append(f"{self.BASE_URL}/{year}/drivers/{ergast_driver}/qualifying.json")
+                    logger.debug("Mapped driver ID %s -> %s", driver, ergast_driver)
+                    urls.append(self._endpoint('qualifying', year, driver=ergast_driver))
             # Constructor-specific qualifying
             elif constructors:
                 for constructor in constructors:
-                    urls.append(f"{self.BASE_URL}/{year}/constructors/{constructor}/qualifying.json")
+                    urls.append(self._endpoint('qualifying', year, constructor=constructor))
             # Circuit-specific qualifying
             elif circuits:
                 for circuit in circuits:
-                    urls.append(f"{self.BASE_URL}/{year}/circuits/{circuit}/qualifying.json")
+                    urls.append(self._endpoint('qualifying', year, circuit=circuit))
             # If no specific entities, get all qualifying for the year
             else:
-                urls.append(f"{self.BASE_URL}/{year}/qualifying.json")
+                urls.append(self._endpoint('qualifying', year))
         
         return urls
 
@@ -133,14 +239,14 @@ class ErgastURLBuilder:
             # Constructor-specific status
             if constructors:
                 for constructor in constructors:
-                    urls.append(f"{self.BASE_URL}/{year}/constructors/{constructor}/status.json")
+                    urls.append(self._endpoint('status', year, constructor=constructor))
             # Driver-specific status
             elif drivers:
                 for driver in drivers:
-                    urls.append(f"{self.BASE_URL}/{year}/drivers/{driver}/status.json")
+                    urls.append(self._endpoint('status', year, driver=driver))
             # General status for the year
             else:
-                urls.append(f"{self.BASE_URL}/{year}/status.json")
+                urls.append(self._endpoint('status', year))
         
         return urls
 
@@ -153,17 +259,13 @@ class ErgastURLBuilder:
             years = [self.current_year]
         
         for year in years:
-            # For fastest lap analysis, we only need the final lap data
-            # or a sample of laps from each race (e.g., every 10th lap)
             if rounds:
                 for round_num in rounds:
-                    urls.append(f"{self.BASE_URL}/{year}/{round_num}/laps.json")
+                    urls.append(self._endpoint('laps', year, round_num))
             else:
-                # Instead of all rounds (1-23), get data from representative races
-                # For example: First, middle, and last race of each season
-                season_rounds = [1, 12, 20]  # Representative sample
-                for round_num in season_rounds:
-                    urls.append(f"{self.BASE_URL}/{year}/{round_num}/laps.json")
+                # Season-level descriptor: LapTimesTransformer expands it to every
+                # completed round and pages through each one concurrently
+                urls.append(self._endpoint('laps', year))
         
         return urls
 
@@ -173,7 +275,7 @@ class ErgastURLBuilder:
         for year in years:
             if rounds:
                 for round_num in rounds:
-                    urls.append(f"{self.BASE_URL}/{year}/{round_num}/pitstops.json")
+                    urls.append(self._endpoint('pitstops', year, round_num))
         return urls
 
     def _parse_time_scope(self, time_scope: Dict) -> List[int]:
@@ -191,7 +293,7 @@ class ErgastURLBuilder:
                     start, end = range_data
                     return list(range(int(start), int(end) + 1))
                 else:
-                    print(f"Invalid range format: {range_data}")
+                    logger.warning("Invalid range format: %s", range_data)
                     return [self.current_year]
                 
             if 'last' in time_scope:
@@ -202,10 +304,19 @@ class ErgastURLBuilder:
             return [self.current_year]
         
         except Exception as e:
-            print(f"Error parsing time scope: {str(e)}")
+            logger.warning("Error parsing time scope: %s", e)
             return [self.current_year]  # Fallback to current year
 
-    def _validate_endpoints(self, endpoints: List[str]) -> List[str]:
-        """Apply validation rules"""
-        validator = ErgastEndpointValidator()
-        return [ep for ep in endpoints if validator.validate(ep)] 
\ No newline at end of file
+    def _endpoint(self, kind: str, year, round_num=None, **entities) -> Endpoint:
+        """Descriptor for ``kind`` in a season (and optionally a round)"""
+        return Endpoint(
+            kind=kind,
+            season=int(year),
+            round=int(round_num) if round_num is not None else None,
+            base_url=self.base_url,
+            **entities,
+        )
+
+    def _validate_endpoints(self, endpoints: List[Endpoint]) -> List[Endpoint]:
+        """Apply validation rules; progression kinds are planner-only and never hit Ergast"""
+        return [ep for ep in endpoints if ep.kind in PROGRESSION_KINDS or self.validator.validate(ep)]
\ No newline at end of file
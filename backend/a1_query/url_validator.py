@@ -1,4 +1,9 @@
 import re
+from functools import lru_cache
+from typing import Optional, Union
+from urllib.parse import urlsplit
+from api.endpoint import Endpoint
+from telemetry import span
 
 class ErgastEndpointValidator:
     # Driver ID mappings for Ergast API
@@ -31,43 +36,58 @@ class ErgastEndpointValidator:
     ENDPOINT_PATTERNS = {
         'season': r"^/f1/seasons$",
         'circuit': r"^/f1/circuits$",
-        'race': r"^/f1/\d{4}(/races)?$",
-        'constructor': r"^/f1/\d{4}/constructors$",
-        'driver': r"^/f1/\d{4}/drivers$",
-        'result': r"^/f1/\d{4}/(drivers|constructors|circuits)/[a-z_]+/results\.json$",
-        'sprint': r"^/f1/\d{4}/sprint$",
-        'qualifying': r"^/f1/\d{4}/drivers/[a-z_]+/qualifying\.json$",
-        'pitstop': r"^/f1/\d{4}/\d+/pitstops$",
-        'lap': r"^/f1/\d{4}/\d+/laps\.json$",
+        'race': r"^/f1/\d{4}(/races)?(\.json)?$",
+        'constructor': r"^/f1/\d{4}(/\d+)?/constructors(\.json)?$",
+        'driver': r"^/f1/\d{4}(/\d+)?/drivers(\.json)?$",
+        'result': r"^/f1/\d{4}(/\d+)?(/(drivers|constructors|circuits)/[a-z_]+)?/results\.json$",
+        'sprint': r"^/f1/\d{4}(/\d+)?(/(drivers|constructors)/[a-z_]+)?/sprint(\.json)?$",
+        'qualifying': r"^/f1/\d{4}(/\d+)?(/(drivers|constructors|circuits)/[a-z_]+)?/qualifying\.json$",
+        'pitstop': r"^/f1/\d{4}/\d+(/drivers/[a-z_]+)?/pitstops(/\d+)?(\.json)?$",
+        'lap': r"^/f1/\d{4}(/\d+/laps(/\d+)?|/laps)\.json$",
         'driverstanding': r"^/f1/\d{4}/driverStandings\.json$",
         'constructorstanding': r"^/f1/\d{4}/constructorStandings\.json$",
         'status': r"^/f1/\d{4}/(constructors/[a-z_]+/)?status\.json$"
     }
 
-    def validate(self, endpoint: str) -> bool:
+    # One alternation over every route, each wrapped in a group named after its kind
+    COMBINED_PATTERN = re.compile("|".join(
+        f"(?P<{kind}>{pattern})" for kind, pattern in ENDPOINT_PATTERNS.items()
+    ))
+
+    def validate(self, endpoint: Union[str, Endpoint]) -> bool:
         """Validate against all known endpoint patterns"""
-        path = endpoint.replace("http://ergast.com/api", "")
-        
-        # Debug print
-        print(f"Validating path: {path}")
-        
-        # Map driver IDs if present
-        for driver_id, ergast_id in self.DRIVER_MAPPINGS.items():
-            if f"/drivers/{driver_id}/" in path:
-                old_path = path
-                path = path.replace(f"/drivers/{driver_id}/", f"/drivers/{ergast_id}/")
-                if old_path != path:
-                    print(f"Mapped path from {old_path} to {path}")
-            elif f"/drivers/{driver_id}" in path:
-                old_path = path
-                path = path.replace(f"/drivers/{driver_id}", f"/drivers/{ergast_id}")
-                if old_path != path:
-                    print(f"Mapped path from {old_path} to {path}")
-        
-        # Debug print
-        print(f"Final path to validate: {path}")
-        
-        return any(
-            re.match(pattern, path)
-            for pattern in self.ENDPOINT_PATTERNS.values()
-        ) 
\ No newline at end of file
+        with span("validate") as validate_span:
+            valid = self.match(endpoint) is not None
+            validate_span.set(valid=valid)
+            return valid
+
+    def match(self, endpoint: Union[str, Endpoint]) -> Optional[str]:
+        """Kind of the endpoint (``'result'``, ``'lap'``, ...) or ``None`` if unknown"""
+        return _match_path(self.normalize(endpoint))
+
+    def normalize(self, endpoint: Union[str, Endpoint]) -> str:
+        """API path with query string dropped and driver aliases mapped to Ergast IDs"""
+        if isinstance(endpoint, Endpoint):
+            path = "/f1" + endpoint.path
+        else:
+            # Any API root (ergast.com, a mirror, a mock server); local filter and
+            # paging parameters are not part of the route
+            path = urlsplit(endpoint).path
+            root = path.find("/f1/")
+            if root > 0:
+                path = path[root:]
+        if "/drivers/" not in path:
+            return path
+
+        segments = path.split("/")
+        for i in range(1, len(segments)):
+            if segments[i - 1] == "drivers":
+                segments[i] = self.DRIVER_MAPPINGS.get(segments[i], segments[i])
+        return "/".join(segments)
+
+
+@lru_cache(maxsize=4096)
+def _match_path(path: str) -> Optional[str]:
+    """Kind of a normalized path; cached because each URL is checked more than once"""
+    match = ErgastEndpointValidator.COMBINED_PATTERN.match(path)
+    return match.lastgroup if match else None
@@ -1,5 +1,11 @@
 # Marks this directory as a Python package 
 
 from .router import EndpointRouter 
+from .fetcher import ErgastFetcher, get_fetcher, set_fetcher
+from .async_fetcher import AsyncErgastFetcher, get_async_fetcher, set_async_fetcher
+from .cache import ResponseCache
+from .store import F1DataStore, get_store, set_store
 
-__all__ = ['EndpointRouter'] 
\ No newline at end of file
+__all__ = ['EndpointRouter', 'ErgastFetcher', 'get_fetcher', 'set_fetcher',
+           'AsyncErgastFetcher', 'get_async_fetcher', 'set_async_fetcher', 'ResponseCache',
+           'F1DataStore', 'get_store', 'set_store'] 
\ No newline at end of file
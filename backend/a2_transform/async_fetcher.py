@@ -0,0 +1,195 @@
+import asyncio
+import os
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit, urlunsplit
+
+from urllib3.util.retry import Retry
+
+from telemetry import span
+from .cache import ResponseCache
+from .fetcher import ErgastFetcher, FetchMetric, FetchMetrics, _decode, cache_key_url
+
+
+class AsyncErgastFetcher(FetchMetrics):
+    """asyncio counterpart of ``ErgastFetcher`` built on ``httpx.AsyncClient``.
+
+    One client (and so one connection pool) serves every coroutine on an
+    event loop; ``max_connections`` caps sockets across all of them. Retries
+    on 429/5xx and transport errors back off exponentially and honour
+    ``Retry-After``, capped at ``BACKOFF_MAX`` like the sync fetcher's
+    ``Retry``. Metrics and the on-disk response cache are shared with the
+    sync fetcher's format, so both paths hit the same cache entries; cache
+    reads and writes run in a worker thread to keep the event loop free.
+    """
+
+    RETRY_STATUSES = ErgastFetcher.RETRY_STATUSES
+    BACKOFF_MAX = Retry.DEFAULT_BACKOFF_MAX
+
+    def __init__(
+        self,
+        timeout: float = 30.0,
+        retries: int = 3,
+        backoff_factor: float = 0.5,
+        max_connections: int = 32,
+        metrics_window: int = 1000,
+        cache: Optional[ResponseCache] = None,
+    ):
+        import httpx  # optional dependency: fail at construction, not on first request
+
+        super().__init__(metrics_window)
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.cache = cache
+        self.limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        # One client per event loop, with the task that closes it when that loop shuts down
+        self._clients: Dict[asyncio.AbstractEventLoop, Tuple[Any, asyncio.Task]] = {}
+        self._clients_lock = threading.Lock()
+
+    @property
+    def client(self):
+        """Client bound to the running event loop (a new loop gets a new pool).
+
+        ``asyncio.run`` cancels leftover tasks before closing its loop; the
+        client's guard task is one of them and closes the client on the way
+        out, so a loop that goes away does not leak its connections.
+        """
+        import httpx
+
+        loop = asyncio.get_running_loop()
+        with self._clients_lock:
+            entry = self._clients.get(loop)
+            if entry is None:
+                client = httpx.AsyncClient(timeout=self.timeout, limits=self.limits)
+                entry = self._clients[loop] = (client, loop.create_task(self._close_on_shutdown(loop, client)))
+        return entry[0]
+
+    async def _close_on_shutdown(self, loop: asyncio.AbstractEventLoop, client):
+        try:
+            await loop.create_future()
+        finally:
+            with self._clients_lock:
+                if self._clients.get(loop, (None,))[0] is client:
+                    del self._clients[loop]
+            await client.aclose()
+
+    async def get(self, url: str, params: Optional[Dict[str, Any]] = None):
+        """GET ``url`` on the shared client, retrying transient failures and raising on HTTP errors"""
+        import httpx
+
+        with span("http", url=url) as http_span:
+            start = time.perf_counter()
+            for attempt in range(self.retries + 1):
+                try:
+                    response = await self.client.get(url, params=params)
+                except httpx.TransportError as e:
+                    if attempt == self.retries:
+                        self._record(FetchMetric(url, None, time.perf_counter() - start, 0, attempt, error=str(e)))
+                        raise
+                    await asyncio.sleep(self._backoff(attempt))
+                    continue
+
+                if response.status_code in self.RETRY_STATUSES and attempt < self.retries:
+                    await asyncio.sleep(self._backoff(attempt, response.headers.get("Retry-After")))
+                    continue
+
+                metric = FetchMetric(
+                    url=url,
+                    status=response.status_code,
+                    elapsed=time.perf_counter() - start,
+                    bytes=len(response.content),
+                    retries=attempt,
+                    error=None if response.is_success else response.reason_phrase,
+                )
+                self._record(metric)
+                http_span.set(status=metric.status)
+                http_span.add(bytes=metric.bytes, retries=metric.retries)
+                response.raise_for_status()
+                return response
+
+    async def get_json(self, url: str, params: Optional[Dict[str, Any]] = None) -> Dict:
+        """GET ``url`` and decode the JSON body, consulting the cache first"""
+        cache_url = cache_key_url(url, params)
+        with span("fetch", url=cache_url) as fetch_span:
+            if self.cache is None:
+                return _decode((await self.get(cache_url)).content)
+
+            body = await asyncio.to_thread(self.cache.get, cache_url)
+            if body is not None:
+                self._record_cache_hit()
+                fetch_span.add(cache_hits=1)
+                return _decode(body)
+
+            fetch_span.add(cache_misses=1)
+            response = await self.get(cache_url)
+            data = _decode(response.content)
+            await asyncio.to_thread(self.cache.put, cache_url, response.content)
+            return data
+
+    async def iter_pages(self, url: str, page_size: int = 1000, max_concurrency: int = 4) -> AsyncIterator[Dict]:
+        """Yield every page of a paginated Ergast endpoint, in offset order.
+
+        Same contract as ``ErgastFetcher.iter_pages``: the first page reports
+        the total, the rest are requested concurrently (at most
+        ``max_concurrency`` at a time) and yielded as each comes up in order.
+        """
+        parts = urlsplit(url)
+        query = {k: v for k, v in parse_qsl(parts.query) if k not in ('limit', 'offset')}
+        base_url = urlunsplit(parts._replace(query=''))
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def fetch(offset: int) -> Dict:
+            async with semaphore:
+                return await self.get_json(base_url, params={**query, 'limit': page_size, 'offset': offset})
+
+        first = await fetch(0)
+        yield first
+
+        total = int(first.get('MRData', {}).get('total', 0))
+        tasks = [asyncio.ensure_future(fetch(offset)) for offset in range(page_size, total, page_size)]
+        try:
+            for task in tasks:
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def aclose(self):
+        """Close the running loop's client; the next request opens a new one"""
+        with self._clients_lock:
+            entry = self._clients.pop(asyncio.get_running_loop(), None)
+        if entry is not None:
+            client, guard = entry
+            guard.cancel()
+            await client.aclose()
+
+    def _backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        if retry_after:
+            try:
+                return min(max(float(retry_after), 0.0), self.BACKOFF_MAX)
+            except ValueError:
+                pass
+        return min(self.backoff_factor * (2 ** attempt), self.BACKOFF_MAX)
+
+
+_default_async_fetcher: Optional[AsyncErgastFetcher] = None
+_default_async_lock = threading.Lock()
+
+
+def get_async_fetcher() -> AsyncErgastFetcher:
+    """Process-wide async fetcher used by transformers that were not given one"""
+    global _default_async_fetcher
+    with _default_async_lock:
+        if _default_async_fetcher is None:
+            cache = None if os.getenv("ERGAST_CACHE", "1") == "0" else ResponseCache()
+            _default_async_fetcher = AsyncErgastFetcher(cache=cache)
+        return _default_async_fetcher
+
+
+def set_async_fetcher(fetcher: Optional[AsyncErgastFetcher]):
+    """Replace the process-wide async fetcher (``None`` rebuilds it lazily)"""
+    global _default_async_fetcher
+    with _default_async_lock:
+        _default_async_fetcher = fetcher
@@ -0,0 +1,141 @@
+import datetime
+import hashlib
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "f1_pipeline" / "ergast"
+
+# Season segment right after the API root: /f1/2019/..., /f1/2019.json
+SEASON_PATTERN = re.compile(r"/f1/(\d{4}|current)(?=[/.?]|$)")
+
+
+class ResponseCache:
+    """Content-addressed on-disk cache for Ergast JSON responses.
+
+    Entries are keyed by the SHA-256 of the request URL. Responses for closed
+    seasons fetched after the season's year never expire; the current season
+    (and a past season fetched while it was still running) expires after
+    ``current_season_ttl`` seconds and season-less endpoints after
+    ``default_ttl``. Total size is bounded by ``max_bytes`` with least
+    recently used entries evicted first; a file's mtime is its fetch time and
+    its atime is the last cache hit, so recency survives restarts.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path, None] = None,
+        max_bytes: int = 512 * 1024 * 1024,
+        current_season_ttl: float = 15 * 60,
+        default_ttl: float = 24 * 60 * 60,
+        current_year: Optional[int] = None,
+    ):
+        self.directory = Path(directory or os.getenv("ERGAST_CACHE_DIR") or DEFAULT_CACHE_DIR)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.current_season_ttl = current_season_ttl
+        self.default_ttl = default_ttl
+        self.current_year = current_year or datetime.datetime.now().year
+
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "bytes_saved": 0, "evictions": 0}
+        self._index: "OrderedDict[str, int]" = OrderedDict()  # key -> size, LRU first
+        self._size = 0
+        self._load_index()
+
+    @staticmethod
+    def key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def ttl_for(self, url: str, fetched_at: Optional[float] = None) -> Optional[float]:
+        """Seconds an entry for ``url`` fetched at ``fetched_at`` stays fresh (``None`` means forever)"""
+        match = SEASON_PATTERN.search(url)
+        if not match:
+            return self.default_ttl
+        season = match.group(1)
+        if season != "current" and int(season) < self.current_year:
+            # Final only once fetched after the season's year; earlier copies may lack its last rounds
+            if fetched_at is None or datetime.datetime.fromtimestamp(fetched_at).year > int(season):
+                return None
+        return self.current_season_ttl
+
+    def get(self, url: str) -> Optional[bytes]:
+        """Cached body for ``url``, or ``None`` on a miss or expired entry"""
+        key = self.key(url)
+        path = self._path(key)
+        with self._lock:
+            if key not in self._index:
+                self._stats["misses"] += 1
+                return None
+            try:
+                stat = path.stat()
+                ttl = self.ttl_for(url, stat.st_mtime)
+                if ttl is not None and time.time() - stat.st_mtime > ttl:
+                    self._stats["expired"] += 1
+                    self._stats["misses"] += 1
+                    return None
+                body = path.read_bytes()
+                os.utime(path, (time.time(), stat.st_mtime))
+            except FileNotFoundError:
+                self._forget(key)
+                self._stats["misses"] += 1
+                return None
+            self._index.move_to_end(key)
+            self._stats["hits"] += 1
+            self._stats["bytes_saved"] += len(body)
+            return body
+
+    def put(self, url: str, body: bytes):
+        """Store ``body`` for ``url`` and evict LRU entries beyond ``max_bytes``"""
+        key = self.key(url)
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(body)
+        os.replace(tmp, path)
+        with self._lock:
+            self._forget(key)
+            self._index[key] = len(body)
+            self._size += len(body)
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            for key in list(self._index):
+                self._path(key).unlink(missing_ok=True)
+                self._forget(key)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._stats, "entries": len(self._index), "bytes": self._size}
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def _forget(self, key: str):
+        size = self._index.pop(key, None)
+        if size is not None:
+            self._size -= size
+
+    def _evict(self):
+        while self._size > self.max_bytes and len(self._index) > 1:
+            key, size = self._index.popitem(last=False)
+            self._size -= size
+            self._path(key).unlink(missing_ok=True)
+            self._stats["evictions"] += 1
+
+    def _load_index(self):
+        entries = []
+        for path in self.directory.glob("*/*.json"):
+            stat = path.stat()
+            entries.append((stat.st_atime, path.stem, stat.st_size))
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._size += size
+        self._evict()
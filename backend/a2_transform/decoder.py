@@ -0,0 +1,128 @@
+"""JSON decoding and columnar extraction for Ergast ``MRData`` payloads.
+
+``loads`` uses the fastest parser installed (orjson, then msgspec, then the
+standard library). ``decode_table`` walks one level of nesting, e.g. races
+and their results, and fills one preallocated array per column instead of
+building a dict per row for ``pd.DataFrame`` to take apart again:
+
+    columns = decode_table(races, 'Results',
+                           group_fields=[field('season', 'season')],
+                           row_fields=[field('driver_id', 'Driver', 'driverId')])
+"""
+import json
+from typing import Any, Dict, List, NamedTuple, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .schema import apply_schema, typed_frame
+
+try:
+    import orjson
+except ImportError:  # optional speed-up
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # optional speed-up
+    msgspec = None
+
+_EMPTY: Dict = {}
+
+
+def loads(body: Union[bytes, str]) -> Any:
+    """Decode a JSON document with the fastest available parser"""
+    if orjson is not None:
+        return orjson.loads(body)
+    if msgspec is not None:
+        return msgspec.json.decode(body)
+    return json.loads(body)
+
+
+class Field(NamedTuple):
+    """Output column and the key path that reaches its value in a JSON object"""
+    column: str
+    path: Tuple[Union[str, int], ...]
+    default: Any = None
+
+
+def field(column: str, *path: Union[str, int], default: Any = None) -> Field:
+    return Field(column, path, default)
+
+
+def decode_table(
+    groups: Sequence[Dict],
+    rows_key: str,
+    group_fields: Sequence[Field] = (),
+    row_fields: Sequence[Field] = (),
+) -> Dict[str, np.ndarray]:
+    """Columns for every entry of each group's ``rows_key`` list.
+
+    Group fields are read once per group and repeated over its rows.
+    Missing keys yield the field's default; values are left as decoded
+    (strings) until ``to_frame`` types each array in one vectorised pass.
+    """
+    counts = [len(group.get(rows_key) or ()) for group in groups]
+    rows = [row for group in groups for row in (group.get(rows_key) or ())]
+
+    columns = {}
+    for spec in group_fields:
+        columns[spec.column] = np.repeat(_column(groups, spec), counts)
+    for spec in row_fields:
+        columns[spec.column] = _column(rows, spec)
+    return columns
+
+
+def decode_rows(rows: Sequence[Dict], fields: Sequence[Field]) -> Dict[str, np.ndarray]:
+    """Columns for a flat list of JSON objects"""
+    return {spec.column: _column(rows, spec) for spec in fields}
+
+
+def merge_names(
+    columns: Dict[str, np.ndarray],
+    column: str = 'driver_name',
+    given: str = 'given_name',
+    family: str = 'family_name',
+) -> Dict[str, np.ndarray]:
+    """Replace the given/family name columns with one "Given Family" column in the given name's place"""
+    names = np.empty(len(columns[given]), dtype=object)
+    names[:] = [f"{g} {f}".strip() for g, f in zip(columns[given], columns[family])]
+    merged = {}
+    for name, values in columns.items():
+        if name == given:
+            merged[column] = names
+        elif name != family:
+            merged[name] = values
+    return merged
+
+
+def to_frame(columns: Dict[str, Any]) -> pd.DataFrame:
+    """Typed DataFrame over decoded column arrays; scalar values are broadcast"""
+    return apply_schema(typed_frame(columns))
+
+
+def _column(items: Sequence[Dict], spec: Field) -> np.ndarray:
+    values = np.empty(len(items), dtype=object)
+    if len(items):
+        values[:] = _extract(items, spec.path, spec.default)
+    return values
+
+
+def _extract(items: Sequence[Dict], path: Tuple[Union[str, int], ...], default: Any) -> List:
+    # Common shapes get their own comprehension; anything deeper takes the general walk
+    if len(path) == 1:
+        key = path[0]
+        return [item.get(key, default) for item in items]
+    if len(path) == 2 and isinstance(path[1], str):
+        outer, key = path
+        return [item.get(outer, _EMPTY).get(key, default) for item in items]
+    return [_walk(item, path, default) for item in items]
+
+
+def _walk(value: Any, path: Tuple[Union[str, int], ...], default: Any) -> Any:
+    for key in path:
+        try:
+            value = value[key]
+        except (KeyError, IndexError, TypeError):
+            return default
+    return value
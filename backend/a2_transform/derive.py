@@ -0,0 +1,298 @@
+"""Standings and status aggregates computed from a season's race results.
+
+Ergast serves driver standings, constructor standings and finishing-status
+counts as separate resources, but all three follow from the results table
+with one groupby each. ``SeasonResults`` loads a season's results once per
+query plan (local store first, then the API) and ``share_results`` points
+every derivable endpoint of that season at it, so a question that needs
+results, standings and status costs one results fetch instead of three.
+
+Standings rank by points, then countback (most wins, then most second
+places, ...). From 2021 sprint races score points too, so standings for
+those seasons also need the season's sprint results.
+
+A plain sum only matches the official tables when every result counted:
+drivers' standings dropped each driver's worst scores until 1990, and
+constructors' standings counted only the best-placed car until 1978.
+Championships that excluded an entrant (Schumacher in 1997, McLaren's
+constructors' points in 2007) differ too. Those seasons come from the API.
+"""
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from api.endpoint import Endpoint
+from telemetry import span
+from .decoder import to_frame
+from .store import F1DataStore
+from .transformers.base import BaseTransformer
+from .transformers.status import summarize_status
+
+# First season with points-scoring sprint races
+SPRINT_SEASONS_FROM = 2021
+
+DERIVABLE_KINDS = ('driverStandings', 'constructorStandings', 'status')
+
+# First season whose standings are the plain sum of every result's points
+STANDINGS_SUMMED_FROM = {'driverStandings': 1991, 'constructorStandings': 1979}
+
+# Championships with an entrant excluded from the standings after the fact
+EXCLUDED_CHAMPIONSHIPS = {('driverStandings', 1997), ('constructorStandings', 2007)}
+
+
+def driver_standings(results: pd.DataFrame, sprints: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """Drivers' championship after the last race in ``results`` (one season)"""
+    df = _standings(results, sprints, 'driver_id')
+    if df.empty:
+        return df
+    latest = _latest(results, 'driver_id', ['driver_name', 'constructor_name'])
+    return to_frame({
+        **{column: df[column].to_numpy() for column in ('season', 'round', 'position', 'points', 'wins')},
+        'driver_id': df['driver_id'].to_numpy(),
+        'driver_name': latest['driver_name'].reindex(df['driver_id']).to_numpy(),
+        'constructor': latest['constructor_name'].reindex(df['driver_id']).to_numpy(),
+    })
+
+
+def constructor_standings(results: pd.DataFrame, sprints: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """Constructors' championship after the last race in ``results`` (one season)"""
+    df = _standings(results, sprints, 'constructor_id')
+    if df.empty:
+        return df
+    latest = _latest(results, 'constructor_id', ['constructor_name'])
+    return to_frame({
+        **{column: df[column].to_numpy() for column in ('season', 'round', 'position', 'points', 'wins')},
+        'constructor_id': df['constructor_id'].to_numpy(),
+        'constructor_name': latest['constructor_name'].reindex(df['constructor_id']).to_numpy(),
+    })
+
+
+def status_counts(results: pd.DataFrame) -> pd.DataFrame:
+    """Finishing-status counts with ``StatusTransformer``'s DNF summary"""
+    if results.empty:
+        return pd.DataFrame()
+    counts = results.groupby(['season', 'status'], observed=True).size()
+    return summarize_status(to_frame({
+        'season': counts.index.get_level_values('season').to_numpy(),
+        'status': counts.index.get_level_values('status').to_numpy(dtype=object),
+        'count': counts.to_numpy(),
+    }))
+
+
+def derive(
+    endpoint: Endpoint, results: pd.DataFrame, sprints: Optional[pd.DataFrame] = None
+) -> Optional[pd.DataFrame]:
+    """``endpoint``'s rows computed from its season's results, or ``None`` when they are missing"""
+    if not can_derive(endpoint) or results is None or results.empty or 'race_id' not in results.columns:
+        return None
+    if needs_sprints(endpoint) and sprints is None:
+        return None
+    results = results[results['season'] == endpoint.season]
+    if isinstance(endpoint.round, int):
+        # Standings after that round; status counts of that race alone
+        races = results['race_id'] == endpoint.round if endpoint.kind == 'status' else results['race_id'] <= endpoint.round
+        results = results[races]
+        if sprints is not None and not sprints.empty:
+            sprints = sprints[(sprints['season'] == endpoint.season) & (sprints['race_id'] <= endpoint.round)]
+    if results.empty:
+        return None
+
+    with span("derive", kind=endpoint.kind) as derive_span:
+        if endpoint.kind == 'status':
+            df = status_counts(_narrow(results, endpoint))
+        else:
+            build = driver_standings if endpoint.kind == 'driverStandings' else constructor_standings
+            df = _narrow(build(results, sprints), endpoint)
+        derive_span.add(rows=len(df))
+        return df
+
+
+def can_derive(endpoint: Endpoint) -> bool:
+    """Whether ``endpoint`` is one season's standings or status, possibly narrowed to a round or entity"""
+    return (
+        endpoint.kind in DERIVABLE_KINDS
+        and isinstance(endpoint.season, int)
+        and (endpoint.round is None or isinstance(endpoint.round, int))
+        and endpoint.circuit is None
+        and endpoint.number is None
+        and endpoint.season >= STANDINGS_SUMMED_FROM.get(endpoint.kind, 0)
+        and (endpoint.kind, endpoint.season) not in EXCLUDED_CHAMPIONSHIPS
+    )
+
+
+def needs_sprints(endpoint: Endpoint) -> bool:
+    return endpoint.kind != 'status' and endpoint.season >= SPRINT_SEASONS_FROM
+
+
+def _standings(results: pd.DataFrame, sprints: Optional[pd.DataFrame], key: str) -> pd.DataFrame:
+    """Points, wins and championship position per ``key``, ranked with countback"""
+    scored = results[[key, 'points']]
+    if sprints is not None and not sprints.empty:
+        scored = pd.concat([scored, sprints[[key, 'points']]], ignore_index=True)
+    # Object keys so groupbys over results and sprints line up whatever their categories
+    points = scored['points'].groupby(scored[key].astype(object)).sum()
+
+    # Finishing-position counts per entity: column p holds how many times it finished p-th
+    finishes = results.groupby([results[key].astype(object), results['position']]).size().unstack(fill_value=0)
+    finishes = finishes.reindex(index=points.index, fill_value=0)
+    ranking = [finishes[p].to_numpy() for p in sorted(finishes.columns)]
+
+    # lexsort sorts by its last key first: points, then wins, seconds, ... then id for a stable tie order
+    order = np.lexsort([points.index.to_numpy(dtype=str)] + [-c for c in reversed(ranking)] + [-points.to_numpy()])
+    ids = points.index.to_numpy()[order]
+    return pd.DataFrame({
+        'season': results['season'].iloc[0],
+        'round': results['race_id'].max(),
+        'position': np.arange(1, len(ids) + 1),
+        'points': points.to_numpy()[order],
+        'wins': finishes[1].to_numpy()[order] if 1 in finishes.columns else 0,
+        key: ids,
+    })
+
+
+def _latest(results: pd.DataFrame, key: str, columns: List[str]) -> pd.DataFrame:
+    """Each entity's ``columns`` at its most recent race"""
+    latest = results.sort_values('race_id').drop_duplicates(key, keep='last')
+    return latest.set_index(latest[key].astype(object))[columns].astype(object)
+
+
+def _narrow(df: pd.DataFrame, endpoint: Endpoint) -> pd.DataFrame:
+    for field, column in (('driver', 'driver_id'), ('constructor', 'constructor_id')):
+        value = getattr(endpoint, field)
+        if value is not None and column in df.columns:
+            df = df[df[column] == value]
+    return df.reset_index(drop=True)
+
+
+class SeasonResults:
+    """Season results loaded at most once, shared by every endpoint derived from them.
+
+    One instance serves one query plan: the first endpoint to ask for a
+    season loads it and concurrent askers, threads or tasks, wait for that
+    load instead of fetching again.
+    """
+
+    def __init__(self, results: BaseTransformer, sprints: Optional[BaseTransformer] = None):
+        self.transformers = {'results': results, 'sprint': sprints}
+        self._lock = threading.Lock()
+        self._futures: Dict[Tuple, Future] = {}
+        self._tasks: Dict[Tuple, asyncio.Future] = {}
+
+    def get(self, kind: str, season: int, base_url: str) -> pd.DataFrame:
+        key = (kind, season, base_url)
+        with self._lock:
+            future = self._futures.get(key)
+            owner = future is None
+            if owner:
+                future = self._futures[key] = Future()
+        if owner:
+            try:
+                future.set_result(self._transformer(kind).load(self._endpoint(*key)))
+            except Exception as e:
+                future.set_exception(e)
+        return future.result()
+
+    async def aget(self, kind: str, season: int, base_url: str) -> pd.DataFrame:
+        key = (kind, season, base_url)
+        task = self._tasks.get(key)
+        if task is None:
+            task = self._tasks[key] = asyncio.ensure_future(self._transformer(kind).aload(self._endpoint(*key)))
+        # One waiter being cancelled must not cancel the load the others share
+        return await asyncio.shield(task)
+
+    def _transformer(self, kind: str) -> BaseTransformer:
+        transformer = self.transformers[kind]
+        if transformer is None:
+            raise KeyError(f"No transformer for {kind}")
+        return transformer
+
+    @staticmethod
+    def _endpoint(kind: str, season: int, base_url: str) -> Endpoint:
+        return Endpoint(kind=kind, season=season, base_url=base_url)
+
+
+class SharedResultsLoader:
+    """Stands in for a transformer in a query plan, loading through a ``SeasonResults``.
+
+    Season-wide results endpoints take the shared frame; standings and status
+    endpoints are derived from it, falling back to ``transformer`` (stored
+    copy, then the API) when the season's results are missing.
+    """
+
+    def __init__(self, transformer: BaseTransformer, season_results: SeasonResults):
+        self.transformer = transformer
+        self.season_results = season_results
+
+    def load(self, endpoint: Endpoint, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        get = self.season_results.get
+        if endpoint.kind == 'results':
+            return BaseTransformer._project(get('results', endpoint.season, endpoint.base_url), columns)
+        stored = self.transformer._read_store(endpoint, columns)
+        if stored is not None:
+            return stored
+        results = get('results', endpoint.season, endpoint.base_url)
+        sprints = get('sprint', endpoint.season, endpoint.base_url) if needs_sprints(endpoint) else None
+        df = derive(endpoint, results, sprints)
+        return self.transformer.load(endpoint, columns) if df is None else BaseTransformer._project(df, columns)
+
+    async def aload(self, endpoint: Endpoint, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        get = self.season_results.aget
+        if endpoint.kind == 'results':
+            return BaseTransformer._project(await get('results', endpoint.season, endpoint.base_url), columns)
+        stored = await asyncio.to_thread(self.transformer._read_store, endpoint, columns)
+        if stored is not None:
+            return stored
+        results = await get('results', endpoint.season, endpoint.base_url)
+        sprints = await get('sprint', endpoint.season, endpoint.base_url) if needs_sprints(endpoint) else None
+        df = derive(endpoint, results, sprints)
+        return await self.transformer.aload(endpoint, columns) if df is None else BaseTransformer._project(df, columns)
+
+
+def share_results(
+    jobs: List[Tuple[Endpoint, BaseTransformer]],
+    results: BaseTransformer,
+    sprints: Optional[BaseTransformer] = None,
+    store: Optional[F1DataStore] = None,
+) -> List[Tuple[Endpoint, object]]:
+    """Route a plan's standings and status endpoints through one shared results load per season.
+
+    An endpoint is derived when its season's full results are fetched by the
+    plan anyway, or are already in ``store``; the rest of the plan is left as is.
+    """
+    seasons = {
+        endpoint.season for endpoint, _ in jobs
+        if _is_season_results(endpoint) and isinstance(endpoint.season, int)
+    }
+    derived = [
+        endpoint for endpoint, _ in jobs
+        if can_derive(endpoint) and (endpoint.season in seasons or _stored(store, endpoint))
+    ]
+    if not derived:
+        return jobs
+
+    season_results = SeasonResults(results, sprints)
+    shared_seasons = seasons & {endpoint.season for endpoint in derived}
+    planned = []
+    for endpoint, transformer in jobs:
+        if endpoint in derived or (_is_season_results(endpoint) and endpoint.season in shared_seasons):
+            transformer = SharedResultsLoader(transformer, season_results)
+        planned.append((endpoint, transformer))
+    return planned
+
+
+def _is_season_results(endpoint: Endpoint) -> bool:
+    """A whole season's race results (local filters are applied after loading)"""
+    return (
+        endpoint.kind == 'results' and endpoint.round is None and 'offset' not in dict(endpoint.params)
+        and endpoint.circuit is None and endpoint.constructor is None and endpoint.driver is None
+    )
+
+
+def _stored(store: Optional[F1DataStore], endpoint: Endpoint) -> bool:
+    if store is None or not store.has('results', endpoint.season):
+        return False
+    return not needs_sprints(endpoint) or store.has('sprint', endpoint.season)
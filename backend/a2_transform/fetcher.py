@@ -0,0 +1,212 @@
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple, Union
+from urllib.parse import parse_qsl, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from telemetry import bind, span
+from .cache import ResponseCache
+from .decoder import loads
+
+
+@dataclass(frozen=True)
+class FetchMetric:
+    """Timing and size of a single HTTP fetch"""
+    url: str
+    status: Optional[int]
+    elapsed: float
+    bytes: int
+    retries: int = 0
+    error: Optional[str] = None
+
+
+def _decode(body: bytes) -> Dict:
+    with span("json.decode"):
+        return loads(body)
+
+
+def cache_key_url(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """Fully encoded request URL; the sync and async fetchers share cache entries through it"""
+    return requests.Request("GET", url, params=params).prepare().url
+
+
+class FetchMetrics:
+    """Rolling per-request metrics plus running totals, shared by both fetchers"""
+
+    def __init__(self, metrics_window: int = 1000):
+        self._lock = threading.Lock()
+        self.metrics: Deque[FetchMetric] = deque(maxlen=metrics_window)
+        self._totals = {"requests": 0, "errors": 0, "bytes": 0, "elapsed": 0.0, "retries": 0, "cache_hits": 0}
+
+    def _record(self, metric: FetchMetric):
+        with self._lock:
+            self.metrics.append(metric)
+            self._totals["requests"] += 1
+            self._totals["errors"] += metric.error is not None
+            self._totals["bytes"] += metric.bytes
+            self._totals["elapsed"] += metric.elapsed
+            self._totals["retries"] += metric.retries
+
+    def _record_cache_hit(self):
+        with self._lock:
+            self._totals["cache_hits"] += 1
+
+    def stats(self) -> Dict[str, float]:
+        """Aggregate counters since creation (or the last reset)"""
+        with self._lock:
+            totals = dict(self._totals)
+        totals["avg_elapsed"] = totals["elapsed"] / totals["requests"] if totals["requests"] else 0.0
+        return totals
+
+    def recent(self) -> List[FetchMetric]:
+        """Most recent per-request metrics, oldest first"""
+        with self._lock:
+            return list(self.metrics)
+
+    def reset_metrics(self):
+        with self._lock:
+            self.metrics.clear()
+            self._totals = {key: 0 for key in self._totals}
+            self._totals["elapsed"] = 0.0
+
+
+class ErgastFetcher(FetchMetrics):
+    """Pooled HTTP client shared by every transformer.
+
+    One ``requests.Session`` keeps connections alive between calls, urllib3
+    retries 429/5xx responses with exponential backoff, and every request is
+    recorded as a ``FetchMetric``. With a ``ResponseCache`` attached,
+    ``get_json`` serves fresh cached bodies without touching the network.
+    """
+
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    def __init__(
+        self,
+        timeout: Union[float, Tuple[float, float]] = (3.05, 30),
+        retries: int = 3,
+        backoff_factor: float = 0.5,
+        pool_size: int = 16,
+        metrics_window: int = 1000,
+        cache: Optional[ResponseCache] = None,
+    ):
+        super().__init__(metrics_window)
+        self.timeout = timeout
+        self.cache = cache
+        self.session = requests.Session()
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=self.RETRY_STATUSES,
+            allowed_methods=frozenset(["GET"]),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None) -> requests.Response:
+        """GET ``url`` through the pooled session, raising on HTTP errors"""
+        with span("http", url=url) as http_span:
+            start = time.perf_counter()
+            try:
+                response, retries = self._send(url, params)
+            except requests.exceptions.RequestException as e:
+                self._record(FetchMetric(url, None, time.perf_counter() - start, 0, error=str(e)))
+                raise
+
+            metric = FetchMetric(
+                url=url,
+                status=response.status_code,
+                elapsed=time.perf_counter() - start,
+                bytes=len(response.content),
+                retries=retries,
+                error=None if response.ok else response.reason,
+            )
+            self._record(metric)
+            http_span.set(status=metric.status)
+            http_span.add(bytes=metric.bytes, retries=metric.retries)
+            response.raise_for_status()
+            return response
+
+    def _send(self, url: str, params: Optional[Dict[str, Any]]) -> Tuple[requests.Response, int]:
+        """One request through the session; returns the response and how many retries it took"""
+        response = self.session.get(url, params=params, timeout=self.timeout)
+        history = getattr(getattr(response.raw, "retries", None), "history", None) or ()
+        return response, len(history)
+
+    def get_json(self, url: str, params: Optional[Dict[str, Any]] = None) -> Dict:
+        """GET ``url`` and decode the JSON body, consulting the cache first"""
+        with span("fetch", url=url) as fetch_span:
+            if self.cache is None:
+                return _decode(self.get(url, params=params).content)
+
+            cache_url = cache_key_url(url, params)
+            body = self.cache.get(cache_url)
+            if body is not None:
+                self._record_cache_hit()
+                fetch_span.add(cache_hits=1)
+                return _decode(body)
+
+            fetch_span.add(cache_misses=1)
+            response = self.get(url, params=params)
+            data = _decode(response.content)
+            self.cache.put(cache_url, response.content)
+            return data
+
+    def iter_pages(self, url: str, page_size: int = 1000, max_workers: int = 4) -> Iterator[Dict]:
+        """Yield every page of a paginated Ergast endpoint, in offset order.
+
+        The first page reports ``MRData.total``; the remaining offsets are
+        then fetched concurrently and yielded as soon as each is next in line,
+        so callers can consume rows while later pages are still in flight.
+        Any ``limit``/``offset`` already on ``url`` is replaced.
+        """
+        parts = urlsplit(url)
+        query = {k: v for k, v in parse_qsl(parts.query) if k not in ('limit', 'offset')}
+        base_url = urlunsplit(parts._replace(query=''))
+
+        def fetch(offset: int) -> Dict:
+            return self.get_json(base_url, params={**query, 'limit': page_size, 'offset': offset})
+
+        first = fetch(0)
+        yield first
+
+        total = int(first.get('MRData', {}).get('total', 0))
+        offsets = range(page_size, total, page_size)
+        if not offsets:
+            return
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(offsets)), thread_name_prefix="ergast-page") as pool:
+            yield from pool.map(bind(fetch), offsets)
+
+    def close(self):
+        self.session.close()
+
+
+_default_fetcher: Optional[ErgastFetcher] = None
+_default_lock = threading.Lock()
+
+
+def get_fetcher() -> ErgastFetcher:
+    """Process-wide fetcher used by transformers that were not given one"""
+    global _default_fetcher
+    with _default_lock:
+        if _default_fetcher is None:
+            cache = None if os.getenv("ERGAST_CACHE", "1") == "0" else ResponseCache()
+            _default_fetcher = ErgastFetcher(cache=cache)
+        return _default_fetcher
+
+
+def set_fetcher(fetcher: Optional[ErgastFetcher]):
+    """Replace the process-wide fetcher (``None`` rebuilds it lazily)"""
+    global _default_fetcher
+    with _default_lock:
+        _default_fetcher = fetcher
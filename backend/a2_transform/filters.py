@@ -0,0 +1,24 @@
+import logging
+from typing import Dict, List
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+def apply_local_filters(df: pd.DataFrame, filters: Dict[str, List[str]]) -> pd.DataFrame:
+    """Keep rows whose filter columns match one of the requested IDs.
+
+    A filter on a column the frame lacks matches nothing: returning the
+    unfiltered frame would hand back a whole season for a single entity.
+    """
+    if not filters or not isinstance(df, pd.DataFrame) or df.empty:
+        return df
+
+    mask = pd.Series(True, index=df.index)
+    for column, values in filters.items():
+        if column not in df.columns:
+            logger.warning("Cannot filter on missing column %s; returning no rows", column)
+            return df.iloc[0:0].reset_index(drop=True)
+        mask &= df[column].isin(values)
+    return df[mask].reset_index(drop=True)
@@ -1,37 +1,55 @@
-from .transformers import (
-    RaceResultsTransformer,
-    StandingsTransformer,
-    QualifyingTransformer,
-    StatusTransformer
-)
-from .transformers.laps import LapTimesTransformer
-from .transformers.races import RaceScheduleTransformer
+from .transformers import TRANSFORMER_REGISTRY
 from .transformers.base import BaseTransformer
-from typing import Optional
+from .async_fetcher import AsyncErgastFetcher
+from .fetcher import ErgastFetcher
+from .store import F1DataStore
+from api.endpoint import Endpoint
+from telemetry import span
+from typing import Dict, Iterable, List, Optional, Tuple, Type, Union
 
 class EndpointRouter:
-    def __init__(self):
-        self.transformers = {
-            'results': RaceResultsTransformer(),
-            'standings': StandingsTransformer(),
-            'qualifying': QualifyingTransformer(),
-            'status': StatusTransformer(),
-            'laps': LapTimesTransformer(),
-            'races': RaceScheduleTransformer()
-        }
-    
-    def get_transformer(self, endpoint: str) -> Optional[BaseTransformer]:
+    """Dispatches endpoints to transformers through a table keyed on ``Endpoint.kind``.
+
+    The table is built once from the transformer registry (one shared
+    instance per transformer class), so routing costs a single dict lookup
+    and does not depend on the order transformers were declared in.
+    """
+
+    def __init__(
+        self,
+        fetcher: Optional[ErgastFetcher] = None,
+        store: Optional[F1DataStore] = None,
+        async_fetcher: Optional[AsyncErgastFetcher] = None,
+    ):
+        instances: Dict[Type[BaseTransformer], BaseTransformer] = {}
+        self.kind_map: Dict[str, BaseTransformer] = {}
+        for kind, cls in TRANSFORMER_REGISTRY.items():
+            if cls not in instances:
+                instances[cls] = cls(fetcher=fetcher, store=store, async_fetcher=async_fetcher)
+            self.kind_map[kind] = instances[cls]
+
+    @property
+    def kinds(self) -> List[str]:
+        """Endpoint kinds this router can transform"""
+        return list(self.kind_map)
+
+    def register(self, kind: str, transformer: BaseTransformer):
+        """Route ``kind`` to ``transformer`` on this router only"""
+        self.kind_map[kind] = transformer
+
+    def get_transformer(self, endpoint: Union[str, Endpoint]) -> Optional[BaseTransformer]:
         """Get the appropriate transformer for an endpoint"""
-        if '/results' in endpoint:
-            return self.transformers['results']
-        elif '/driverStandings' in endpoint or '/constructorStandings' in endpoint:
-            return self.transformers['standings']
-        elif '/qualifying' in endpoint:
-            return self.transformers['qualifying']
-        elif '/races' in endpoint:
-            return self.transformers['races']
-        elif '/laps/' in endpoint or '/status' in endpoint:
-            return self.transformers['status']
-        elif 'laps' in endpoint:
-            return self.transformers['laps']
-        return None 
\ No newline at end of file
+        return self.kind_map.get(Endpoint.coerce(endpoint).kind)
+
+    def route_all(
+        self, endpoints: Iterable[Union[str, Endpoint]]
+    ) -> List[Tuple[Endpoint, Optional[BaseTransformer]]]:
+        """Parse and route a whole endpoint list in one pass, keeping its order"""
+        kind_map = self.kind_map
+        routed = []
+        with span("route") as route_span:
+            for endpoint in endpoints:
+                endpoint = Endpoint.coerce(endpoint)
+                routed.append((endpoint, kind_map.get(endpoint.kind)))
+            route_span.set(endpoints=len(routed))
+        return routed
@@ -0,0 +1,135 @@
+"""Column dtypes shared by every transformer's output.
+
+Ergast sends every value as a string, so a parsed payload is all object
+columns. ``apply_schema`` types a DataFrame once, by column name:
+
+- counts, positions and rounds become nullable ``Int64``
+- points become ``float64``; ``"1:30.100"``-style lap and qualifying times
+  and pit stop durations (``"22.798"``, or ``"1:02.345"`` once a stop
+  passes a minute) are parsed to seconds like ``fastest_lap_time``
+- identifiers and names that repeat on every row (driver, constructor,
+  circuit, status, race) become ``category``
+
+Columns already of the target kind are left alone, so applying the schema
+to typed data (e.g. a store read) costs next to nothing.
+"""
+from typing import Any, Dict, Union
+
+import numpy as np
+import pandas as pd
+
+INTEGER = 'Int64'
+FLOAT = 'float64'
+DURATION = 'duration'  # time string parsed to float seconds
+CATEGORY = 'category'
+
+COLUMN_TYPES: Dict[str, str] = {
+    **dict.fromkeys((
+        'season', 'round', 'race_id', 'position', 'grid', 'laps', 'wins', 'stop', 'lap', 'lap_number',
+        'fastest_lap_number', 'count', 'status_id', 'number', 'total_races',
+    ), INTEGER),
+    **dict.fromkeys(('points', 'fastest_lap_time', 'dnf_rate'), FLOAT),
+    **dict.fromkeys(('q1_time', 'q2_time', 'q3_time', 'duration'), DURATION),
+    **dict.fromkeys((
+        'driver_id', 'driver_code', 'driver_name', 'code', 'constructor_id', 'constructor_name', 'constructor',
+        'circuit_id', 'circuit_name', 'race_name', 'status', 'nationality', 'locality', 'country',
+        'date', 'race_date', 'race_time',
+    ), CATEGORY),
+}
+
+
+def apply_schema(df: pd.DataFrame, types: Dict[str, str] = COLUMN_TYPES) -> pd.DataFrame:
+    """``df`` with every column named in ``types`` converted to its dtype"""
+    if not isinstance(df, pd.DataFrame) or df.empty:
+        return df
+    converted = {}
+    for column in df.columns.intersection(list(types)):
+        values = df[column]
+        if not _is_typed(values.dtype, types[column]):
+            converted[column] = pd.Series(convert(values, types[column]), index=df.index)
+    return df.assign(**converted) if converted else df
+
+
+def typed_frame(columns: Dict[str, Any], types: Dict[str, str] = COLUMN_TYPES) -> pd.DataFrame:
+    """DataFrame from decoded column arrays, converting schema columns before pandas sees them"""
+    return pd.DataFrame({
+        name: convert(values, types[name]) if name in types and isinstance(values, np.ndarray) else values
+        for name, values in columns.items()
+    }, copy=False)
+
+
+def convert(values: Union[np.ndarray, pd.Series], kind: str):
+    """Array of ``values`` (as decoded from JSON) in the dtype of a schema kind"""
+    if kind == CATEGORY:
+        codes, categories = pd.factorize(values, sort=True)
+        # An object Index skips the string-dtype inference pass over the categories
+        return pd.Categorical.from_codes(codes, categories=pd.Index(categories, dtype=object))
+    if kind == DURATION:
+        return lap_times_to_seconds(pd.Series(values, dtype=object).fillna('').astype(str)).to_numpy()
+    numbers = _to_float(values)
+    return pd.array(numbers, dtype=INTEGER) if kind == INTEGER else numbers
+
+
+def _to_float(values) -> np.ndarray:
+    array = np.asarray(values, dtype=object)
+    try:
+        # float() per element: fast for clean numeric strings
+        return array.astype(np.float64)
+    except (TypeError, ValueError):
+        # '', None or text such as "R": fall back to the coercing parser
+        return pd.to_numeric(pd.Series(array), errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def _is_typed(dtype, kind: str) -> bool:
+    if kind == CATEGORY:
+        return isinstance(dtype, pd.CategoricalDtype)
+    if pd.api.types.is_bool_dtype(dtype):
+        return True
+    if kind == INTEGER:
+        return pd.api.types.is_integer_dtype(dtype)
+    return pd.api.types.is_numeric_dtype(dtype)
+
+
+# Ergast lap times are almost always "m:ss.fff"
+FIXED_LAP_TIME = 'm:ss.fff'
+DIGIT_OFFSETS = [i for i, c in enumerate(FIXED_LAP_TIME) if c not in ':.']
+DIGIT_MILLIS = np.array([60000, 10000, 1000, 100, 10, 1])
+
+
+def lap_times_to_seconds(times: pd.Series) -> pd.Series:
+    """Convert lap time strings ("1:30.100" or "58.4") to seconds; unparseable values become NaN.
+
+    Fixed-width "m:ss.fff" values are decoded straight from their ASCII bytes;
+    anything else goes through the general string parser.
+    """
+    if times.empty:
+        return pd.Series(dtype=float, index=times.index)
+    try:
+        # One spare byte so longer strings show up as a non-NUL ninth byte
+        raw = np.array(times.tolist(), dtype=f'S{len(FIXED_LAP_TIME) + 1}')
+    except (UnicodeEncodeError, TypeError, ValueError):
+        return pd.Series(_parse_lap_times(times.astype(str).to_numpy(dtype=str)), index=times.index)
+
+    chars = raw.view(np.uint8).reshape(len(raw), -1)
+    digits = chars[:, DIGIT_OFFSETS].astype(np.int64) - ord('0')
+    fixed = (
+        (chars[:, 1] == ord(':')) & (chars[:, 4] == ord('.')) & (chars[:, -1] == 0)
+        & ((digits >= 0) & (digits <= 9)).all(axis=1)
+    )
+    seconds = (digits @ DIGIT_MILLIS) / 1000
+    if not fixed.all():
+        others = times.to_numpy(dtype=object)[~fixed].astype(str)
+        seconds[~fixed] = _parse_lap_times(others)
+    return pd.Series(seconds, index=times.index)
+
+
+def _parse_lap_times(times: np.ndarray) -> np.ndarray:
+    """General "[m:]ss.fff" parser over a string array"""
+    parts = np.char.rpartition(times, ':')
+    minutes = np.where(parts[:, 0] == '', '0', parts[:, 0])
+    try:
+        return minutes.astype(float) * 60 + parts[:, 2].astype(float)
+    except ValueError:
+        # Malformed entries: fall back to the coercing parser
+        return (pd.to_numeric(pd.Series(minutes), errors='coerce') * 60
+                + pd.to_numeric(pd.Series(parts[:, 2]), errors='coerce')).to_numpy()
@@ -0,0 +1,210 @@
+import re
+import sqlite3
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Sequence, Tuple, Union
+
+import pandas as pd
+
+from api.endpoint import Endpoint
+
+
+@dataclass(frozen=True)
+class TableSchema:
+    """Stable SQL shape of one transformer's output"""
+    name: str
+    columns: Tuple[Tuple[str, str], ...]  # (column, INTEGER | REAL | TEXT | BOOLEAN)
+    key: Tuple[str, ...] = ()  # rows with the same key replace each other
+    renames: Tuple[Tuple[str, str], ...] = ()  # transformer column -> table column
+
+    @property
+    def column_names(self):
+        return [name for name, _ in self.columns]
+
+
+_RESULT_COLUMNS = (
+    ('season', 'INTEGER'), ('round', 'INTEGER'), ('race_name', 'TEXT'), ('circuit_id', 'TEXT'),
+    ('date', 'TEXT'), ('driver_id', 'TEXT'), ('driver_name', 'TEXT'), ('constructor_id', 'TEXT'),
+    ('constructor_name', 'TEXT'), ('grid', 'INTEGER'), ('laps', 'INTEGER'), ('position', 'INTEGER'),
+    ('status', 'TEXT'), ('points', 'REAL'),
+)
+
+# Endpoint kind -> table the transformer output is registered under
+TABLE_SCHEMAS: Dict[str, TableSchema] = {
+    'results': TableSchema(
+        'results', _RESULT_COLUMNS, key=('season', 'round', 'driver_id'), renames=(('race_id', 'round'),)
+    ),
+    'sprint': TableSchema(
+        'sprint_results', _RESULT_COLUMNS, key=('season', 'round', 'driver_id'), renames=(('race_id', 'round'),)
+    ),
+    'qualifying': TableSchema('qualifying', (
+        ('season', 'INTEGER'), ('round', 'INTEGER'), ('race_name', 'TEXT'), ('circuit_id', 'TEXT'),
+        ('driver_id', 'TEXT'), ('driver_name', 'TEXT'), ('constructor_id', 'TEXT'), ('constructor_name', 'TEXT'),
+        ('position', 'INTEGER'), ('q1_time', 'REAL'), ('q2_time', 'REAL'), ('q3_time', 'REAL'),
+    ), key=('season', 'round', 'driver_id')),
+    'driverStandings': TableSchema('driver_standings', (
+        ('season', 'INTEGER'), ('round', 'INTEGER'), ('position', 'INTEGER'), ('points', 'REAL'),
+        ('wins', 'INTEGER'), ('driver_id', 'TEXT'), ('driver_name', 'TEXT'), ('constructor', 'TEXT'),
+    ), key=('season', 'round', 'driver_id')),
+    'constructorStandings': TableSchema('constructor_standings', (
+        ('season', 'INTEGER'), ('round', 'INTEGER'), ('position', 'INTEGER'), ('points', 'REAL'),
+        ('wins', 'INTEGER'), ('constructor_id', 'TEXT'), ('constructor_name', 'TEXT'), ('nationality', 'TEXT'),
+    ), key=('season', 'round', 'constructor_id')),
+    'status': TableSchema('status', (
+        ('season', 'INTEGER'), ('status_id', 'INTEGER'), ('status', 'TEXT'), ('count', 'INTEGER'),
+        ('is_dnf', 'BOOLEAN'),
+    ), key=('season', 'status')),  # status_id is not known for counts derived from results
+    'laps': TableSchema('fastest_laps', (
+        ('season', 'INTEGER'), ('round', 'INTEGER'), ('race_name', 'TEXT'), ('circuit_name', 'TEXT'),
+        ('driver_id', 'TEXT'), ('fastest_lap_time', 'REAL'), ('fastest_lap_number', 'INTEGER'),
+    ), key=('season', 'round', 'driver_id')),
+    'pitstops': TableSchema('pit_stops', (
+        ('season', 'INTEGER'), ('round', 'INTEGER'), ('circuit_id', 'TEXT'), ('driver_id', 'TEXT'),
+        ('stop', 'INTEGER'), ('lap', 'INTEGER'), ('duration', 'REAL'),
+    ), key=('season', 'round', 'driver_id', 'stop')),
+    'races': TableSchema('races', (
+        ('season', 'INTEGER'), ('round', 'INTEGER'), ('race_name', 'TEXT'), ('date', 'TEXT'),
+        ('circuit_id', 'TEXT'), ('circuit_name', 'TEXT'),
+    ), key=('season', 'round'), renames=(('raceName', 'race_name'), ('circuitId', 'circuit_id'), ('circuitName', 'circuit_name'))),
+}
+
+def describe_tables(names: Optional[Iterable[str]] = None) -> str:
+    """One ``table(column TYPE, ...)`` line per table, e.g. to show a SQL-writing agent what it can query"""
+    wanted = None if names is None else set(names)
+    return "\n".join(
+        f"{schema.name}({', '.join(f'{column} {sql_type}' for column, sql_type in schema.columns)})"
+        for schema in TABLE_SCHEMAS.values()
+        if wanted is None or schema.name in wanted
+    )
+
+
+# Statement kinds ``F1SQLEngine.query`` runs; the SQL may come from an LLM, so nothing else is allowed
+READ_ONLY_STATEMENT = re.compile(r"^\s*(?:--[^\n]*\n\s*|/\*.*?\*/\s*)*(?:select|with)\b", re.IGNORECASE | re.DOTALL)
+
+# sqlite authorizer actions a read-only query needs; ATTACH, PRAGMA and every write are denied
+_SQLITE_READ_ACTIONS = frozenset({sqlite3.SQLITE_SELECT, sqlite3.SQLITE_READ, sqlite3.SQLITE_FUNCTION, sqlite3.SQLITE_RECURSIVE})
+
+
+def check_read_only(sql: str) -> str:
+    """``sql`` as a single SELECT/WITH statement (trailing semicolons dropped); raises ``ValueError`` otherwise"""
+    statement = sql.strip().rstrip(';').strip()
+    if ';' in statement or not READ_ONLY_STATEMENT.match(statement):
+        raise ValueError("Only a single SELECT or WITH statement can be run")
+    return statement
+
+
+def _sqlite_read_only(action, *_):
+    return sqlite3.SQLITE_OK if action in _SQLITE_READ_ACTIONS else sqlite3.SQLITE_DENY
+
+
+_PANDAS_TYPES = {'INTEGER': 'Int64', 'REAL': 'float64', 'TEXT': 'object', 'BOOLEAN': 'boolean'}
+
+
+def conform(df: pd.DataFrame, schema: TableSchema) -> pd.DataFrame:
+    """Rename, select and type transformer output into the table's stable shape"""
+    df = df.rename(columns=dict(schema.renames))
+    columns = {}
+    for name, sql_type in schema.columns:
+        values = df[name] if name in df.columns else pd.Series(None, index=df.index, dtype='object')
+        if sql_type in ('INTEGER', 'REAL'):
+            values = pd.to_numeric(values, errors='coerce')
+        if sql_type == 'TEXT':
+            values = values.astype('object').where(values.notna(), None)
+        columns[name] = values.astype(_PANDAS_TYPES[sql_type])
+    return pd.DataFrame(columns, index=df.index).reset_index(drop=True)
+
+
+class F1SQLEngine:
+    """In-process SQL over transformer output.
+
+    Each endpoint kind is a table with the fixed columns of ``TABLE_SCHEMAS``
+    (``results``, ``qualifying``, ``driver_standings``, ...), so statements
+    such as ``results JOIN qualifying USING (season, round, driver_id)`` run
+    without hand-written pandas. DuckDB scans the registered DataFrames
+    directly and is used when installed; otherwise tables are loaded into an
+    in-memory sqlite3 database.
+
+    ``query`` is read-only: it accepts one SELECT/WITH statement, DuckDB runs
+    without file or network access (locked so SQL cannot turn it back on) and
+    sqlite denies ATTACH, PRAGMA and writes while the statement runs.
+    """
+
+    def __init__(self, backend: Optional[str] = None):
+        try:
+            import duckdb
+        except ImportError:
+            duckdb = None
+        if backend is None:
+            backend = 'sqlite' if duckdb is None else 'duckdb'
+        if backend not in ('duckdb', 'sqlite'):
+            raise ValueError(f"Unknown SQL backend: {backend}")
+        if backend == 'duckdb' and duckdb is None:
+            raise ImportError("The duckdb SQL backend needs the duckdb package")
+
+        self.backend = backend
+        self._lock = threading.Lock()
+        self._frames: Dict[str, pd.DataFrame] = {}
+        if backend == 'duckdb':
+            self._con = duckdb.connect(':memory:', config={'enable_external_access': False})
+            self._con.execute("SET lock_configuration = true")
+        else:
+            self._con = sqlite3.connect(':memory:', check_same_thread=False)
+        for schema in TABLE_SCHEMAS.values():
+            self._store(schema.name, conform(pd.DataFrame(), schema))
+
+    def register(self, kind: str, df: pd.DataFrame) -> str:
+        """Add transformer output for an endpoint kind; returns the table name"""
+        schema = TABLE_SCHEMAS.get(kind)
+        if schema is None:
+            raise KeyError(f"No table for endpoint kind '{kind}'")
+        if df is None or df.empty:
+            return schema.name
+
+        with self._lock:
+            table = pd.concat([self._frames[schema.name], conform(df, schema)], ignore_index=True)
+            if schema.key:
+                table = table.drop_duplicates(subset=list(schema.key), keep='last', ignore_index=True)
+            self._store(schema.name, table)
+        return schema.name
+
+    def register_all(self, results: Iterable[Tuple[Union[str, Endpoint], pd.DataFrame]]) -> Dict[str, int]:
+        """Register ``(endpoint, DataFrame)`` pairs; returns rows per table touched"""
+        touched = set()
+        for endpoint, df in results:
+            kind = Endpoint.coerce(endpoint).kind
+            if kind in TABLE_SCHEMAS:
+                touched.add(self.register(kind, df))
+        return {name: rows for name, rows in self.tables().items() if name in touched}
+
+    def query(self, sql: str, params: Optional[Sequence] = None) -> pd.DataFrame:
+        """Run one read-only SELECT/WITH statement over the registered tables"""
+        sql = check_read_only(sql)
+        with self._lock:
+            if self.backend == 'duckdb':
+                return self._con.execute(sql, params or []).df()
+            self._con.set_authorizer(_sqlite_read_only)
+            try:
+                return pd.read_sql_query(sql, self._con, params=params)
+            finally:
+                self._con.set_authorizer(None)
+
+    def tables(self) -> Dict[str, int]:
+        """Table name -> row count"""
+        with self._lock:
+            return {name: len(df) for name, df in self._frames.items()}
+
+    def close(self):
+        self._con.close()
+
+    def _store(self, name: str, df: pd.DataFrame):
+        self._frames[name] = df
+        if self.backend == 'duckdb':
+            # A view over the DataFrame: DuckDB scans its columns in place
+            self._con.register(name, df)
+        else:
+            df.to_sql(name, self._con, if_exists='replace', index=False, dtype=self._sqlite_types(name))
+
+    @staticmethod
+    def _sqlite_types(name: str) -> Dict[str, str]:
+        schema = next(s for s in TABLE_SCHEMAS.values() if s.name == name)
+        return dict(schema.columns)
@@ -0,0 +1,252 @@
+import datetime
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Sequence, Union
+
+import pandas as pd
+
+from api.endpoint import Endpoint
+
+DEFAULT_STORE_DIR = Path.home() / ".cache" / "f1_pipeline" / "store"
+
+# Column holding the round of each per-round kind; other kinds are stored per season
+ROUND_COLUMNS = {
+    'results': 'race_id', 'sprint': 'race_id', 'qualifying': 'round', 'laps': 'round',
+    # Standings after each round (``StandingsTransformer.progression``)
+    'driverStandingsByRound': 'round', 'constructorStandingsByRound': 'round',
+}
+
+# Endpoint entity field -> column it filters on
+ENTITY_COLUMNS = {'driver': 'driver_id', 'constructor': 'constructor_id', 'circuit': 'circuit_id'}
+
+MANIFEST = "_manifest.json"
+
+
+class F1DataStore:
+    """Season/round-partitioned Parquet copy of Ergast data.
+
+    Layout is ``<root>/<kind>/season=<YYYY>/round=<R>.parquet`` for per-round
+    kinds and ``<root>/<kind>/season=<YYYY>/season.parquet`` otherwise, with a
+    ``_manifest.json`` per season recording what was synced and when. Reads
+    prune to the requested partitions by path, then push column projection
+    and row filters into the Parquet scan via ``pyarrow.dataset``.
+
+    A season synced after its year has ended never goes stale; one synced
+    while it was running (the current season, or last season synced before
+    New Year) is re-synced from the API once its manifest is older than
+    ``current_season_ttl`` seconds.
+    """
+
+    def __init__(
+        self,
+        root: Union[str, Path, None] = None,
+        current_season_ttl: float = 15 * 60,
+        current_year: Optional[int] = None,
+    ):
+        import pyarrow  # noqa: F401  (optional dependency: fail at construction, not on first read)
+
+        self.root = Path(root or os.getenv("F1_STORE_DIR") or DEFAULT_STORE_DIR)
+        self.current_season_ttl = current_season_ttl
+        self.current_year = current_year or datetime.datetime.now().year
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "partitions_read": 0}
+
+    def write(self, kind: str, season: int, df: pd.DataFrame, append: bool = False):
+        """Replace a season's partitions of ``kind`` with ``df``.
+
+        With ``append``, per-round kinds keep the rounds already stored and
+        only ``df``'s rounds are (re)written.
+        """
+        season_dir = self._season_dir(kind, season)
+        season_dir.mkdir(parents=True, exist_ok=True)
+        previous = self.manifest(kind, season) if append else None
+
+        round_column = ROUND_COLUMNS.get(kind)
+        rounds = None
+        if round_column and round_column in df.columns:
+            round_numbers = pd.to_numeric(df[round_column], errors='coerce')
+            rounds = []
+            for round_num, part in df.groupby(round_numbers, sort=True):
+                self._write_parquet(part, season_dir / f"round={int(round_num)}.parquet")
+                rounds.append(int(round_num))
+        else:
+            self._write_parquet(df, season_dir / "season.parquet")
+
+        rows = len(df)
+        if previous and previous["rounds"] is not None and rounds is not None:
+            kept = [r for r in previous["rounds"] if r not in rounds]
+            rows += sum(self._row_count(season_dir / f"round={r}.parquet") for r in kept)
+            rounds = sorted(kept + rounds)
+
+        self._write_json(season_dir / MANIFEST, {
+            "kind": kind,
+            "season": season,
+            "rounds": rounds,
+            "rows": rows,
+            "synced_at": time.time(),
+        })
+
+    def has(self, kind: str, season: int, round: Optional[int] = None) -> bool:
+        """Whether the store can answer for a season (or one round of it)"""
+        manifest = self.manifest(kind, season)
+        if manifest is None:
+            return False
+        if round is not None:
+            # Round data is final once raced; season-level kinds have no round partitions
+            return manifest["rounds"] is not None and round in manifest["rounds"]
+        synced_at = manifest["synced_at"]
+        final = season < self.current_year and datetime.datetime.fromtimestamp(synced_at).year > season
+        return final or time.time() - synced_at <= self.current_season_ttl
+
+    def manifest(self, kind: str, season: int) -> Optional[Dict]:
+        try:
+            return json.loads((self._season_dir(kind, season) / MANIFEST).read_text())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def read(
+        self,
+        kind: str,
+        seasons: Iterable[int],
+        rounds: Optional[Sequence[int]] = None,
+        columns: Optional[Sequence[str]] = None,
+        filters: Optional[Dict[str, Sequence]] = None,
+    ) -> Optional[pd.DataFrame]:
+        """Scan stored partitions of ``kind``; ``None`` if a filter column is not stored.
+
+        ``filters`` maps a column to accepted values and is evaluated inside
+        the Parquet scan, as is the ``columns`` projection.
+        """
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        import pyarrow.parquet as pq
+
+        files = []
+        for season in seasons:
+            season_dir = self._season_dir(kind, season)
+            if rounds:
+                files.extend(season_dir / f"round={r}.parquet" for r in rounds)
+            else:
+                files.extend(sorted(season_dir.glob("*.parquet"), key=_partition_order))
+        files = [str(f) for f in files if f.exists()]
+        if not files:
+            return pd.DataFrame()
+
+        # Partitions written from different payloads may type a column differently
+        # (all-null vs string); unify so one scan covers every file
+        schema = pa.unify_schemas([pq.read_schema(f) for f in files], promote_options="permissive")
+        expression = None
+        for column, values in (filters or {}).items():
+            if column not in schema.names:
+                return None
+            condition = ds.field(column).isin(list(values))
+            expression = condition if expression is None else expression & condition
+
+        dataset = ds.dataset(files, schema=schema, format="parquet")
+        projection = [c for c in columns if c in schema.names] if columns else None
+        table = dataset.to_table(columns=projection, filter=expression)
+        with self._lock:
+            self._stats["partitions_read"] += len(files)
+        return table.to_pandas()
+
+    def read_endpoint(self, endpoint: Union[str, Endpoint], columns: Optional[Sequence[str]] = None) -> Optional[pd.DataFrame]:
+        """Rows the API would return for ``endpoint``, or ``None`` when they are not stored"""
+        endpoint = Endpoint.coerce(endpoint)
+        round_num = endpoint.round
+        if not isinstance(endpoint.season, int) or not (round_num is None or isinstance(round_num, int)) \
+                or 'offset' in dict(endpoint.params):
+            return self._miss()
+        if not self.has(endpoint.kind, endpoint.season, round_num):
+            return self._miss()
+
+        filters = {
+            column: [getattr(endpoint, field)]
+            for field, column in ENTITY_COLUMNS.items()
+            if getattr(endpoint, field) is not None
+        }
+        filters.update(endpoint.filter_map)
+        if endpoint.number is not None:
+            filters['lap_number'] = [endpoint.number]
+
+        df = self.read(
+            endpoint.kind,
+            [endpoint.season],
+            rounds=[round_num] if round_num is not None else None,
+            columns=columns,
+            filters=filters,
+        )
+        if df is None:
+            return self._miss()
+        with self._lock:
+            self._stats["hits"] += 1
+        return df
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+    def _miss(self) -> None:
+        with self._lock:
+            self._stats["misses"] += 1
+        return None
+
+    def _season_dir(self, kind: str, season: int) -> Path:
+        return self.root / kind / f"season={season}"
+
+    @staticmethod
+    def _row_count(path: Path) -> int:
+        import pyarrow.parquet as pq
+
+        return pq.read_metadata(path).num_rows if path.exists() else 0
+
+    @staticmethod
+    def _write_parquet(df: pd.DataFrame, path: Path):
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        os.close(fd)
+        df.reset_index(drop=True).to_parquet(tmp, index=False)
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _write_json(path: Path, data: Dict):
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+
+
+def _partition_order(path: Path):
+    """round=2 before round=10; season-level files first"""
+    _, _, value = path.stem.partition("=")
+    return int(value) if value.isdigit() else -1
+
+
+_default_store: Optional[F1DataStore] = None
+_default_store_lock = threading.Lock()
+_store_disabled = False
+
+
+def get_store() -> Optional[F1DataStore]:
+    """Process-wide store, or ``None`` when disabled (``F1_STORE=0``) or pyarrow is missing"""
+    global _default_store, _store_disabled
+    with _default_store_lock:
+        if _default_store is None and not _store_disabled:
+            if os.getenv("F1_STORE", "1") == "0":
+                _store_disabled = True
+            else:
+                try:
+                    _default_store = F1DataStore()
+                except ImportError:
+                    _store_disabled = True
+        return _default_store
+
+
+def set_store(store: Optional[F1DataStore]):
+    """Replace the process-wide store (``None`` re-reads the environment lazily)"""
+    global _default_store, _store_disabled
+    with _default_store_lock:
+        _default_store = store
+        _store_disabled = False
@@ -3,10 +3,21 @@ from .results import RaceResultsTransformer
 from .standings import StandingsTransformer
 from .qualifying import QualifyingTransformer
 from .status import StatusTransformer
+from .laps import LapTimesTransformer
+from .races import RaceScheduleTransformer
+from .pitstops import PitStopsTransformer
+from .entities import EntityListTransformer
+from .registry import TRANSFORMER_REGISTRY, register_transformer
 
 __all__ = [
     'RaceResultsTransformer',
     'StandingsTransformer',
     'QualifyingTransformer',
-    'StatusTransformer'
+    'StatusTransformer',
+    'LapTimesTransformer',
+    'RaceScheduleTransformer',
+    'PitStopsTransformer',
+    'EntityListTransformer',
+    'TRANSFORMER_REGISTRY',
+    'register_transformer'
 ] 
\ No newline at end of file
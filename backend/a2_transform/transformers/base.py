@@ -1,6 +1,137 @@
+import logging
+import asyncio
+import pandas as pd
+from typing import Dict, Optional, Sequence, Union
+from api.endpoint import Endpoint
+from telemetry import span
+from ..async_fetcher import AsyncErgastFetcher, get_async_fetcher
+from ..fetcher import ErgastFetcher, get_fetcher
+from ..schema import apply_schema
+from ..store import F1DataStore, get_store
+
+logger = logging.getLogger(__name__)
+
 class BaseTransformer:
-    def transform(self, endpoint: str) -> str:
-        return f"Processed {endpoint}"
+    # Ergast pages at 30 rows unless told otherwise; 1000 is its maximum
+    PAGE_LIMIT = 1000
+    # Stored rows are this transformer's output, so column projection can be pushed into the scan
+    STORES_OUTPUT = True
+
+    def __init__(
+        self,
+        fetcher: Optional[ErgastFetcher] = None,
+        store: Optional[F1DataStore] = None,
+        async_fetcher: Optional[AsyncErgastFetcher] = None,
+    ):
+        self._fetcher = fetcher
+        self._store = store
+        self._async_fetcher = async_fetcher
+
+    @property
+    def fetcher(self) -> ErgastFetcher:
+        """Injected fetcher, or the shared pooled one"""
+        return self._fetcher or get_fetcher()
+
+    @property
+    def async_fetcher(self) -> AsyncErgastFetcher:
+        """Injected async fetcher, or the shared one"""
+        return self._async_fetcher or get_async_fetcher()
+
+    @property
+    def store(self) -> Optional[F1DataStore]:
+        """Injected local store, or the shared one (``None`` when disabled)"""
+        return self._store or get_store()
+
+    def load(self, endpoint: Union[str, Endpoint], columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Endpoint data from the local store when its partitions are synced, else from the API"""
+        endpoint = Endpoint.coerce(endpoint)
+        with span(f"transform.{endpoint.kind}", endpoint=endpoint) as load_span:
+            df = self._read_store(endpoint, columns)
+            if df is None:
+                df = self.transform(endpoint)
+            return self._loaded(load_span, df, columns)
+
+    async def aload(self, endpoint: Union[str, Endpoint], columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """``load`` on the event loop: the Parquet scan runs in a worker thread, the fetch is awaited"""
+        endpoint = Endpoint.coerce(endpoint)
+        with span(f"transform.{endpoint.kind}", endpoint=endpoint) as load_span:
+            df = await asyncio.to_thread(self._read_store, endpoint, columns)
+            if df is None:
+                df = await self.atransform(endpoint)
+            return self._loaded(load_span, df, columns)
+
+    def _read_store(self, endpoint: Endpoint, columns: Optional[Sequence[str]]) -> Optional[pd.DataFrame]:
+        """Transformer output rebuilt from the store, or ``None`` to go to the API"""
+        store = self.store
+        if store is None:
+            return None
+        with span("store.read", kind=endpoint.kind) as read_span:
+            df = store.read_endpoint(endpoint, columns=columns if self.STORES_OUTPUT else None)
+            read_span.set(hit=df is not None)
+            return None if df is None else apply_schema(self.from_store(df, endpoint))
+
+    def _loaded(self, load_span, df, columns: Optional[Sequence[str]]):
+        df = self._project(df, columns)
+        if isinstance(df, pd.DataFrame):
+            load_span.add(rows=len(df))
+        return df
+
+    def snapshot(self, endpoint: Endpoint) -> pd.DataFrame:
+        """Rows to persist in the local store for a season-level endpoint"""
+        return self.transform(endpoint)
+
+    def from_store(self, df: pd.DataFrame, endpoint: Endpoint) -> pd.DataFrame:
+        """Turn stored rows back into this transformer's output"""
+        return df
+
+    @staticmethod
+    def _project(df, columns: Optional[Sequence[str]]):
+        if columns is None or not isinstance(df, pd.DataFrame) or df.empty:
+            return df
+        return df[[c for c in columns if c in df.columns]]
+
+    def fetch_json(self, endpoint: Endpoint) -> Dict:
+        """Fetch an endpoint, asking for a full page unless it sets its own limit"""
+        return self.fetcher.get_json(self._paged(endpoint).url)
+
+    async def afetch_json(self, endpoint: Endpoint) -> Dict:
+        """``fetch_json`` over the shared async client"""
+        return await self.async_fetcher.get_json(self._paged(endpoint).url)
+
+    def _paged(self, endpoint: Endpoint) -> Endpoint:
+        if 'limit' not in dict(endpoint.params):
+            return endpoint.with_params(limit=self.PAGE_LIMIT)
+        return endpoint
+
+    def transform(self, endpoint: Union[str, Endpoint]) -> pd.DataFrame:
+        """Fetch an endpoint and parse its payload into a DataFrame"""
+        endpoint = Endpoint.coerce(endpoint)
+        try:
+            payload = self.fetch_json(endpoint)
+        except Exception as e:
+            logger.error("Error fetching %s: %s", endpoint, e)
+            return pd.DataFrame()
+        return self._parse(endpoint, payload)
+
+    async def atransform(self, endpoint: Union[str, Endpoint]) -> pd.DataFrame:
+        """``transform`` without blocking the event loop on the HTTP round trip"""
+        endpoint = Endpoint.coerce(endpoint)
+        try:
+            payload = await self.afetch_json(endpoint)
+        except Exception as e:
+            logger.error("Error fetching %s: %s", endpoint, e)
+            return pd.DataFrame()
+        return self._parse(endpoint, payload)
+
+    def _parse(self, endpoint: Endpoint, payload: Dict) -> pd.DataFrame:
+        with span("parse", kind=endpoint.kind) as parse_span:
+            df = apply_schema(self.parse(endpoint, payload))
+            parse_span.add(rows=len(df))
+            return df
+
+    def parse(self, endpoint: Endpoint, payload: Dict) -> pd.DataFrame:
+        """Turn an endpoint's decoded JSON into this transformer's DataFrame (typed afterwards by ``apply_schema``)"""
+        raise NotImplementedError
 
 class DriverStandingsTransformer(BaseTransformer):
     def transform(self, endpoint: str) -> str:
@@ -8,4 +139,4 @@ class DriverStandingsTransformer(BaseTransformer):
 
 class RaceResultsTransformer(BaseTransformer):
     def transform(self, endpoint: str) -> str:
-        return f"Race results data from {endpoint}" 
\ No newline at end of file
+        return f"Race results data from {endpoint}"
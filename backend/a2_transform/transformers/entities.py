@@ -0,0 +1,52 @@
+import logging
+import pandas as pd
+from typing import Dict
+from api.endpoint import Endpoint
+from ..decoder import decode_rows, field, merge_names, to_frame
+from .base import BaseTransformer
+from .registry import register_transformer
+
+logger = logging.getLogger(__name__)
+
+@register_transformer('drivers', 'constructors')
+class EntityListTransformer(BaseTransformer):
+    """Driver and constructor listings (``/2023/drivers.json``, ``/2023/constructors.json``)"""
+
+    FIELDS = {
+        'drivers': (
+            field('driver_id', 'driverId'),
+            field('given_name', 'givenName', default=''),
+            field('family_name', 'familyName', default=''),
+            field('code', 'code'),
+            field('number', 'permanentNumber'),
+            field('nationality', 'nationality'),
+            field('date_of_birth', 'dateOfBirth'),
+        ),
+        'constructors': (
+            field('constructor_id', 'constructorId'),
+            field('constructor_name', 'name'),
+            field('nationality', 'nationality'),
+        ),
+    }
+    TABLES = {
+        'drivers': ('DriverTable', 'Drivers'),
+        'constructors': ('ConstructorTable', 'Constructors'),
+    }
+
+    def parse(self, endpoint: Endpoint, payload: Dict) -> pd.DataFrame:
+        try:
+            table_key, list_key = self.TABLES[endpoint.kind]
+            table = payload['MRData'][table_key]
+            
+            columns = decode_rows(table.get(list_key, []), self.FIELDS[endpoint.kind])
+            if endpoint.kind == 'drivers':
+                columns = merge_names(columns)
+            
+            df = to_frame(columns)
+            if not df.empty:
+                df.insert(0, 'season', table.get('season'))
+            return df
+            
+        except Exception as e:
+            logger.error("Error processing %s: %s", endpoint, e)
+            return pd.DataFrame()
@@ -1,63 +1,177 @@
+import asyncio
+import logging
+import datetime
+import numpy as np
 import pandas as pd
-import requests
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from typing import Iterator, List, Dict, Optional, Union
+from api.endpoint import Endpoint
+from telemetry import bind, span
+from ..schema import apply_schema, lap_times_to_seconds
 from .base import BaseTransformer
+from .registry import register_transformer
 
+logger = logging.getLogger(__name__)
+
+RACE_COLUMNS = ['season', 'round', 'race_name', 'circuit_name']
+
+def flatten_timings(races: List[Dict]) -> pd.DataFrame:
+    """One row per (race, lap, driver) timing, built column by column"""
+    race_rows, race_counts = [], []
+    lap_numbers, lap_counts = [], []
+    driver_ids, positions, times = [], [], []
+    for race in races:
+        race_rows.append((race['season'], race['round'], race['raceName'], race['Circuit']['circuitName']))
+        rows = 0
+        for lap in race.get('Laps', []):
+            timings = lap['Timings']
+            lap_numbers.append(int(lap['number']))
+            lap_counts.append(len(timings))
+            rows += len(timings)
+            for timing in timings:
+                driver_ids.append(timing['driverId'])
+                positions.append(timing['position'])
+                times.append(timing['time'])
+        race_counts.append(rows)
+    
+    # Race and lap attributes are repeated per timing instead of per-row Python appends
+    race_index = np.repeat(np.arange(len(race_rows)), race_counts)
+    columns = {
+        name: np.array([row[i] for row in race_rows], dtype=object)[race_index]
+        for i, name in enumerate(RACE_COLUMNS)
+    }
+    columns['lap_number'] = np.repeat(np.array(lap_numbers, dtype=np.int64), lap_counts)
+    columns['driver_id'] = np.array(driver_ids, dtype=object)
+    columns['position'] = np.array(positions, dtype=str).astype(np.int64) if positions else np.array([], dtype=np.int64)
+    columns['time'] = np.array(times, dtype=object)
+    return pd.DataFrame(columns)
+
+def fastest_laps(timings: pd.DataFrame) -> pd.DataFrame:
+    """Each driver's fastest lap per race, in order of first appearance"""
+    timings = timings.assign(lap_seconds=lap_times_to_seconds(timings['time'])).dropna(subset=['lap_seconds'])
+    if timings.empty:
+        return pd.DataFrame()
+    
+    idx = timings.groupby(['season', 'round', 'driver_id'], sort=False, observed=True)['lap_seconds'].idxmin()
+    fastest = timings.loc[idx, ['season', 'round', 'race_name', 'circuit_name', 'driver_id', 'lap_seconds', 'lap_number']]
+    return fastest.rename(columns={
+        'lap_seconds': 'fastest_lap_time',
+        'lap_number': 'fastest_lap_number'
+    }).reset_index(drop=True)
+
+@register_transformer('laps')
 class LapTimesTransformer(BaseTransformer):
-    def transform(self, endpoint: str) -> pd.DataFrame:
+    """Fastest laps from the complete, paginated lap timing table.
+
+    A round's ~1,200 timings span several Ergast pages; they are fetched
+    concurrently via ``ErgastFetcher.iter_pages``. An endpoint without a
+    round (``/2023/laps.json``) covers every completed round of the season.
+    """
+
+    PAGE_WORKERS = 4
+    ROUND_WORKERS = 4
+    # The store keeps raw timings; fastest laps are derived on read
+    STORES_OUTPUT = False
+
+    def transform(self, endpoint: Union[str, Endpoint]) -> pd.DataFrame:
         """Transform lap times data focusing on fastest laps"""
         try:
-            response = requests.get(endpoint)
-            response.raise_for_status()
-            data = response.json()['MRData']['RaceTable']
-            
-            if not data.get('Races'):
-                print(f"No race data found for {endpoint}")
-                return pd.DataFrame()
-            
-            race = data['Races'][0]
-            
-            # Extract fastest lap per driver
-            driver_fastest_laps = {}
-            for lap in race.get('Laps', []):
-                for timing in lap['Timings']:
-                    lap_time_sec = self._convert_lap_time_to_seconds(timing['time'])
-                    driver_id = timing['driverId']
-                    
-                    if driver_id not in driver_fastest_laps or lap_time_sec < driver_fastest_laps[driver_id]['time']:
-                        driver_fastest_laps[driver_id] = {
-                            'time': lap_time_sec,
-                            'lap_number': lap['number']
-                        }
-            
-            # Create DataFrame
-            rows = []
-            for driver_id, lap_data in driver_fastest_laps.items():
-                rows.append({
-                    'season': race['season'],
-                    'round': race['round'],
-                    'race_name': race['raceName'],
-                    'circuit_name': race['Circuit']['circuitName'],
-                    'driver_id': driver_id,
-                    'fastest_lap_time': lap_data['time'],
-                    'fastest_lap_number': lap_data['lap_number']
-                })
-            
-            return pd.DataFrame(rows)
+            endpoint = Endpoint.coerce(endpoint)
+            return self._fastest(endpoint, self.timings(endpoint))
             
         except Exception as e:
-            print(f"Error processing lap times: {str(e)}")
+            logger.error("Error processing lap times: %s", e)
             return pd.DataFrame()
 
-    def _convert_lap_time_to_seconds(self, lap_time: str) -> float:
-        """Convert lap time string (1:30.100) to seconds (90.100)"""
+    async def atransform(self, endpoint: Union[str, Endpoint]) -> pd.DataFrame:
         try:
-            if ':' in lap_time:
-                minutes, seconds = lap_time.split(':')
-                return float(minutes) * 60 + float(seconds)
-            return float(lap_time)
-        except:
-            return 0.0
+            endpoint = Endpoint.coerce(endpoint)
+            return self._fastest(endpoint, await self.atimings(endpoint))
+            
+        except Exception as e:
+            logger.error("Error processing lap times: %s", e)
+            return pd.DataFrame()
+
+    @staticmethod
+    def _fastest(endpoint: Endpoint, timings: pd.DataFrame) -> pd.DataFrame:
+        if timings.empty:
+            logger.info("No race data found for %s", endpoint)
+            return pd.DataFrame()
+        return fastest_laps(timings)
+
+    def timings(self, endpoint: Union[str, Endpoint]) -> pd.DataFrame:
+        """Every lap timing of a round, or of each completed round when none is given"""
+        endpoint = Endpoint.coerce(endpoint)
+        if endpoint.round is None:
+            rounds = [replace(endpoint, round=r) for r in self._completed_rounds(endpoint)]
+            with ThreadPoolExecutor(max_workers=self.ROUND_WORKERS, thread_name_prefix="laps-round") as pool:
+                chunks = list(pool.map(bind(self.timings), rounds))
+        else:
+            chunks = list(self.iter_timings(endpoint))
+        
+        return self._concat(chunks)
+
+    async def atimings(self, endpoint: Union[str, Endpoint]) -> pd.DataFrame:
+        """``timings`` with rounds and pages fetched concurrently on the event loop"""
+        endpoint = Endpoint.coerce(endpoint)
+        if endpoint.round is None:
+            semaphore = asyncio.Semaphore(self.ROUND_WORKERS)
+
+            async def round_timings(round_endpoint: Endpoint) -> pd.DataFrame:
+                async with semaphore:
+                    return await self.atimings(round_endpoint)
+
+            rounds = [replace(endpoint, round=r) for r in await self._acompleted_rounds(endpoint)]
+            chunks = await asyncio.gather(*(round_timings(r) for r in rounds))
+        else:
+            pages = self.async_fetcher.iter_pages(
+                endpoint.url, page_size=self.PAGE_LIMIT, max_concurrency=self.PAGE_WORKERS
+            )
+            chunks = [self._flatten(page) async for page in pages]
+        return self._concat(chunks)
+
+    @staticmethod
+    def _flatten(page: Dict) -> pd.DataFrame:
+        with span("parse", kind='laps') as parse_span:
+            df = flatten_timings(page['MRData']['RaceTable'].get('Races', []))
+            parse_span.add(rows=len(df))
+            return df
+
+    @staticmethod
+    def _concat(chunks: List[pd.DataFrame]) -> pd.DataFrame:
+        chunks = [chunk for chunk in chunks if not chunk.empty]
+        return apply_schema(pd.concat(chunks, ignore_index=True)) if chunks else flatten_timings([])
+
+    def iter_timings(self, endpoint: Union[str, Endpoint]) -> Iterator[pd.DataFrame]:
+        """Stream a round's lap timings one Ergast page at a time"""
+        endpoint = Endpoint.coerce(endpoint)
+        pages = self.fetcher.iter_pages(endpoint.url, page_size=self.PAGE_LIMIT, max_workers=self.PAGE_WORKERS)
+        for page in pages:
+            yield self._flatten(page)
+
+    def snapshot(self, endpoint: Endpoint) -> pd.DataFrame:
+        return self.timings(endpoint)
+
+    def from_store(self, df: pd.DataFrame, endpoint: Endpoint) -> pd.DataFrame:
+        return fastest_laps(df) if not df.empty else pd.DataFrame()
+
+    def _completed_rounds(self, endpoint: Endpoint) -> List[int]:
+        """Rounds of the endpoint's season that have already been raced"""
+        return self._raced(self.fetch_json(self._schedule(endpoint)))
+
+    async def _acompleted_rounds(self, endpoint: Endpoint) -> List[int]:
+        return self._raced(await self.afetch_json(self._schedule(endpoint)))
+
+    @staticmethod
+    def _schedule(endpoint: Endpoint) -> Endpoint:
+        return Endpoint(kind='races', season=endpoint.season, base_url=endpoint.base_url)
+
+    @staticmethod
+    def _raced(payload: Dict) -> List[int]:
+        races = payload['MRData']['RaceTable'].get('Races', [])
+        today = datetime.date.today().isoformat()
+        return [int(race['round']) for race in races if race.get('date', '') <= today]
 
     def combine_results(self, dfs: List[pd.DataFrame]) -> pd.DataFrame:
         """Combine results from multiple races"""
@@ -0,0 +1,39 @@
+import logging
+import pandas as pd
+from typing import Dict
+from api.endpoint import Endpoint
+from ..decoder import decode_table, field, to_frame
+from .base import BaseTransformer
+from .registry import register_transformer
+
+logger = logging.getLogger(__name__)
+
+RACE_FIELDS = (
+    field('season', 'season'),
+    field('round', 'round'),
+    field('race_name', 'raceName'),
+    field('circuit_id', 'Circuit', 'circuitId'),
+)
+STOP_FIELDS = (
+    field('driver_id', 'driverId'),
+    field('stop', 'stop', default=0),
+    field('lap', 'lap', default=0),
+    field('time_of_day', 'time'),
+    field('duration', 'duration'),
+)
+
+@register_transformer('pitstops')
+class PitStopsTransformer(BaseTransformer):
+    def parse(self, endpoint: Endpoint, payload: Dict) -> pd.DataFrame:
+        """Transform a pit stop payload to DataFrame"""
+        try:
+            races = payload['MRData']['RaceTable'].get('Races', [])
+            
+            columns = decode_table(races, 'PitStops', RACE_FIELDS, STOP_FIELDS)
+            if not len(columns['driver_id']):
+                return pd.DataFrame()
+            return to_frame(columns)
+            
+        except Exception as e:
+            logger.error("Error processing pit stops: %s", e)
+            return pd.DataFrame()
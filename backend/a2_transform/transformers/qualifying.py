@@ -1,20 +1,39 @@
+import logging
 import pandas as pd
-import requests
 from typing import List, Dict, Optional
+from api.endpoint import Endpoint
+from ..decoder import decode_table, field, merge_names, to_frame
 from .base import BaseTransformer
+from .registry import register_transformer
 
+logger = logging.getLogger(__name__)
+
+RACE_FIELDS = (
+    field('season', 'season'),
+    field('round', 'round'),
+    field('race_name', 'raceName'),
+    field('circuit_id', 'Circuit', 'circuitId'),
+    field('circuit_name', 'Circuit', 'circuitName'),
+    field('date', 'date'),
+)
+QUALIFYING_FIELDS = (
+    field('driver_id', 'Driver', 'driverId'),
+    field('given_name', 'Driver', 'givenName', default=''),
+    field('family_name', 'Driver', 'familyName', default=''),
+    field('constructor_id', 'Constructor', 'constructorId'),
+    field('constructor_name', 'Constructor', 'name'),
+    field('position', 'position'),
+    field('q1_time', 'Q1', default=''),
+    field('q2_time', 'Q2', default=''),
+    field('q3_time', 'Q3', default=''),
+)
+
+@register_transformer('qualifying')
 class QualifyingTransformer(BaseTransformer):
-    def transform(self, endpoint: str) -> pd.DataFrame:
-        """Transform qualifying data from endpoint URL to DataFrame"""
+    def parse(self, endpoint: Endpoint, payload: Dict) -> pd.DataFrame:
+        """Transform a qualifying payload to DataFrame"""
         try:
-            # Extract year from endpoint
-            parts = endpoint.split('/')
-            year = next(p for p in parts if p.isdigit())
-            
-            # Make API request
-            response = requests.get(endpoint)
-            response.raise_for_status()
-            data = response.json()['MRData']
+            data = payload['MRData']
             
             # Process data based on response structure
             if 'RaceTable' in data:
@@ -22,65 +41,27 @@ class QualifyingTransformer(BaseTransformer):
             elif 'QualifyingTable' in data:
                 return self._process_qualifying_table(data['QualifyingTable'])
             else:
-                print(f"Unexpected data structure in response: {list(data.keys())}")
+                logger.warning("Unexpected data structure in response: %s", list(data))
                 return pd.DataFrame()
                 
         except Exception as e:
-            print(f"Error processing qualifying data: {str(e)}")
+            logger.error("Error processing qualifying data: %s", e)
             return pd.DataFrame()
 
     def _process_race_table(self, race_table: Dict) -> pd.DataFrame:
         """Process data from RaceTable format"""
-        rows = []
-        for race in race_table.get('Races', []):
-            race_info = {
-                'season': race.get('season'),
-                'round': race.get('round'),
-                'race_name': race.get('raceName'),
-                'circuit_id': race.get('Circuit', {}).get('circuitId'),
-                'circuit_name': race.get('Circuit', {}).get('circuitName'),
-                'date': race.get('date'),
-            }
-            
-            for quali in race.get('QualifyingResults', []):
-                driver = quali.get('Driver', {})
-                constructor = quali.get('Constructor', {})
-                
-                rows.append({
-                    **race_info,
-                    'driver_id': driver.get('driverId'),
-                    'driver_name': f"{driver.get('givenName', '')} {driver.get('familyName', '')}".strip(),
-                    'constructor_id': constructor.get('constructorId'),
-                    'constructor_name': constructor.get('name'),
-                    'position': quali.get('position'),
-                    'q1_time': quali.get('Q1', ''),
-                    'q2_time': quali.get('Q2', ''),
-                    'q3_time': quali.get('Q3', '')
-                })
-        
-        return pd.DataFrame(rows)
+        return self._frame(decode_table(race_table.get('Races', []), 'QualifyingResults', RACE_FIELDS, QUALIFYING_FIELDS))
 
     def _process_qualifying_table(self, qualifying_table: Dict) -> pd.DataFrame:
         """Process data from QualifyingTable format"""
-        rows = []
-        for quali in qualifying_table.get('QualifyingResults', []):
-            driver = quali.get('Driver', {})
-            constructor = quali.get('Constructor', {})
-            
-            rows.append({
-                'season': qualifying_table.get('season'),
-                'round': qualifying_table.get('round'),
-                'driver_id': driver.get('driverId'),
-                'driver_name': f"{driver.get('givenName', '')} {driver.get('familyName', '')}".strip(),
-                'constructor_id': constructor.get('constructorId'),
-                'constructor_name': constructor.get('name'),
-                'position': quali.get('position'),
-                'q1_time': quali.get('Q1', ''),
-                'q2_time': quali.get('Q2', ''),
-                'q3_time': quali.get('Q3', '')
-            })
-        
-        return pd.DataFrame(rows)
+        table_fields = (field('season', 'season'), field('round', 'round'))
+        return self._frame(decode_table([qualifying_table], 'QualifyingResults', table_fields, QUALIFYING_FIELDS))
+
+    @staticmethod
+    def _frame(columns: Dict) -> pd.DataFrame:
+        if not len(columns['driver_id']):
+            return pd.DataFrame()
+        return to_frame(merge_names(columns))
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='F1 Qualifying Processor')
@@ -1,20 +1,19 @@
+import logging
 import pandas as pd
-import requests
 from typing import List, Dict, Optional
+from api.endpoint import Endpoint
 from .base import BaseTransformer
+from .registry import register_transformer
 
+logger = logging.getLogger(__name__)
+
+@register_transformer('races')
 class RaceScheduleTransformer(BaseTransformer):
-    def transform(self, endpoint: str) -> pd.DataFrame:
-        """Transform race schedule data from endpoint URL to DataFrame"""
+    def parse(self, endpoint: Endpoint, payload: Dict) -> pd.DataFrame:
+        """Transform a race schedule payload to DataFrame"""
         try:
-            # Extract year from endpoint
-            parts = endpoint.split('/')
-            year = next(p for p in parts if p.isdigit())
-            
             # Get race schedule
-            response = requests.get(endpoint)
-            response.raise_for_status()
-            data = response.json()['MRData']['RaceTable']['Races']
+            data = payload['MRData']['RaceTable']['Races']
             
             # Convert to DataFrame
             df = pd.DataFrame(data)
@@ -27,12 +26,15 @@ class RaceScheduleTransformer(BaseTransformer):
             
             # Add lap times endpoints for each race
             df['lap_endpoint'] = df.apply(
-                lambda row: f"{self.BASE_URL}/{year}/{row['round']}/laps",
+                lambda row: Endpoint(
+                    kind='laps', season=int(row['season']), round=int(row['round']),
+                    base_url=endpoint.base_url
+                ).url,
                 axis=1
             )
             
             return df
             
         except Exception as e:
-            print(f"Error processing race schedule: {str(e)}")
+            logger.error("Error processing race schedule: %s", e)
             return pd.DataFrame() 
\ No newline at end of file
@@ -0,0 +1,20 @@
+from typing import Callable, Dict, Type
+
+from .base import BaseTransformer
+
+# Endpoint kind ('results', 'driverStandings', ...) -> transformer class
+TRANSFORMER_REGISTRY: Dict[str, Type[BaseTransformer]] = {}
+
+
+def register_transformer(*kinds: str) -> Callable[[Type[BaseTransformer]], Type[BaseTransformer]]:
+    """Class decorator registering a transformer for one or more endpoint kinds"""
+    def decorator(cls: Type[BaseTransformer]) -> Type[BaseTransformer]:
+        for kind in kinds:
+            if kind in TRANSFORMER_REGISTRY and TRANSFORMER_REGISTRY[kind] is not cls:
+                raise ValueError(
+                    f"Endpoint kind '{kind}' already handled by {TRANSFORMER_REGISTRY[kind].__name__}"
+                )
+            TRANSFORMER_REGISTRY[kind] = cls
+        cls.KINDS = tuple(dict.fromkeys(getattr(cls, 'KINDS', ()) + kinds))
+        return cls
+    return decorator
@@ -1,59 +1,71 @@
+import asyncio
+import datetime
+import logging
 import pandas as pd
 import requests
 import argparse
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Union
+from api.endpoint import Endpoint
+from telemetry import bind
+from .base import BaseTransformer
+from .registry import register_transformer
+from ..decoder import decode_table, field, merge_names, to_frame
+from ..fetcher import get_fetcher
 
-def fetch_race_results(year, round_num=None):
+logger = logging.getLogger(__name__)
+
+def fetch_race_results(year, round_num=None, fetcher=None, limit=1000):
     """Fetch race results with optional round parameter"""
+    # Ergast pages at 30 rows by default; a season is ~440 result rows
+    endpoint = Endpoint(
+        kind='results',
+        season=int(year),
+        round=int(round_num) if round_num else None,
+        params=(('limit', str(limit)),)
+    )
+    return fetch_races(endpoint.url, fetcher)
+
+def fetch_races(url, fetcher=None):
+    """Fetch the RaceTable races of a results endpoint URL"""
     try:
-        # Build URL based on round presence
-        if round_num:
-            url = f"http://ergast.com/api/f1/{year}/{round_num}/results.json"
-        else:
-            url = f"http://ergast.com/api/f1/{year}/results.json"
-            
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
+        data = (fetcher or get_fetcher()).get_json(url)
         return data['MRData']['RaceTable']['Races']
         
     except requests.exceptions.RequestException as e:
-        print(f"API request failed: {e}")
+        logger.error("API request failed: %s", e)
         return []
     except (KeyError, ValueError) as e:
-        print(f"Data processing error: {e}")
+        logger.error("Data processing error: %s", e)
         return []
 
-def process_results_data(races):
-    """Process race data into DataFrame"""
-    rows = []
-    for race in races:
-        race_info = {
-            'race_id': race.get('round'),
-            'season': race.get('season'),
-            'race_name': race.get('raceName'),
-            'circuit_id': race.get('Circuit', {}).get('circuitId'),
-            'date': race.get('date'),
-            'time': race.get('time')
-        }
-        
-        for result in race.get('Results', []):
-            driver = result.get('Driver', {})
-            constructor = result.get('Constructor', {})
-            
-            rows.append({
-                **race_info,
-                'driver_id': driver.get('driverId'),
-                'driver_name': f"{driver.get('givenName', '')} {driver.get('familyName', '')}".strip(),
-                'constructor_id': constructor.get('constructorId'),
-                'constructor_name': constructor.get('name'),
-                'grid': try_int(result.get('grid')),
-                'laps': try_int(result.get('laps')),
-                'position': try_int(result.get('position')),
-                'status': result.get('status'),
-                'points': float(result.get('points', 0))
-            })
-    
-    return pd.DataFrame(rows)
+RACE_FIELDS = (
+    field('race_id', 'round'),
+    field('season', 'season'),
+    field('race_name', 'raceName'),
+    field('circuit_id', 'Circuit', 'circuitId'),
+    field('date', 'date'),
+    field('time', 'time'),
+)
+RESULT_FIELDS = (
+    field('driver_id', 'Driver', 'driverId'),
+    field('given_name', 'Driver', 'givenName', default=''),
+    field('family_name', 'Driver', 'familyName', default=''),
+    field('constructor_id', 'Constructor', 'constructorId'),
+    field('constructor_name', 'Constructor', 'name'),
+    field('grid', 'grid'),
+    field('laps', 'laps'),
+    field('position', 'position'),
+    field('status', 'status'),
+    field('points', 'points', default=0),
+)
+
+def process_results_data(races, results_key='Results'):
+    """Process race data into DataFrame (``results_key='SprintResults'`` for sprints)"""
+    columns = decode_table(races, results_key, RACE_FIELDS, RESULT_FIELDS)
+    if not len(columns['driver_id']):
+        return pd.DataFrame()
+    return to_frame(merge_names(columns))
 
 def try_int(value):
     """Safe conversion to integer"""
@@ -62,64 +74,113 @@ def try_int(value):
     except:
         return None
 
-class RaceResultsTransformer:
-    def transform(self, endpoint: str) -> pd.DataFrame:
+@register_transformer('results', 'sprint')
+class RaceResultsTransformer(BaseTransformer):
+    # Concurrent per-race fetches for a circuit's history: one per pooled connection
+    CIRCUIT_WORKERS = 16
+
+    def transform(self, endpoint: Union[str, Endpoint]) -> pd.DataFrame:
+        endpoint = Endpoint.coerce(endpoint)
+        if endpoint.circuit:
+            return self._transform_circuit(endpoint)
+        # Standard driver/year processing: fetch the endpoint itself so Ergast applies the filter
+        return super().transform(endpoint)
+
+    async def atransform(self, endpoint: Union[str, Endpoint]) -> pd.DataFrame:
+        endpoint = Endpoint.coerce(endpoint)
+        if endpoint.circuit:
+            return await self._atransform_circuit(endpoint)
+        return await super().atransform(endpoint)
+
+    def parse(self, endpoint: Endpoint, payload: Dict) -> pd.DataFrame:
         try:
-            # Extract parameters
-            parts = endpoint.split('/')
-            if 'circuits' in parts:
-                # Handle circuit-specific pattern: /f1/circuits/{circuitId}/{year}/results.json
-                circuit_idx = parts.index('circuits') + 1
-                year_idx = circuit_idx + 1
-                if year_idx >= len(parts):
-                    print(f"Invalid circuit endpoint: {endpoint}")
-                    return pd.DataFrame()
-                    
-                circuit_id = parts[circuit_idx]
-                year = parts[year_idx]
-                return self._process_circuit_results(circuit_id, year)
-                
-            else:
-                # Standard driver/year processing
-                return self._process_driver_results(endpoint)
-                
+            races = payload['MRData']['RaceTable']['Races']
+            results_key = 'SprintResults' if endpoint.kind == 'sprint' else 'Results'
+            return process_results_data(races, results_key)
+            
         except Exception as e:
-            print(f"Error processing {endpoint}: {str(e)}")
+            logger.error("Error processing %s: %s", endpoint, e)
             return pd.DataFrame()
 
-    def _process_circuit_results(self, circuit_id: str, year: str):
-        # First get all races at this circuit
-        races = self._fetch_circuit_races(circuit_id, year)
-        
-        # Then get results for each race
-        all_results = []
-        for race in races:
-            race_year = race['season']
-            round_num = race['round']
-            results = self._fetch_race_results(race_year, round_num)
-            all_results.extend(self._process_results(results))
-            
-        return pd.DataFrame(all_results)
+    def _transform_circuit(self, endpoint: Endpoint) -> pd.DataFrame:
+        """Results at a circuit: its race list in one call, then every race's results concurrently"""
+        if endpoint.round is not None:
+            # A single race: Ergast applies the circuit filter itself
+            return super().transform(endpoint)
+        try:
+            races = self._circuit_races(endpoint, self.fetcher.get_json(self._circuit_races_endpoint(endpoint).url))
+            race_endpoints = self._race_endpoints(endpoint, races)
+            if not race_endpoints:
+                return pd.DataFrame()
+            workers = min(self.CIRCUIT_WORKERS, len(race_endpoints))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="circuit-results") as pool:
+                payloads = list(pool.map(bind(self._fetch_race), race_endpoints))
+            return self._process_results(endpoint, payloads)
+        except Exception as e:
+            logger.error("Error processing %s: %s", endpoint, e)
+            return pd.DataFrame()
 
-    def _process_driver_results(self, endpoint: str) -> pd.DataFrame:
-        # Extract parameters from endpoint URL
-        parts = endpoint.split('/')
-        year = parts[5]
-        round_num = parts[6] if len(parts) > 6 and not parts[6].startswith('drivers') else None
-        
-        # Fetch and process data
-        races = fetch_race_results(year, round_num)
-        return process_results_data(races)
+    async def _atransform_circuit(self, endpoint: Endpoint) -> pd.DataFrame:
+        if endpoint.round is not None:
+            return await super().atransform(endpoint)
+        try:
+            payload = await self.async_fetcher.get_json(self._circuit_races_endpoint(endpoint).url)
+            race_endpoints = self._race_endpoints(endpoint, self._circuit_races(endpoint, payload))
+            payloads = await asyncio.gather(*(self._afetch_race(race) for race in race_endpoints))
+            return self._process_results(endpoint, payloads)
+        except Exception as e:
+            logger.error("Error processing %s: %s", endpoint, e)
+            return pd.DataFrame()
 
-    def _fetch_circuit_races(self, circuit_id: str, year: str):
-        # Implement the logic to fetch races at a specific circuit and year
-        # This is a placeholder and should be replaced with the actual implementation
-        return []
+    def _circuit_races_endpoint(self, endpoint: Endpoint) -> Endpoint:
+        # Season-less, so one cached response serves every year asked about at this circuit
+        return Endpoint(
+            kind='races', circuit=endpoint.circuit,
+            params=(('limit', str(self.PAGE_LIMIT)),), base_url=endpoint.base_url,
+        )
 
-    def _process_results(self, results):
-        # Implement the logic to process results and return a list of dictionaries
-        # This is a placeholder and should be replaced with the actual implementation
-        return []
+    @staticmethod
+    def _circuit_races(endpoint: Endpoint, payload: Dict) -> List[Dict]:
+        """Races from a circuit's schedule that fall in the endpoint's season and have been run"""
+        season = endpoint.season
+        if season == 'current':
+            season = datetime.date.today().year
+        today = datetime.date.today().isoformat()
+        return [
+            race for race in payload['MRData']['RaceTable']['Races']
+            if (season is None or race.get('season') == str(season)) and race.get('date', '') <= today
+        ]
+
+    @staticmethod
+    def _race_endpoints(endpoint: Endpoint, races: List[Dict]) -> List[Endpoint]:
+        # Driver/constructor narrowing carries over, so each race page holds only the rows asked for
+        return [
+            Endpoint(
+                kind=endpoint.kind, season=int(race['season']), round=int(race['round']),
+                constructor=endpoint.constructor, driver=endpoint.driver, base_url=endpoint.base_url,
+            )
+            for race in races
+        ]
+
+    def _fetch_race(self, endpoint: Endpoint) -> Optional[Dict]:
+        try:
+            return self.fetch_json(endpoint)
+        except Exception as e:
+            logger.error("Error fetching %s: %s", endpoint, e)
+            return None
+
+    async def _afetch_race(self, endpoint: Endpoint) -> Optional[Dict]:
+        try:
+            return await self.afetch_json(endpoint)
+        except Exception as e:
+            logger.error("Error fetching %s: %s", endpoint, e)
+            return None
+
+    def _process_results(self, endpoint: Endpoint, payloads: List[Optional[Dict]]) -> pd.DataFrame:
+        """One typed frame over every fetched race page, in schedule order"""
+        races = [race for payload in payloads if payload for race in payload['MRData']['RaceTable']['Races']]
+        results_key = 'SprintResults' if endpoint.kind == 'sprint' else 'Results'
+        return process_results_data(races, results_key)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='F1 Results Processor')
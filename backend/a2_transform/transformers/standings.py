@@ -1,22 +1,56 @@
+import asyncio
+import logging
 import pandas as pd
 import requests
 import argparse
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Dict, Optional, Sequence, Union
+from api.endpoint import Endpoint, get_base_url
+from telemetry import bind, span
+from ..decoder import decode_table, field, merge_names, to_frame
+from ..schema import apply_schema
 from .base import BaseTransformer
+from .registry import register_transformer
+from ..fetcher import get_fetcher
+
+logger = logging.getLogger(__name__)
+
+DRIVER_STANDING_FIELDS = (
+    field('position', 'position', default=0),
+    field('points', 'points', default=0),
+    field('wins', 'wins', default=0),
+    field('driver_id', 'Driver', 'driverId', default=''),
+    field('given_name', 'Driver', 'givenName', default=''),
+    field('family_name', 'Driver', 'familyName', default=''),
+    field('constructor', 'Constructors', 0, 'name', default=''),
+)
+CONSTRUCTOR_STANDING_FIELDS = (
+    field('position', 'position', default=0),
+    field('points', 'points', default=0),
+    field('wins', 'wins', default=0),
+    field('constructor_id', 'Constructor', 'constructorId', default=''),
+    field('constructor_name', 'Constructor', 'name', default=''),
+    field('nationality', 'Constructor', 'nationality', default=''),
+)
+
+# Planner kinds for standings after every round of a season (``/2023/driverStandingsByRound.json``),
+# named after the store tables ``progression`` keeps them in
+PROGRESSION_KINDS = {
+    'driverStandingsByRound': 'driverStandings',
+    'constructorStandingsByRound': 'constructorStandings',
+}
 
 def fetch_standings(year: str, standing_type: str):
     """Fetch standings data from Ergast API"""
     try:
-        url = f"http://ergast.com/api/f1/{year}/{standing_type}Standings.json"
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
+        url = Endpoint(kind=f"{standing_type}Standings", season=year).url
+        data = get_fetcher().get_json(url)
         return data['MRData']['StandingsTable']['StandingsLists']
     except requests.exceptions.RequestException as e:
-        print(f"API request failed: {e}")
+        logger.error("API request failed: %s", e)
         return []
     except ValueError as e:
-        print(f"Invalid JSON response: {e}")
+        logger.error("Invalid JSON response: %s", e)
         return []
 
 def process_standings(standings_lists, standing_type='driver'):
@@ -58,21 +92,46 @@ def process_standings(standings_lists, standing_type='driver'):
     
     return pd.DataFrame(rows)
 
+@register_transformer('driverStandings', 'constructorStandings', *PROGRESSION_KINDS)
 class StandingsTransformer(BaseTransformer):
-    def transform(self, endpoint: str) -> pd.DataFrame:
-        """Transform standings data from endpoint URL to DataFrame"""
+    """Standings tables; the ``...ByRound`` kinds expand to ``progression`` over the endpoint's season."""
+    # Concurrent per-round fetches when building a progression: one per pooled connection
+    ROUND_WORKERS = 16
+
+    def transform(self, endpoint: Union[str, Endpoint]) -> pd.DataFrame:
+        endpoint = Endpoint.coerce(endpoint)
+        if endpoint.kind not in PROGRESSION_KINDS:
+            return super().transform(endpoint)
+        return self.progression(
+            endpoint.season,
+            PROGRESSION_KINDS[endpoint.kind],
+            incremental=isinstance(endpoint.season, int),
+            base_url=endpoint.base_url,
+        )
+
+    async def atransform(self, endpoint: Union[str, Endpoint]) -> pd.DataFrame:
+        endpoint = Endpoint.coerce(endpoint)
+        if endpoint.kind not in PROGRESSION_KINDS:
+            return await super().atransform(endpoint)
+        # The per-round fetches already fan out over a thread pool
+        return await asyncio.to_thread(self.transform, endpoint)
+
+    def _read_store(self, endpoint: Endpoint, columns: Optional[Sequence[str]]) -> Optional[pd.DataFrame]:
+        # A stored progression may stop short of the latest round; ``progression`` tops it up itself
+        if endpoint.kind in PROGRESSION_KINDS:
+            return None
+        return super()._read_store(endpoint, columns)
+
+    def parse(self, endpoint: Endpoint, payload: Dict) -> pd.DataFrame:
+        """Transform a standings payload to DataFrame"""
         try:
             # Determine standings type from endpoint
-            standing_type = 'driver' if 'driver' in endpoint.lower() else 'constructor'
+            standing_type = 'driver' if endpoint.kind == 'driverStandings' else 'constructor'
             
-            # Extract driver ID from URL if present
-            driver_id = None
-            if '/drivers/' in endpoint:
-                driver_id = endpoint.split('/drivers/')[1].split('/')[0]
+            # Requested driver, if the endpoint is narrowed to one
+            driver_id = endpoint.driver
             
-            response = requests.get(endpoint)
-            response.raise_for_status()
-            data = response.json()['MRData']['StandingsTable']
+            data = payload['MRData']['StandingsTable']
             
             # Get season from the data
             season = data.get('season', '')
@@ -81,51 +140,97 @@ class StandingsTransformer(BaseTransformer):
             if not standings_lists:
                 return pd.DataFrame()
             
-            rows = []
-            for standing_list in standings_lists:
-                if standing_type == 'driver':
-                    for standing in standing_list.get('DriverStandings', []):
-                        driver = standing.get('Driver', {})
-                        constructor = standing.get('Constructors', [{}])[0]
-                        
-                        # Skip if not the requested driver
-                        if driver_id and driver.get('driverId') != driver_id:
-                            continue
-                            
-                        rows.append({
-                            'season': season,
-                            'round': standing_list.get('round', ''),
-                            'position': int(standing.get('position', 0)),
-                            'points': float(standing.get('points', 0)),
-                            'wins': int(standing.get('wins', 0)),
-                            'driver_id': driver.get('driverId', ''),
-                            'driver_name': f"{driver.get('givenName', '')} {driver.get('familyName', '')}",
-                            'constructor': constructor.get('name', '')
-                        })
-                else:  # constructor standings
-                    for standing in standing_list.get('ConstructorStandings', []):
-                        constructor = standing.get('Constructor', {})
-                        rows.append({
-                            'season': season,
-                            'round': standing_list.get('round', ''),
-                            'position': int(standing.get('position', 0)),
-                            'points': float(standing.get('points', 0)),
-                            'wins': int(standing.get('wins', 0)),
-                            'constructor_id': constructor.get('constructorId', ''),
-                            'constructor_name': constructor.get('name', ''),
-                            'nationality': constructor.get('nationality', '')
-                        })
+            # Each list carries its own season, so multi-season tables keep theirs
+            list_fields = (field('season', 'season', default=season), field('round', 'round', default=''))
+            if standing_type == 'driver':
+                columns = decode_table(standings_lists, 'DriverStandings', list_fields, DRIVER_STANDING_FIELDS)
+            else:  # constructor standings
+                columns = decode_table(standings_lists, 'ConstructorStandings', list_fields, CONSTRUCTOR_STANDING_FIELDS)
+            if not len(columns['position']):
+                return pd.DataFrame()
+            if standing_type == 'driver':
+                columns = merge_names(columns)
             
-            df = pd.DataFrame(rows)
+            df = to_frame(columns)
+            # Skip all but the requested driver
+            if driver_id:
+                df = df[df['driver_id'] == driver_id]
             if not df.empty:
                 df = df.sort_values(['season', 'position'])
             
             return df
             
         except Exception as e:
-            print(f"Error processing standings data: {str(e)}")
+            logger.error("Error processing standings data: %s", e)
             return pd.DataFrame()
 
+    def progression(
+        self,
+        seasons: Union[int, Iterable[int]],
+        kind: str = 'driverStandings',
+        incremental: bool = True,
+        base_url: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """Standings after every round of ``seasons``, one row per season, round and driver (or constructor).
+
+        Each season's current standings name its last completed round; the
+        rounds before it are fetched concurrently as ``/{year}/{round}/{kind}.json``.
+        In incremental mode rounds already in the store's ``{kind}ByRound``
+        table are read back instead, and newly fetched ones are appended,
+        so a re-sync only costs the standings call plus the rounds raced since.
+        Requests go to ``base_url``, the current API root unless given.
+        """
+        seasons = [seasons] if isinstance(seasons, (int, str)) else list(seasons)
+        store = self.store if incremental else None
+        base_url = base_url or get_base_url()
+        stored_kind = f"{kind}ByRound"
+
+        with span("standings.progression", kind=kind, seasons=len(seasons)) as progression_span:
+            latest = dict(zip(seasons, self._fetch_all([Endpoint(kind=kind, season=s, base_url=base_url) for s in seasons])))
+
+            fetched, missing = {}, []
+            for season, df in latest.items():
+                if df.empty:
+                    continue
+                last = int(df['round'].max())
+                manifest = store.manifest(stored_kind, season) if store else None
+                stored = set(manifest['rounds'] or ()) if manifest else set()
+                fetched[season] = [] if last in stored else [df]
+                missing += [
+                    Endpoint(kind=kind, season=season, round=r, base_url=base_url)
+                    for r in range(1, last) if r not in stored
+                ]
+
+            for endpoint, df in zip(missing, self._fetch_all(missing)):
+                if not df.empty:
+                    fetched[endpoint.season].append(df)
+            progression_span.set(fetched_rounds=len(missing))
+
+            frames = []
+            for season, parts in fetched.items():
+                new = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame()
+                if store is None:
+                    frames.append(new)
+                    continue
+                if not new.empty:
+                    store.write(stored_kind, season, new, append=True)
+                frames.append(store.read(stored_kind, [season]))
+
+            frames = [df for df in frames if df is not None and not df.empty]
+            if not frames:
+                return pd.DataFrame()
+            # Categories differ between rounds, so the concatenation is re-typed as a whole
+            df = apply_schema(pd.concat(frames, ignore_index=True))
+            return df.sort_values(['season', 'round', 'position'], ignore_index=True)
+
+    def _fetch_all(self, endpoints: List[Endpoint]) -> List[pd.DataFrame]:
+        if not endpoints:
+            return []
+        workers = min(self.ROUND_WORKERS, len(endpoints))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="standings-round") as pool:
+            return list(pool.map(bind(self.transform), endpoints))
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='F1 Standings Processor')
     parser.add_argument('--year', type=int, required=True, help='Season year')
@@ -1,24 +1,45 @@
 # transform_status.py
 
+import logging
 import pandas as pd
 import requests
 import argparse
-from typing import Optional
+from typing import Dict, Optional
+from api.endpoint import Endpoint
+from ..decoder import decode_table, field, to_frame
 from .base import BaseTransformer
+from .registry import register_transformer
+from ..fetcher import get_fetcher
 
-def fetch_lap_timings(year: str, round_num: str, lap_number: str):
-    """Fetch lap timing data from Ergast API"""
+logger = logging.getLogger(__name__)
+
+LAP_FIELDS = (field('lap_number', 'number'),)
+TIMING_FIELDS = (field('driver_id', 'driverId'), field('position', 'position'), field('time', 'time'))
+
+def fetch_lap_timings(year: str, round_num: str, lap_number: Optional[str] = None):
+    """Fetch lap timing data from Ergast API, following pagination to the last page.
+
+    Without ``lap_number`` every lap of the race is fetched.
+    """
     try:
-        url = f"http://ergast.com/api/f1/{year}/{round_num}/laps/{lap_number}.json"
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
-        return data['MRData']['RaceTable']['Races'][0]
+        endpoint = Endpoint(
+            kind='laps',
+            season=int(year),
+            round=int(round_num),
+            number=int(lap_number) if lap_number else None
+        )
+        race_data = None
+        for page in get_fetcher().iter_pages(endpoint.url):
+            for race in page['MRData']['RaceTable']['Races']:
+                if race_data is None:
+                    race_data = {**race, 'Laps': []}
+                race_data['Laps'].extend(race.get('Laps', []))
+        return race_data
     except requests.exceptions.RequestException as e:
-        print(f"API request failed: {e}")
+        logger.error("API request failed: %s", e)
         return None
     except ValueError as e:
-        print(f"Invalid JSON response: {e}")
+        logger.error("Invalid JSON response: %s", e)
         return None
 
 def process_lap_timings(race_data):
@@ -26,37 +47,41 @@ def process_lap_timings(race_data):
     if not race_data:
         return pd.DataFrame()
 
-    rows = []
     circuit_info = race_data['Circuit']
     location_info = circuit_info['Location']
+    columns = decode_table(race_data['Laps'], 'Timings', LAP_FIELDS, TIMING_FIELDS)
+    if not len(columns['driver_id']):
+        return pd.DataFrame()
 
-    for lap in race_data['Laps']:
-        lap_number = lap['number']
-        for timing in lap['Timings']:
-            rows.append({
-                'season': race_data['season'],
-                'round': race_data['round'],
-                'lap_number': int(lap_number),
-                'driver_id': timing['driverId'],
-                'position': int(timing['position']),
-                'time': timing['time'],
-                'circuit_id': circuit_info['circuitId'],
-                'circuit_name': circuit_info['circuitName'],
-                'locality': location_info['locality'],
-                'country': location_info['country'],
-                'race_date': race_data['date'],
-                'race_time': race_data['time']
-            })
+    return to_frame({
+        'season': race_data['season'],
+        'round': race_data['round'],
+        **columns,
+        'circuit_id': circuit_info['circuitId'],
+        'circuit_name': circuit_info['circuitName'],
+        'locality': location_info['locality'],
+        'country': location_info['country'],
+        'race_date': race_data['date'],
+        'race_time': race_data['time'],
+    })
 
-    return pd.DataFrame(rows)
+DNF_KEYWORDS = ['Accident', 'Mechanical', 'Engine', 'Gearbox', 'Retired', 'DNF', 'Collision']
 
+def summarize_status(df: pd.DataFrame) -> pd.DataFrame:
+    """Flag DNF statuses and add season totals to per-status counts, most frequent first"""
+    if df.empty:
+        return df
+    df['is_dnf'] = df['status'].astype(str).str.contains('|'.join(DNF_KEYWORDS), case=False)
+    df['total_races'] = df['count'].sum()
+    df['dnf_rate'] = df[df['is_dnf']]['count'].sum() / df['total_races']
+    return df.sort_values('count', ascending=False)
+
+@register_transformer('status')
 class StatusTransformer(BaseTransformer):
-    def transform(self, endpoint: str) -> pd.DataFrame:
-        """Transform status data from endpoint URL to DataFrame"""
+    def parse(self, endpoint: Endpoint, payload: Dict) -> pd.DataFrame:
+        """Transform a status payload to DataFrame"""
         try:
-            response = requests.get(endpoint)
-            response.raise_for_status()
-            data = response.json()['MRData']['StatusTable']
+            data = payload['MRData']['StatusTable']
             
             # Get season from the data
             season = data.get('season', '')
@@ -75,34 +100,20 @@ class StatusTransformer(BaseTransformer):
                     'count': int(status.get('count', 0))
                 })
             
-            df = pd.DataFrame(rows)
-            
-            if not df.empty:
-                # Filter for DNF-related statuses if needed
-                dnf_keywords = ['Accident', 'Mechanical', 'Engine', 'Gearbox', 'Retired', 'DNF', 'Collision']
-                df['is_dnf'] = df['status'].str.contains('|'.join(dnf_keywords), case=False)
-                
-                # Add summary stats
-                df['total_races'] = df['count'].sum()
-                df['dnf_rate'] = df[df['is_dnf']]['count'].sum() / df['total_races']
-                
-                # Sort by count
-                df = df.sort_values('count', ascending=False)
-            
-            return df
+            return summarize_status(pd.DataFrame(rows))
             
         except Exception as e:
-            print(f"Error processing status: {str(e)}")
+            logger.error("Error processing status: %s", e)
             return pd.DataFrame()
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='F1 Status Processor')
     parser.add_argument('--year', type=int, required=True, help='Season year')
     parser.add_argument('--round', type=int, required=True, help='Race round number')
-    parser.add_argument('--lap', type=int, required=True, help='Lap number')
+    parser.add_argument('--lap', type=int, required=False, default=None, help='Lap number (optional, default all laps)')
     args = parser.parse_args()
 
-    race_data = fetch_lap_timings(str(args.year), str(args.round), str(args.lap))
+    race_data = fetch_lap_timings(str(args.year), str(args.round), str(args.lap) if args.lap else None)
     
     if race_data:
         df = process_lap_timings(race_data)
@@ -0,0 +1,161 @@
+"""Typed description of an Ergast API endpoint"""
+
+import os
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+DEFAULT_BASE_URL = "http://ergast.com/api/f1"
+
+# API root new endpoints point at; ``ERGAST_BASE_URL`` swaps in a mirror or a
+# local mock server (see ``mock_ergast.py``)
+BASE_URL = os.getenv("ERGAST_BASE_URL", DEFAULT_BASE_URL).rstrip("/")
+_base_url = BASE_URL
+
+
+def get_base_url() -> str:
+    return _base_url
+
+
+def set_base_url(url: Optional[str]):
+    """Point endpoints built from now on at ``url`` (``None`` restores ``BASE_URL``)"""
+    global _base_url
+    _base_url = (url or BASE_URL).rstrip("/")
+
+# Resources the API serves; the last path segment of an endpoint
+RESOURCE_KINDS = frozenset({
+    "results", "qualifying", "sprint", "driverStandings", "constructorStandings",
+    "status", "laps", "pitstops", "races", "drivers", "constructors", "circuits", "seasons",
+})
+
+# Path segments that narrow a resource to one entity, in canonical URL order
+ENTITY_SEGMENTS = (("circuits", "circuit"), ("constructors", "constructor"), ("drivers", "driver"))
+ENTITY_FIELDS = dict(ENTITY_SEGMENTS)
+
+# Query parameters that are applied to the DataFrame instead of sent to Ergast
+LOCAL_FILTER_COLUMNS = ("driver_id", "constructor_id", "circuit_id")
+
+
+@dataclass(frozen=True)
+class Endpoint:
+    """Immutable, parsed form of an Ergast endpoint.
+
+    Built once by ``ErgastURLBuilder`` (or parsed once from a URL) and passed
+    through validation, routing and transformation so no stage needs to
+    re-split the URL string.
+    """
+    kind: str
+    season: Optional[Union[int, str]] = None  # year, or "current"
+    round: Optional[Union[int, str]] = None  # round number, or "last"
+    circuit: Optional[str] = None
+    constructor: Optional[str] = None
+    driver: Optional[str] = None
+    number: Optional[int] = None  # lap / pit stop number, as in /laps/5.json
+    params: Tuple[Tuple[str, str], ...] = ()  # sent to Ergast (limit, offset)
+    filters: Tuple[Tuple[str, Tuple[str, ...]], ...] = ()  # applied locally
+    base_url: str = field(default_factory=get_base_url)
+
+    @property
+    def path(self) -> str:
+        """Route below the API root, e.g. ``/2023/drivers/hamilton/results.json``"""
+        segments = []
+        if self.season is not None:
+            segments.append(str(self.season))
+        if self.round is not None:
+            segments.append(str(self.round))
+        for segment, entity_field in ENTITY_SEGMENTS:
+            value = getattr(self, entity_field)
+            if value is not None and segment != self.kind:
+                segments.extend((segment, value))
+        segments.append(self.kind)
+        if self.kind in ENTITY_FIELDS and getattr(self, ENTITY_FIELDS[self.kind]) is not None:
+            # /drivers/hamilton.json: the entity itself
+            segments.append(getattr(self, ENTITY_FIELDS[self.kind]))
+        if self.number is not None:
+            segments.append(str(self.number))
+        return "/" + "/".join(segments) + ".json"
+
+    @property
+    def url(self) -> str:
+        """URL to fetch: route plus remote query parameters, without local filters"""
+        query = f"?{urlencode(self.params)}" if self.params else ""
+        return f"{self.base_url}{self.path}{query}"
+
+    @property
+    def filter_map(self) -> Dict[str, List[str]]:
+        return {column: list(values) for column, values in self.filters}
+
+    def with_params(self, **params) -> "Endpoint":
+        merged = {**dict(self.params), **{k: str(v) for k, v in params.items()}}
+        return replace(self, params=tuple(merged.items()))
+
+    def __str__(self) -> str:
+        """Planner form: the fetch URL with local filters appended as query parameters"""
+        if not self.filters:
+            return self.url
+        local = urlencode([(column, ",".join(values)) for column, values in self.filters])
+        return f"{self.url}{'&' if self.params else '?'}{local}"
+
+    @classmethod
+    def coerce(cls, endpoint: Union[str, "Endpoint"]) -> "Endpoint":
+        return endpoint if isinstance(endpoint, cls) else cls.parse(endpoint)
+
+    @classmethod
+    def parse(cls, url: str) -> "Endpoint":
+        """Parse an Ergast URL (absolute, or a path below the API root)"""
+        parts = urlsplit(url)
+        path = parts.path
+        root, marker, route = path.partition("/f1/")
+        if not marker:
+            root, route = "", path.lstrip("/")
+        base_url = f"{parts.scheme}://{parts.netloc}{root}/f1" if parts.netloc else get_base_url()
+        if route.endswith(".json"):
+            route = route[:-5]
+        segments = [s for s in route.split("/") if s]
+
+        fields: Dict[str, object] = {}
+        i = 0
+        if i < len(segments) and (segments[i].isdigit() and len(segments[i]) == 4 or segments[i] == "current"):
+            fields["season"] = int(segments[i]) if segments[i].isdigit() else segments[i]
+            i += 1
+            if i < len(segments) and (segments[i].isdigit() or segments[i] == "last"):
+                fields["round"] = int(segments[i]) if segments[i].isdigit() else segments[i]
+                i += 1
+
+        kind = "races"
+        while i < len(segments):
+            segment = segments[i]
+            remaining = len(segments) - i
+            if "season" not in fields and segment.isdigit() and len(segment) == 4:
+                # Legacy /circuits/{id}/{year}/results.json ordering
+                fields["season"] = int(segment)
+                i += 1
+            elif segment in ENTITY_FIELDS and remaining >= 3:
+                fields[ENTITY_FIELDS[segment]] = segments[i + 1]
+                i += 2
+            elif segment in ENTITY_FIELDS and remaining == 2 and segments[i + 1] not in RESOURCE_KINDS \
+                    and not segments[i + 1].isdigit():
+                # /drivers/hamilton.json: the entity itself
+                kind = segment
+                fields[ENTITY_FIELDS[segment]] = segments[i + 1]
+                i += 2
+            else:
+                kind = segment
+                if remaining >= 2 and segments[i + 1].isdigit():
+                    fields["number"] = int(segments[i + 1])
+                i += 2 if "number" in fields else 1
+
+        params, filters = [], {}
+        for key, value in parse_qsl(parts.query):
+            if key in LOCAL_FILTER_COLUMNS:
+                filters.setdefault(key, []).extend(v for v in value.split(",") if v)
+            else:
+                params.append((key, value))
+
+        return cls(
+            kind=kind,
+            params=tuple(params),
+            filters=tuple((k, tuple(v)) for k, v in filters.items()),
+            base_url=base_url,
+            **fields,
+        )
@@ -32,6 +32,26 @@ DRIVER_DISPLAY_TO_API = {
     "valtteri bottas": "bottas"
 }
 
+# Constructor display names to API IDs mapping
+CONSTRUCTOR_NAME_TO_ID = {
+    "red bull": "red_bull",
+    "ferrari": "ferrari",
+    "mercedes": "mercedes",
+    "mclaren": "mclaren",
+    "aston martin": "aston_martin",
+    "alpine": "alpine",
+    "williams": "williams",
+    "haas": "haas",
+    "alphatauri": "alphatauri",
+    "alfa romeo": "alfa",
+    "sauber": "sauber",
+    "renault": "renault",
+    "racing point": "racing_point",
+    "toro rosso": "toro_rosso",
+    "force india": "force_india",
+    "lotus": "lotus_f1"
+}
+
 # API endpoint templates
 API_TEMPLATES = {
     "driver_results": "http://ergast.com/api/f1/{season}/drivers/{driver}/results.json",
@@ -0,0 +1,496 @@
+"""Recorded and synthetic Ergast responses, for running the pipeline offline.
+
+``FixtureStore`` keeps one JSON file per request under a directory, named
+after the route below ``/f1`` and its query parameters, so a recording made
+against ``ergast.com`` replays under any base URL. ``synthesize`` builds a
+deterministic ``MRData`` payload for any supported route (a 20-driver,
+22-round season per year, with ``limit``/``offset`` paging) when nothing was
+recorded.
+
+``ReplayFetcher`` and ``RecordingFetcher`` are drop-in ``ErgastFetcher``s:
+the first answers from fixtures (falling back to synthetic data), the second
+saves every live response it receives.
+"""
+import datetime
+import json
+import os
+import random
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+
+from a2_transform.fetcher import ErgastFetcher, cache_key_url
+from api.endpoint import Endpoint
+
+DEFAULT_LIMIT = 30  # Ergast's page size when none is requested
+MAX_LIMIT = 1000
+ROUNDS = 22
+RACE_LAPS = 57
+FIRST_SYNTHETIC_SEASON = 2000
+
+# (driverId, givenName, familyName, code, constructorId)
+DRIVERS = [
+    ("max_verstappen", "Max", "Verstappen", "VER", "red_bull"),
+    ("perez", "Sergio", "Pérez", "PER", "red_bull"),
+    ("hamilton", "Lewis", "Hamilton", "HAM", "mercedes"),
+    ("russell", "George", "Russell", "RUS", "mercedes"),
+    ("leclerc", "Charles", "Leclerc", "LEC", "ferrari"),
+    ("sainz", "Carlos", "Sainz", "SAI", "ferrari"),
+    ("norris", "Lando", "Norris", "NOR", "mclaren"),
+    ("piastri", "Oscar", "Piastri", "PIA", "mclaren"),
+    ("alonso", "Fernando", "Alonso", "ALO", "aston_martin"),
+    ("stroll", "Lance", "Stroll", "STR", "aston_martin"),
+    ("gasly", "Pierre", "Gasly", "GAS", "alpine"),
+    ("ocon", "Esteban", "Ocon", "OCO", "alpine"),
+    ("albon", "Alexander", "Albon", "ALB", "williams"),
+    ("sargeant", "Logan", "Sargeant", "SAR", "williams"),
+    ("tsunoda", "Yuki", "Tsunoda", "TSU", "alphatauri"),
+    ("ricciardo", "Daniel", "Ricciardo", "RIC", "alphatauri"),
+    ("bottas", "Valtteri", "Bottas", "BOT", "alfa"),
+    ("zhou", "Guanyu", "Zhou", "ZHO", "alfa"),
+    ("hulkenberg", "Nico", "Hülkenberg", "HUL", "haas"),
+    ("kevin_magnussen", "Kevin", "Magnussen", "MAG", "haas"),
+]
+CONSTRUCTORS = {
+    "red_bull": ("Red Bull", "Austrian"),
+    "mercedes": ("Mercedes", "German"),
+    "ferrari": ("Ferrari", "Italian"),
+    "mclaren": ("McLaren", "British"),
+    "aston_martin": ("Aston Martin", "British"),
+    "alpine": ("Alpine F1 Team", "French"),
+    "williams": ("Williams", "British"),
+    "alphatauri": ("AlphaTauri", "Italian"),
+    "alfa": ("Alfa Romeo", "Swiss"),
+    "haas": ("Haas F1 Team", "American"),
+}
+CIRCUITS = [
+    "bahrain", "jeddah", "albert_park", "baku", "miami", "imola", "monaco", "catalunya", "villeneuve",
+    "red_bull_ring", "silverstone", "hungaroring", "spa", "zandvoort", "monza", "marina_bay", "suzuka",
+    "losail", "americas", "rodriguez", "interlagos", "yas_marina",
+]
+POINTS = [25, 18, 15, 12, 10, 8, 6, 4, 2, 1]
+SPRINT_POINTS = [8, 7, 6, 5, 4, 3, 2, 1]
+RETIREMENTS = ["Accident", "Collision", "Engine", "Gearbox", "Hydraulics", "Power Unit", "Retired"]
+STATUS_IDS = {"Finished": 1, "Accident": 3, "Collision": 4, "Engine": 5, "Gearbox": 6, "Hydraulics": 8,
+              "+1 Lap": 11, "Power Unit": 131, "Retired": 31}
+
+
+def fixture_name(url: str) -> str:
+    """Relative file name of a request: route below ``/f1`` plus sorted query parameters"""
+    parts = urlsplit(url)
+    route = parts.path.partition("/f1/")[2] or parts.path.lstrip("/")
+    if route.endswith(".json"):
+        route = route[:-5]
+    query = sorted(parse_qsl(parts.query))
+    return route + (f"@{urlencode(query)}" if query else "") + ".json"
+
+
+class FixtureStore:
+    """Directory of recorded response bodies, one file per request"""
+
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root)
+
+    def path(self, url: str) -> Path:
+        return self.root / fixture_name(url)
+
+    def load(self, url: str) -> Optional[bytes]:
+        try:
+            return self.path(url).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def save(self, url: str, body: bytes):
+        path = self.path(url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(body)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.root.rglob("*.json")) if self.root.exists() else 0
+
+
+class ReplayFetcher(ErgastFetcher):
+    """``ErgastFetcher`` that answers from fixtures instead of the network.
+
+    Requests without a recording get ``synthesize``d data as of ``today``
+    (or a 404 when ``synthetic=False``); ``latency`` adds a fixed delay per
+    request.
+    Metrics, caching and paging behave exactly as for live requests.
+    """
+
+    def __init__(
+        self,
+        fixtures: Optional[FixtureStore] = None,
+        synthetic: bool = True,
+        latency: float = 0.0,
+        today: Optional[datetime.date] = None,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.fixtures = fixtures
+        self.synthetic = synthetic
+        self.latency = latency
+        self.today = today
+
+    def _send(self, url: str, params: Optional[Dict[str, Any]]) -> Tuple[requests.Response, int]:
+        full_url = cache_key_url(url, params)
+        body = self.fixtures.load(full_url) if self.fixtures is not None else None
+        if body is None and self.synthetic:
+            payload = synthesize(full_url, self.today)
+            body = json.dumps(payload).encode() if payload is not None else None
+        if self.latency:
+            time.sleep(self.latency)
+
+        response = requests.Response()
+        response.url = full_url
+        response.status_code, response.reason = (200, "OK") if body is not None else (404, "Not Found")
+        response._content = body if body is not None else b"{}"
+        return response, 0
+
+
+class RecordingFetcher(ErgastFetcher):
+    """``ErgastFetcher`` that saves every successful live response as a fixture"""
+
+    def __init__(self, fixtures: FixtureStore, **kwargs):
+        super().__init__(**kwargs)
+        self.fixtures = fixtures
+
+    def _send(self, url: str, params: Optional[Dict[str, Any]]) -> Tuple[requests.Response, int]:
+        response, retries = super()._send(url, params)
+        if response.ok:
+            self.fixtures.save(cache_key_url(url, params), response.content)
+        return response, retries
+
+
+# --- Synthetic data -------------------------------------------------------
+
+def synthesize(url: Union[str, Endpoint], today: Optional[datetime.date] = None) -> Optional[Dict]:
+    """Deterministic ``MRData`` payload for an Ergast URL, or ``None`` for unsupported routes"""
+    endpoint = Endpoint.coerce(url)
+    today = today or datetime.date.today()
+    params = dict(endpoint.params)
+    limit = min(int(params.get("limit", DEFAULT_LIMIT)), MAX_LIMIT)
+    offset = int(params.get("offset", 0))
+
+    season = endpoint.season
+    if season == "current":
+        season = today.year
+    seasons = [season] if season is not None else list(range(FIRST_SYNTHETIC_SEASON, today.year + 1))
+    round_num = endpoint.round
+    if round_num == "last":
+        round_num = _last_raced(season, today) if season is not None else None
+
+    builder = _BUILDERS.get(endpoint.kind)
+    if builder is None:
+        return None
+    table_key, table, total = builder(endpoint, seasons, round_num, today, limit, offset)
+    if season is not None:
+        table = {"season": str(season), **({"round": str(round_num)} if round_num else {}), **table}
+    return {
+        "MRData": {
+            "xmlns": "http://ergast.com/mrd/1.5",
+            "series": "f1",
+            "url": endpoint.url,
+            "limit": str(limit),
+            "offset": str(offset),
+            "total": str(total),
+            table_key: table,
+        }
+    }
+
+
+def _race_date(season: int, round_num: int) -> datetime.date:
+    return datetime.date(season, 3, 5) + datetime.timedelta(days=12 * (round_num - 1))
+
+
+def _last_raced(season: int, today: datetime.date) -> Optional[int]:
+    raced = [r for r in range(1, ROUNDS + 1) if _race_date(season, r) <= today]
+    return raced[-1] if raced else None
+
+
+def _rounds(endpoint: Endpoint, seasons: List[int], round_num, today: datetime.date, raced_only=True):
+    """(season, round) pairs the endpoint covers, narrowed to one circuit when it names one"""
+    pairs = []
+    for season in seasons:
+        for r in ([round_num] if round_num else range(1, ROUNDS + 1)):
+            if r is None or r > ROUNDS:
+                continue
+            if endpoint.circuit and CIRCUITS[r - 1] != endpoint.circuit:
+                continue
+            if raced_only and _race_date(season, r) > today:
+                continue
+            pairs.append((season, r))
+    return pairs
+
+
+def _has_sprint(season: int, round_num: int) -> bool:
+    return season >= 2021 and round_num % 4 == 0
+
+
+def _circuit(round_num: int) -> Dict:
+    circuit_id = CIRCUITS[round_num - 1]
+    name = circuit_id.replace("_", " ").title()
+    return {
+        "circuitId": circuit_id,
+        "url": f"http://en.wikipedia.org/wiki/{circuit_id}",
+        "circuitName": f"{name} Circuit",
+        "Location": {"lat": "0.0", "long": "0.0", "locality": name, "country": name},
+    }
+
+
+def _race(season: int, round_num: int) -> Dict:
+    name = CIRCUITS[round_num - 1].replace("_", " ").title()
+    return {
+        "season": str(season),
+        "round": str(round_num),
+        "url": f"http://en.wikipedia.org/wiki/{season}_{name.replace(' ', '_')}_Grand_Prix",
+        "raceName": f"{name} Grand Prix",
+        "Circuit": _circuit(round_num),
+        "date": _race_date(season, round_num).isoformat(),
+        "time": "13:00:00Z",
+    }
+
+
+def _driver(entry) -> Dict:
+    driver_id, given, family, code, _ = entry
+    return {"driverId": driver_id, "permanentNumber": str(DRIVERS.index(entry) + 1), "code": code,
+            "url": f"http://en.wikipedia.org/wiki/{given}_{family}", "givenName": given,
+            "familyName": family, "dateOfBirth": "1995-01-01", "nationality": "Unknown"}
+
+
+def _constructor(constructor_id: str) -> Dict:
+    name, nationality = CONSTRUCTORS[constructor_id]
+    return {"constructorId": constructor_id, "url": f"http://en.wikipedia.org/wiki/{constructor_id}",
+            "name": name, "nationality": nationality}
+
+
+def _drivers_for(endpoint: Endpoint) -> List[tuple]:
+    return [d for d in DRIVERS
+            if (endpoint.driver is None or d[0] == endpoint.driver)
+            and (endpoint.constructor is None or d[4] == endpoint.constructor)]
+
+
+def _classification(season: int, round_num: int) -> List[Tuple[tuple, str]]:
+    """Finishing order of a race with each driver's status"""
+    rng = random.Random(f"{season}-{round_num}")
+    order = sorted(DRIVERS, key=lambda d: rng.random() + DRIVERS.index(d) * 0.03)
+    classified = []
+    for position, driver in enumerate(order, start=1):
+        roll = rng.random()
+        status = rng.choice(RETIREMENTS) if roll < 0.1 else "+1 Lap" if position > 15 else "Finished"
+        classified.append((driver, status))
+    return classified
+
+
+def _lap_time(rng: random.Random, base: float) -> str:
+    seconds = base + rng.random() * 2.5
+    return f"{int(seconds // 60)}:{seconds % 60:06.3f}"
+
+
+def _page(groups: List[Tuple[Dict, str, List]], limit: int, offset: int) -> Tuple[List[Dict], int]:
+    """Slice ``(container, list_key, rows)`` groups to one page of rows, Ergast-style"""
+    total = sum(len(rows) for _, _, rows in groups)
+    page, position = [], 0
+    for container, key, rows in groups:
+        start, end = max(offset - position, 0), min(offset + limit - position, len(rows))
+        if start < end:
+            page.append({**container, key: rows[start:end]})
+        position += len(rows)
+    return page, total
+
+
+def _results(endpoint, seasons, round_num, today, limit, offset):
+    sprint = endpoint.kind == "sprint"
+    key, scale = ("SprintResults", SPRINT_POINTS) if sprint else ("Results", POINTS)
+    wanted = {d[0] for d in _drivers_for(endpoint)}
+    groups = []
+    for season, r in _rounds(endpoint, seasons, round_num, today):
+        if sprint and not _has_sprint(season, r):
+            continue
+        rng = random.Random(f"{season}-{r}-grid")
+        rows = []
+        for position, (driver, status) in enumerate(_classification(season, r), start=1):
+            if driver[0] not in wanted:
+                continue
+            finished = status in ("Finished", "+1 Lap")
+            rows.append({
+                "number": str(DRIVERS.index(driver) + 1),
+                "position": str(position),
+                "positionText": str(position) if finished else "R",
+                "points": str(scale[position - 1] if finished and position <= len(scale) else 0),
+                "Driver": _driver(driver),
+                "Constructor": _constructor(driver[4]),
+                "grid": str(rng.randint(1, 20)),
+                "laps": str(RACE_LAPS - (status == "+1 Lap") if finished else rng.randint(1, RACE_LAPS - 1)),
+                "status": status,
+            })
+        groups.append((_race(season, r), key, rows))
+    races, total = _page(groups, limit, offset)
+    return "RaceTable", {"Races": races}, total
+
+
+def _qualifying(endpoint, seasons, round_num, today, limit, offset):
+    wanted = {d[0] for d in _drivers_for(endpoint)}
+    groups = []
+    for season, r in _rounds(endpoint, seasons, round_num, today):
+        rng = random.Random(f"{season}-{r}-quali")
+        order = sorted(DRIVERS, key=lambda d: rng.random() + DRIVERS.index(d) * 0.03)
+        rows = []
+        for position, driver in enumerate(order, start=1):
+            if driver[0] not in wanted:
+                continue
+            row = {"number": str(DRIVERS.index(driver) + 1), "position": str(position),
+                   "Driver": _driver(driver), "Constructor": _constructor(driver[4]),
+                   "Q1": _lap_time(rng, 90.0)}
+            if position <= 15:
+                row["Q2"] = _lap_time(rng, 89.5)
+            if position <= 10:
+                row["Q3"] = _lap_time(rng, 89.0)
+            rows.append(row)
+        groups.append((_race(season, r), "QualifyingResults", rows))
+    races, total = _page(groups, limit, offset)
+    return "RaceTable", {"Races": races}, total
+
+
+def _pitstops(endpoint, seasons, round_num, today, limit, offset):
+    wanted = {d[0] for d in _drivers_for(endpoint)}
+    groups = []
+    for season, r in _rounds(endpoint, seasons, round_num, today):
+        rng = random.Random(f"{season}-{r}-pits")
+        rows = []
+        for driver in DRIVERS:
+            laps = sorted(rng.sample(range(8, RACE_LAPS - 5), rng.randint(1, 3)))
+            for stop, lap in enumerate(laps, start=1):
+                if driver[0] in wanted and (endpoint.number is None or endpoint.number == stop):
+                    rows.append({"driverId": driver[0], "lap": str(lap), "stop": str(stop),
+                                 "time": f"14:{lap:02d}:00", "duration": f"{20 + rng.random() * 5:.3f}"})
+        rows.sort(key=lambda row: (int(row["lap"]), row["driverId"]))
+        groups.append((_race(season, r), "PitStops", rows))
+    races, total = _page(groups, limit, offset)
+    return "RaceTable", {"Races": races}, total
+
+
+def _laps(endpoint, seasons, round_num, today, limit, offset):
+    """Ergast pages lap data by timing row, so a lap can straddle two pages"""
+    wanted = {d[0] for d in _drivers_for(endpoint)}
+    rows = []  # (race, lap number, timing)
+    for season, r in _rounds(endpoint, seasons, round_num, today):
+        race = _race(season, r)
+        rng = random.Random(f"{season}-{r}-laps")
+        for lap in range(1, RACE_LAPS + 1):
+            order = sorted(DRIVERS, key=lambda d: rng.random() + DRIVERS.index(d) * 0.05)
+            for position, driver in enumerate(order, start=1):
+                if driver[0] in wanted and (endpoint.number is None or endpoint.number == lap):
+                    rows.append((race, lap, {"driverId": driver[0], "position": str(position),
+                                             "time": _lap_time(rng, 88.0 + (lap == 1) * 6)}))
+
+    races: List[Dict] = []
+    for race, lap, timing in rows[offset:offset + limit]:
+        if not races or races[-1]["round"] != race["round"] or races[-1]["season"] != race["season"]:
+            races.append({**race, "Laps": []})
+        laps = races[-1]["Laps"]
+        if not laps or laps[-1]["number"] != str(lap):
+            laps.append({"number": str(lap), "Timings": []})
+        laps[-1]["Timings"].append(timing)
+    return "RaceTable", {"Races": races}, len(rows)
+
+
+def _schedule(endpoint, seasons, round_num, today, limit, offset):
+    races = [_race(season, r) for season, r in _rounds(endpoint, seasons, round_num, today, raced_only=False)]
+    return "RaceTable", {"Races": races[offset:offset + limit]}, len(races)
+
+
+def _standings(endpoint, seasons, round_num, today, limit, offset):
+    drivers = endpoint.kind == "driverStandings"
+    lists = []
+    for season in seasons:
+        last = round_num or _last_raced(season, today)
+        if last is None:
+            continue
+        points: Dict[str, float] = {}
+        finishes: Dict[str, List[int]] = {}
+        for r in range(1, last + 1):
+            for position, (driver, status) in enumerate(_classification(season, r), start=1):
+                key = driver[0] if drivers else driver[4]
+                finished = status in ("Finished", "+1 Lap")
+                scored = POINTS[position - 1] if finished and position <= len(POINTS) else 0
+                if _has_sprint(season, r) and finished and position <= len(SPRINT_POINTS):
+                    # Sprint classification mirrors the race's (see ``_results``)
+                    scored += SPRINT_POINTS[position - 1]
+                points[key] = points.get(key, 0) + scored
+                finishes.setdefault(key, [0] * len(DRIVERS))[position - 1] += 1
+        wins = {key: counts[0] for key, counts in finishes.items()}
+        # Ties go to countback: most wins, then most second places, ...
+        ranked = sorted(points, key=lambda k: (-points[k], [-n for n in finishes[k]], k))
+        if drivers:
+            by_id = {d[0]: d for d in DRIVERS}
+            rows = [{"position": str(i), "positionText": str(i), "points": str(points[k]), "wins": str(wins[k]),
+                     "Driver": _driver(by_id[k]), "Constructors": [_constructor(by_id[k][4])]}
+                    for i, k in enumerate(ranked, start=1)
+                    if endpoint.driver is None or k == endpoint.driver]
+            key = "DriverStandings"
+        else:
+            rows = [{"position": str(i), "positionText": str(i), "points": str(points[k]), "wins": str(wins[k]),
+                     "Constructor": _constructor(k)}
+                    for i, k in enumerate(ranked, start=1)
+                    if endpoint.constructor is None or k == endpoint.constructor]
+            key = "ConstructorStandings"
+        lists.append(({"season": str(season), "round": str(last)}, key, rows))
+    page, total = _page(lists, limit, offset)
+    return "StandingsTable", {"StandingsLists": page}, total
+
+
+def _status(endpoint, seasons, round_num, today, limit, offset):
+    wanted = {d[0] for d in _drivers_for(endpoint)}
+    counts: Dict[str, int] = {}
+    for season, r in _rounds(endpoint, seasons, round_num, today):
+        for driver, status in _classification(season, r):
+            if driver[0] in wanted:
+                counts[status] = counts.get(status, 0) + 1
+    rows = [{"statusId": str(STATUS_IDS[s]), "count": str(n), "status": s}
+            for s, n in sorted(counts.items(), key=lambda item: STATUS_IDS[item[0]])]
+    return "StatusTable", {"Status": rows[offset:offset + limit]}, len(rows)
+
+
+def _entities(endpoint, seasons, round_num, today, limit, offset):
+    if endpoint.kind == "drivers":
+        rows = [_driver(d) for d in DRIVERS if endpoint.driver is None or d[0] == endpoint.driver]
+        return "DriverTable", {"Drivers": rows[offset:offset + limit]}, len(rows)
+    rows = [_constructor(c) for c in CONSTRUCTORS if endpoint.constructor is None or c == endpoint.constructor]
+    return "ConstructorTable", {"Constructors": rows[offset:offset + limit]}, len(rows)
+
+
+def _circuits(endpoint, seasons, round_num, today, limit, offset):
+    rows = [_circuit(r) for r in range(1, ROUNDS + 1) if endpoint.circuit in (None, CIRCUITS[r - 1])]
+    return "CircuitTable", {"Circuits": rows[offset:offset + limit]}, len(rows)
+
+
+def _seasons(endpoint, seasons, round_num, today, limit, offset):
+    rows = [{"season": str(s), "url": f"http://en.wikipedia.org/wiki/{s}_Formula_One_World_Championship"}
+            for s in seasons]
+    return "SeasonTable", {"Seasons": rows[offset:offset + limit]}, len(rows)
+
+
+_BUILDERS = {
+    "results": _results,
+    "sprint": _results,
+    "qualifying": _qualifying,
+    "pitstops": _pitstops,
+    "laps": _laps,
+    "races": _schedule,
+    "driverStandings": _standings,
+    "constructorStandings": _standings,
+    "status": _status,
+    "drivers": _entities,
+    "constructors": _entities,
+    "circuits": _circuits,
+    "seasons": _seasons,
+}
+
+
+def default_fixture_dir() -> Path:
+    """``$ERGAST_FIXTURES``, else ``eval/fixtures/ergast`` in the repository"""
+    return Path(os.getenv("ERGAST_FIXTURES") or Path(__file__).parent.parent / "eval" / "fixtures" / "ergast")
@@ -0,0 +1,87 @@
+"""Sync Ergast seasons into the local columnar store.
+
+    python backend/ingest.py 2018-2023
+    python backend/ingest.py 2023 --kinds results laps --store /data/f1
+"""
+import argparse
+import logging
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Tuple
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from a2_transform import EndpointRouter, F1DataStore
+from a2_transform.derive import SPRINT_SEASONS_FROM
+from api.endpoint import Endpoint
+from log_config import MODES, configure_logging
+
+logger = logging.getLogger(__name__)
+
+# Sprint results let standings for sprint seasons be derived from stored results
+INGEST_KINDS = ('results', 'sprint', 'qualifying', 'driverStandings', 'constructorStandings', 'status', 'laps')
+
+
+def ingest(
+    seasons: Iterable[int],
+    kinds: Iterable[str] = INGEST_KINDS,
+    store: F1DataStore = None,
+    router: EndpointRouter = None,
+    max_workers: int = 4,
+) -> Dict[Tuple[int, str], int]:
+    """Fetch each (season, kind) from the API and write it to the store; returns rows written"""
+    store = store or F1DataStore()
+    router = router or EndpointRouter(store=store)
+    jobs = [
+        (season, kind) for season in seasons for kind in kinds
+        if kind != 'sprint' or season >= SPRINT_SEASONS_FROM  # no sprints to store before then
+    ]
+
+    def sync(job: Tuple[int, str]) -> int:
+        season, kind = job
+        endpoint = Endpoint(kind=kind, season=season)
+        transformer = router.get_transformer(endpoint)
+        if transformer is None:
+            logger.warning("No transformer for %s", kind)
+            return 0
+        df = transformer.snapshot(endpoint)
+        if df.empty:
+            # Transformers swallow fetch errors into empty frames; never record those as synced
+            logger.warning("Nothing to store for %s %s", season, kind)
+            return 0
+        store.write(kind, season, df)
+        logger.info("Stored %s %s: %d rows", season, kind, len(df))
+        return len(df)
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ingest") as pool:
+        return dict(zip(jobs, pool.map(sync, jobs)))
+
+
+def parse_seasons(specs: List[str]) -> List[int]:
+    """``2023``, ``2018-2023`` -> list of seasons"""
+    seasons = []
+    for spec in specs:
+        start, _, end = spec.partition('-')
+        seasons.extend(range(int(start), int(end or start) + 1))
+    return sorted(set(seasons))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sync Ergast seasons into the local columnar store')
+    parser.add_argument('seasons', nargs='+', help='Seasons to sync, e.g. 2023 or 2018-2023')
+    parser.add_argument('--kinds', nargs='+', choices=INGEST_KINDS, default=list(INGEST_KINDS),
+                        help='Endpoint kinds to sync (default: all)')
+    parser.add_argument('--store', default=None, help='Store directory (default: $F1_STORE_DIR or ~/.cache/f1_pipeline/store)')
+    parser.add_argument('-w', '--workers', type=int, default=4, help='Concurrent season/kind syncs')
+    parser.add_argument('--log-mode', choices=list(MODES), default=None,
+                        help='quiet, info or debug (default: $F1_LOG_MODE or info)')
+    args = parser.parse_args()
+    configure_logging(args.log_mode)
+
+    written = ingest(parse_seasons(args.seasons), args.kinds, F1DataStore(args.store), max_workers=args.workers)
+    print(f"Stored {sum(written.values())} rows across {sum(1 for n in written.values() if n)} season/kind partitions")
+
+
+if __name__ == "__main__":
+    main()
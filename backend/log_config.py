@@ -0,0 +1,66 @@
+"""Logging setup for the query pipeline.
+
+Library modules only create ``logging.getLogger(__name__)`` loggers and log
+with lazy ``%s`` arguments, so a disabled level costs one level check and
+no string formatting. Entry points (``processor.py``, ``ingest.py``, the
+Streamlit app) call ``configure_logging`` once:
+
+- ``quiet``: warnings and errors only; nothing is emitted on the hot path
+- ``info`` (default): progress messages such as store syncs
+- ``debug``: per-query detail (extracted parameters, planned endpoints,
+  driver ID mapping) that used to be printed unconditionally
+
+``F1_LOG_MODE`` selects the mode and ``F1_LOG_LEVELS`` overrides single
+modules, e.g. ``F1_LOG_LEVELS="a2_transform.fetcher=DEBUG,a1_query=WARNING"``.
+"""
+import logging
+import os
+from typing import Dict, Optional, Union
+
+# Top-level packages/modules whose loggers make up the pipeline
+# ("__main__" covers processor.py / ingest.py run as scripts)
+PIPELINE_LOGGERS = ("a1_query", "a2_transform", "api", "processor", "ingest", "telemetry", "__main__")
+
+MODES = {"quiet": logging.WARNING, "info": logging.INFO, "debug": logging.DEBUG}
+
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+
+def parse_levels(spec: str) -> Dict[str, int]:
+    """``"a1_query=DEBUG,processor=warning"`` -> ``{"a1_query": 10, "processor": 30}``"""
+    levels = {}
+    for item in spec.split(","):
+        name, _, level = item.strip().partition("=")
+        if not name or not level:
+            continue
+        value = logging.getLevelName(level.strip().upper())
+        if not isinstance(value, int):
+            raise ValueError(f"Unknown log level for {name}: {level}")
+        levels[name.strip()] = value
+    return levels
+
+
+def configure_logging(
+    mode: Optional[str] = None,
+    levels: Optional[Dict[str, Union[int, str]]] = None,
+    fmt: str = LOG_FORMAT,
+) -> int:
+    """Set pipeline logger levels for ``mode`` plus per-module overrides; returns the base level.
+
+    A stderr handler is installed on the root logger only if nothing else
+    (an application, pytest, Streamlit) has configured one.
+    """
+    mode = (mode or os.getenv("F1_LOG_MODE") or "info").lower()
+    if mode not in MODES:
+        raise ValueError(f"Unknown log mode '{mode}' (expected one of {', '.join(MODES)})")
+    base_level = MODES[mode]
+
+    overrides = parse_levels(os.getenv("F1_LOG_LEVELS", ""))
+    overrides.update(levels or {})
+
+    logging.basicConfig(format=fmt)
+    for name in PIPELINE_LOGGERS:
+        logging.getLogger(name).setLevel(base_level)
+    for name, level in overrides.items():
+        logging.getLogger(name).setLevel(level)
+    return base_level
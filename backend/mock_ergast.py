@@ -0,0 +1,222 @@
+"""Local Ergast-compatible HTTP server for offline and load testing.
+
+Serves ``MRData`` JSON for the routes ``ErgastEndpointValidator`` accepts
+(plus the schedule, driver, constructor, circuit and season listings),
+with Ergast's ``limit``/``offset`` paging. Responses come from recorded
+fixtures when present and from ``ergast_fixtures.synthesize`` otherwise.
+Latency and error injection make concurrency, retry and cache behaviour
+testable on one machine.
+
+Run standalone and point the pipeline at it:
+
+    python backend/mock_ergast.py --port 8001 --latency 0.05 --error-rate 0.05
+    ERGAST_BASE_URL=http://127.0.0.1:8001/api/f1 python backend/processor.py --query 3
+
+or embed it in a test:
+
+    with MockErgastServer(latency=0.01) as server:
+        set_base_url(server.base_url)
+"""
+import argparse
+import datetime
+import json
+import logging
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable, Optional
+from urllib.parse import urlsplit
+
+from a1_query.url_validator import ErgastEndpointValidator
+from api.endpoint import Endpoint
+from ergast_fixtures import FixtureStore, synthesize
+
+logger = logging.getLogger(__name__)
+
+# Listing routes the pipeline uses besides the validator's data routes
+LISTING_KINDS = frozenset({"races", "drivers", "constructors", "circuits", "seasons"})
+
+
+class MockErgastServer:
+    """Threaded HTTP server answering Ergast routes below ``/api/f1``.
+
+    ``latency`` seconds (plus up to ``jitter`` more) are added to every
+    response. A fraction ``error_rate`` of requests fail with a status
+    drawn from ``error_statuses``; 429s carry ``Retry-After: retry_after``.
+    ``strict`` limits data routes to those the validator accepts.
+    ``port=0`` picks a free port; read it back from ``base_url``.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        fixtures: Optional[FixtureStore] = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_statuses: Iterable[int] = (503,),
+        retry_after: float = 0.0,
+        strict: bool = True,
+        today: Optional[datetime.date] = None,
+        seed: Optional[int] = None,
+    ):
+        self.fixtures = fixtures
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_statuses = tuple(error_statuses)
+        self.retry_after = retry_after
+        self.strict = strict
+        self.today = today
+        self.validator = ErgastEndpointValidator()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "served": 0, "injected_errors": 0, "not_found": 0, "bytes": 0}
+        self._httpd = ThreadingHTTPServer((host, port), _handler_for(self))
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/api/f1"
+
+    def start(self) -> "MockErgastServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="mock-ergast", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def serve_forever(self):
+        try:
+            self._httpd.serve_forever()
+        finally:
+            self._httpd.server_close()
+
+    def __enter__(self) -> "MockErgastServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+    def reset_stats(self):
+        with self._lock:
+            for key in self._stats:
+                self._stats[key] = 0
+
+    def respond(self, url: str):
+        """(status, headers, body) for a request URL; sleeps for the injected latency"""
+        with self._lock:
+            self._stats["requests"] += 1
+            delay = self.latency + (self._rng.random() * self.jitter if self.jitter else 0.0)
+            fail = self.error_rate and self._rng.random() < self.error_rate
+            status = self._rng.choice(self.error_statuses) if fail else None
+        if delay:
+            time.sleep(delay)
+
+        if status is not None:
+            self._count("injected_errors")
+            headers = {"Retry-After": str(self.retry_after)} if status == 429 else {}
+            return status, headers, json.dumps({"error": "injected failure"}).encode()
+
+        body = self._body(url)
+        if body is None:
+            self._count("not_found")
+            return 404, {}, json.dumps({"error": f"Unknown route {urlsplit(url).path}"}).encode()
+        self._count("served", len(body))
+        return 200, {}, body
+
+    def _body(self, url: str) -> Optional[bytes]:
+        path = urlsplit(url).path
+        if not path.startswith("/api/f1/"):
+            return None
+        if self.fixtures is not None:
+            body = self.fixtures.load(url)
+            if body is not None:
+                return body
+        endpoint = Endpoint.parse(url)
+        if self.strict and endpoint.kind not in LISTING_KINDS and self.validator.match(path[len("/api"):]) is None:
+            return None
+        payload = synthesize(endpoint, self.today)
+        return json.dumps(payload).encode() if payload is not None else None
+
+    def _count(self, key: str, size: int = 0):
+        with self._lock:
+            self._stats[key] += 1
+            self._stats["bytes"] += size
+
+
+def _handler_for(server: MockErgastServer):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, so client connection pools behave as against Ergast
+
+        def do_GET(self):
+            status, headers, body = server.respond(self.path)
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logger.debug("%s - %s", self.address_string(), format % args)
+
+    return Handler
+
+
+def main():
+    from log_config import MODES, configure_logging
+
+    parser = argparse.ArgumentParser(description="Local Ergast-compatible mock server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--fixtures", help="directory of recorded responses (see ergast_fixtures.py)")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many extra seconds, uniformly")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests that fail")
+    parser.add_argument("--error-status", type=int, action="append", help="status for injected failures (repeatable)")
+    parser.add_argument("--retry-after", type=float, default=0.0, help="Retry-After seconds on injected 429s")
+    parser.add_argument("--lenient", action="store_true", help="serve routes the validator does not accept")
+    parser.add_argument("--today", type=datetime.date.fromisoformat, help="date synthetic seasons are cut at")
+    parser.add_argument("--seed", type=int, help="seed for latency jitter and error injection")
+    parser.add_argument("--log-mode", choices=sorted(MODES), help="quiet, info or debug (default: $F1_LOG_MODE or info)")
+    args = parser.parse_args()
+    configure_logging(args.log_mode)
+
+    server = MockErgastServer(
+        host=args.host,
+        port=args.port,
+        fixtures=FixtureStore(args.fixtures) if args.fixtures else None,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        error_statuses=args.error_status or (503,),
+        retry_after=args.retry_after,
+        strict=not args.lenient,
+        today=args.today,
+        seed=args.seed,
+    )
+    print(f"Serving mock Ergast API at {server.base_url}")
+    print(f"export ERGAST_BASE_URL={server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,22 @@
+import asyncio
 import logging
-from typing import List
-from a1_query.query_to_endpoint import process_query
-from a2_transform import EndpointRouter
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+from a1_query.query_to_endpoint import aprocess_query, process_query, process_sql, warm_up_agents
+from a2_transform import EndpointRouter, get_store
+from a2_transform.derive import share_results
+from a2_transform.filters import apply_local_filters
+from a2_transform.sql import F1SQLEngine
+from a2_transform.transformers.standings import PROGRESSION_KINDS
+from api.endpoint import Endpoint
+from log_config import MODES, configure_logging
+from telemetry import Trace
 import sys
 import os
 import argparse
@@ -10,49 +25,253 @@ import pandas as pd
 from a1_query.url_validator import ErgastEndpointValidator
 from a1_query.query_index import query_index
 
-# Set up basic logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@dataclass(frozen=True)
+class EndpointResult:
+    """One endpoint's output as it comes off the pipeline"""
+    index: int  # position in the query's endpoint plan
+    endpoint: Endpoint
+    data: pd.DataFrame
+    elapsed: float  # seconds spent loading and transforming
+    error: Optional[str] = None
+
 class F1QueryProcessor:
-    """Minimal pipeline coordinator"""
+    """Minimal pipeline coordinator.
+
+    The sync methods run endpoints on a thread pool over the pooled
+    ``requests`` session. The ``a``-prefixed methods run the same plan on
+    the caller's event loop: the LLM call, every HTTP request and every
+    page of a paginated endpoint are awaited over one shared
+    ``httpx.AsyncClient``, so many queries can be in flight at once without
+    a thread each.
+
+    With ``profile=True`` every query records a ``telemetry.Trace`` of its
+    stages (kept as ``last_trace``); ``trace_file`` appends each trace there
+    as JSON lines.
+    """
     
-    def __init__(self):
+    def __init__(
+        self,
+        parallel: bool = False,
+        max_workers: int = 8,
+        max_per_host: int = 4,
+        profile: bool = False,
+        trace_file: Optional[str] = None,
+    ):
         self.router = EndpointRouter()
         self.validator = ErgastEndpointValidator()
+        self.parallel = parallel
+        self.max_workers = max_workers
+        self.max_per_host = max_per_host
+        self.profile = profile or trace_file is not None
+        self.trace_file = trace_file
+        self.last_trace: Optional[Trace] = None
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._host_slots_lock = threading.Lock()
+        self._async_host_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = \
+            weakref.WeakKeyDictionary()
+        warm_up_agents(1)
     
     def execute_query(self, query: str) -> List[pd.DataFrame]:
         """Core execution flow"""
-        try:
-            # Get validated endpoints
-            endpoints = [
-                ep for ep in process_query(query)
-                if self.validator.validate(ep)
+        return [df for _, df in self.execute_endpoints(query)]
+
+    def execute_endpoints(self, query: str) -> List[Tuple[Endpoint, pd.DataFrame]]:
+        """Like ``execute_query``, with each DataFrame paired with the endpoint it came from"""
+        results = sorted(self.iter_query(query), key=lambda result: result.index)
+        return [(result.endpoint, result.data) for result in results]
+
+    def iter_query(self, query: str) -> Iterator[EndpointResult]:
+        """Yield each endpoint's result as soon as it is ready.
+
+        In parallel mode results arrive in completion order (use
+        ``EndpointResult.index`` to restore plan order); otherwise in plan order.
+        """
+        trace = self._start_trace(query)
+        run = trace.run if trace else _call
+        jobs = run(self._plan, query)
+        if not self.parallel or len(jobs) < 2:
+            for index, (endpoint, transformer) in enumerate(jobs):
+                yield run(self._timed, index, endpoint, transformer)
+            self._finish_trace(trace)
+            return
+
+        workers = min(self.max_workers, len(jobs))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="f1-fetch") as pool:
+            futures = [
+                pool.submit(run, self._timed_limited, index, endpoint, transformer)
+                for index, (endpoint, transformer) in enumerate(jobs)
             ]
-            
-            if not endpoints:
-                logger.error("No valid endpoints generated")
-                return []
-            
-            # Process each endpoint
-            results = []
-            for endpoint in endpoints:
-                if transformer := self.router.get_transformer(endpoint):
-                    results.append(transformer.transform(endpoint))
-                else:
-                    logger.warning(f"No transformer for {endpoint}")
-            
-            return results
-            
+            for future in as_completed(futures):
+                yield future.result()
+        self._finish_trace(trace)
+
+    async def aexecute_query(self, query: str) -> List[pd.DataFrame]:
+        """``execute_query`` on the running event loop"""
+        return [df for _, df in await self.aexecute_endpoints(query)]
+
+    async def aexecute_endpoints(self, query: str) -> List[Tuple[Endpoint, pd.DataFrame]]:
+        """``execute_endpoints`` on the running event loop"""
+        results = sorted([result async for result in self.aiter_query(query)], key=lambda result: result.index)
+        return [(result.endpoint, result.data) for result in results]
+
+    async def aiter_query(self, query: str) -> AsyncIterator[EndpointResult]:
+        """Async counterpart of ``iter_query``: endpoints load concurrently on the event loop"""
+        trace = self._start_trace(query)
+        activated = trace.activated if trace else nullcontext
+
+        async def plan() -> List[Tuple[Endpoint, object]]:
+            with activated():
+                return await self._aplan(query)
+
+        # Each stage runs as its own task so the trace context never leaks into the caller's frame
+        jobs = await asyncio.ensure_future(plan())
+        limit = asyncio.Semaphore(self.max_workers if self.parallel else 1)
+
+        async def run(index: int, endpoint: Endpoint, transformer) -> EndpointResult:
+            async with limit, self._ahost_slot(endpoint):
+                with activated():
+                    return await self._atimed(index, endpoint, transformer)
+
+        tasks = [asyncio.ensure_future(run(index, *job)) for index, job in enumerate(jobs)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+        self._finish_trace(trace)
+
+    def _start_trace(self, query: str) -> Optional[Trace]:
+        return Trace("query", query=query, parallel=self.parallel) if self.profile else None
+
+    def _finish_trace(self, trace: Optional[Trace]):
+        if trace is None:
+            return
+        trace.finish()
+        self.last_trace = trace
+        if self.trace_file:
+            trace.write_jsonl(self.trace_file)
+
+    def _plan(self, query: str) -> List[Tuple[Endpoint, object]]:
+        """Validated endpoints for ``query``, each paired with its transformer"""
+        try:
+            return self._route(process_query(query))
+        except Exception as e:
+            logger.exception("Processing failed")
+            return []
+
+    async def _aplan(self, query: str) -> List[Tuple[Endpoint, object]]:
+        try:
+            return self._route(await aprocess_query(query))
         except Exception as e:
             logger.exception("Processing failed")
             return []
 
-def test_query(index: int):
+    def _route(self, endpoints: Iterable[Endpoint]) -> List[Tuple[Endpoint, object]]:
+        # Get validated endpoints; progression kinds are expanded by the transformer, not fetched
+        endpoints = [
+            ep for ep in endpoints
+            if Endpoint.coerce(ep).kind in PROGRESSION_KINDS or self.validator.validate(ep)
+        ]
+        
+        if not endpoints:
+            logger.error("No valid endpoints generated")
+            return []
+        
+        # Pair each endpoint with its transformer in one routing pass
+        jobs = []
+        for endpoint, transformer in self.router.route_all(endpoints):
+            if transformer:
+                jobs.append((endpoint, transformer))
+            else:
+                logger.warning("No transformer for %s", endpoint)
+
+        # Standings and status come from the season's results when the plan or the store has them
+        kind_map = self.router.kind_map
+        if 'results' in kind_map:
+            jobs = share_results(jobs, kind_map['results'], kind_map.get('sprint'), get_store())
+        return jobs
+
+    def load_tables(self, query: str, engine: Optional[F1SQLEngine] = None) -> F1SQLEngine:
+        """Run the query's endpoints and register every result as a SQL table"""
+        engine = engine or F1SQLEngine()
+        engine.register_all(self.execute_endpoints(query))
+        return engine
+
+    def execute_sql(self, query: str, sql: Optional[str] = None) -> pd.DataFrame:
+        """Fetch the data ``query`` needs, then answer it with SQL over the registered tables.
+
+        Without ``sql`` the SQL agent writes the statement from the query and
+        the tables that were loaded.
+        """
+        engine = self.load_tables(query)
+        try:
+            sql = sql or process_sql(query, engine.tables())
+            if not sql:
+                logger.error("No SQL planned for query: %s", query)
+                return pd.DataFrame()
+            return engine.query(sql)
+        finally:
+            engine.close()
+
+    def _timed_limited(self, index: int, endpoint: Endpoint, transformer) -> EndpointResult:
+        """Run a transform while holding one of the endpoint host's slots"""
+        with self._host_slot(endpoint):
+            return self._timed(index, endpoint, transformer)
+
+    def _timed(self, index: int, endpoint: Endpoint, transformer) -> EndpointResult:
+        """Transform one endpoint, capturing its latency and any failure"""
+        start = time.perf_counter()
+        try:
+            data, error = self._transform(endpoint, transformer), None
+        except Exception as e:
+            logger.exception("Transform failed for %s", endpoint)
+            data, error = pd.DataFrame(), str(e)
+        return EndpointResult(index, endpoint, data, time.perf_counter() - start, error)
+
+    async def _atimed(self, index: int, endpoint: Endpoint, transformer) -> EndpointResult:
+        start = time.perf_counter()
+        try:
+            data, error = apply_local_filters(await transformer.aload(endpoint), endpoint.filter_map), None
+        except Exception as e:
+            logger.exception("Transform failed for %s", endpoint)
+            data, error = pd.DataFrame(), str(e)
+        return EndpointResult(index, endpoint, data, time.perf_counter() - start, error)
+
+    def _transform(self, endpoint: Endpoint, transformer) -> pd.DataFrame:
+        """Load the planned endpoint (local store first) and apply the planner's local filters"""
+        return apply_local_filters(transformer.load(endpoint), endpoint.filter_map)
+
+    def _host_slot(self, endpoint: Endpoint) -> threading.BoundedSemaphore:
+        """Per-host semaphore capping concurrent requests to the same server"""
+        host = urlparse(endpoint.base_url).netloc
+        with self._host_slots_lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self._host_slots[host]
+
+    def _ahost_slot(self, endpoint: Endpoint) -> asyncio.Semaphore:
+        """``_host_slot`` for the running event loop (asyncio semaphores are loop-bound)"""
+        slots = self._async_host_slots.setdefault(asyncio.get_running_loop(), {})
+        host = urlparse(endpoint.base_url).netloc
+        if host not in slots:
+            slots[host] = asyncio.Semaphore(self.max_per_host)
+        return slots[host]
+
+def _call(fn, *args):
+    return fn(*args)
+
+def test_query(index: int, parallel: bool = False, sql: Optional[str] = None,
+               profile: bool = False, trace_file: Optional[str] = None):
     """Test the F1 query processor with a specific query index"""
-    processor = F1QueryProcessor()
+    processor = F1QueryProcessor(parallel=parallel, profile=profile, trace_file=trace_file)
     query = query_index.get_query(index)
-    if query:
+    if query and sql:
+        print(f"\nTesting Query [{index}]: {query}")
+        print(processor.execute_sql(query, None if sql == 'auto' else sql))
+    elif query:
         print(f"\nTesting Query [{index}]: {query}")
         results = processor.execute_query(query)
         print("\nResults:")
@@ -61,6 +280,8 @@ def test_query(index: int):
             print(result.head() if isinstance(result, pd.DataFrame) else result)
     else:
         print(f"No query found for index {index}")
+    if profile and processor.last_trace:
+        print(f"\nProfile:\n{processor.last_trace.format_summary()}")
 
 def main():
     parser = argparse.ArgumentParser(description='F1 Query Processor')
@@ -68,8 +289,20 @@ def main():
                        help='Query index number to test (default: 23)')
     parser.add_argument('-l', '--list', action='store_true',
                        help='List all available queries')
+    parser.add_argument('-p', '--parallel', action='store_true',
+                       help='Fetch and transform endpoints concurrently')
+    parser.add_argument('--sql', default=None,
+                       help="SQL to run over the fetched tables (results, qualifying, driver_standings, ...); "
+                            "'auto' lets the SQL agent write it")
+    parser.add_argument('--profile', action='store_true',
+                       help='Print per-stage timings, bytes, rows and cache hits for the query')
+    parser.add_argument('--trace-file', default=None,
+                       help='Append the query trace as OpenTelemetry-style JSON lines')
+    parser.add_argument('--log-mode', choices=list(MODES), default=None,
+                       help='quiet: warnings only; debug: per-query detail (default: $F1_LOG_MODE or info)')
     
     args = parser.parse_args()
+    configure_logging(args.log_mode)
     
     if args.list:
         print("\nAvailable Queries:")
@@ -77,7 +310,8 @@ def main():
             print(f"[{idx}] {query}")
         return
     
-    test_query(args.index)
+    test_query(args.index, parallel=args.parallel, sql=args.sql,
+               profile=args.profile, trace_file=args.trace_file)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
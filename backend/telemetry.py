@@ -0,0 +1,210 @@
+"""Per-query stage timing.
+
+A ``Trace`` collects ``Span``s opened with ``span()`` anywhere below it:
+query parsing, URL building, validation, routing, store reads, HTTP and
+parsing. Spans nest through ``contextvars``; when no trace is active
+``span()`` costs one context-variable lookup and records nothing.
+
+    trace = Trace("query", query=query)
+    endpoints = trace.run(process_query, query)
+    trace.finish()
+    print(trace.format_summary())
+    trace.write_jsonl("trace.jsonl")
+
+Exported records follow the OpenTelemetry span data model (ids, parent id,
+start/end in unix nanoseconds, attributes), one JSON object per line.
+"""
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional, Union
+
+import pandas as pd
+
+_active_trace: contextvars.ContextVar[Optional["Trace"]] = contextvars.ContextVar("f1_trace", default=None)
+_active_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("f1_span", default=None)
+
+# Attributes summed per stage by ``Trace.summary``
+COUNTERS = ("bytes", "rows", "cache_hits", "cache_misses", "retries")
+
+
+@dataclass
+class Span:
+    """One timed stage; ``attributes`` carry its counters and labels"""
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    start_ns: int
+    end_ns: Optional[int] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def duration(self) -> float:
+        """Seconds from start to end (to now while still open)"""
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e9
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def add(self, **counters):
+        """Increment numeric attributes"""
+        for key, value in counters.items():
+            self.attributes[key] = self.attributes.get(key, 0) + value
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_id,
+            "name": self.name,
+            "start_time_unix_nano": self.start_ns,
+            "end_time_unix_nano": self.end_ns,
+            "attributes": {k: v if isinstance(v, (str, int, float, bool)) else str(v)
+                           for k, v in self.attributes.items()},
+            "status": {"code": "ERROR", "message": self.error} if self.error else {"code": "OK"},
+        }
+
+
+class _NoopSpan:
+    """Stand-in yielded by ``span()`` when nothing is being traced"""
+
+    def set(self, **attributes):
+        pass
+
+    def add(self, **counters):
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class Trace:
+    """Spans of one query, collected from every thread and task working on it"""
+
+    def __init__(self, name: str = "query", **attributes):
+        self.trace_id = os.urandom(16).hex()
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+        self.root = self._open(name, None, attributes)
+        self._context = contextvars.copy_context()
+        self._context.run(self._activate)
+
+    def _activate(self):
+        _active_trace.set(self)
+        _active_span.set(self.root)
+
+    def _open(self, name: str, parent: Optional[Span], attributes: Dict[str, Any]) -> Span:
+        span = Span(name, self.trace_id, os.urandom(8).hex(), parent.span_id if parent else None,
+                    time.time_ns(), attributes=dict(attributes))
+        with self._lock:
+            self.spans.append(span)
+        return span
+
+    def run(self, fn: Callable, *args, **kwargs):
+        """Call ``fn`` with this trace active, from any thread"""
+        return self._context.copy().run(fn, *args, **kwargs)
+
+    @contextmanager
+    def activated(self) -> Iterator["Trace"]:
+        """Make this trace current for a block (e.g. the body of an asyncio task)"""
+        trace_token = _active_trace.set(self)
+        span_token = _active_span.set(self.root)
+        try:
+            yield self
+        finally:
+            _active_span.reset(span_token)
+            _active_trace.reset(trace_token)
+
+    def finish(self):
+        if self.root.end_ns is None:
+            self.root.end_ns = time.time_ns()
+
+    def summary(self) -> pd.DataFrame:
+        """Per-stage totals: calls, wall time and summed counters, slowest stage first"""
+        with self._lock:
+            spans = [s for s in self.spans if s is not self.root]
+        rows = [{
+            "stage": s.name,
+            "seconds": s.duration,
+            **{c: s.attributes.get(c, 0) for c in COUNTERS},
+            "errors": s.error is not None,
+        } for s in spans]
+        if not rows:
+            return pd.DataFrame(columns=["stage", "calls", "seconds", "max_seconds", *COUNTERS, "errors"])
+        df = pd.DataFrame(rows)
+        summary = df.groupby("stage", sort=False).agg(
+            calls=("seconds", "size"),
+            seconds=("seconds", "sum"),
+            max_seconds=("seconds", "max"),
+            **{c: (c, "sum") for c in COUNTERS},
+            errors=("errors", "sum"),
+        )
+        return summary.sort_values("seconds", ascending=False).reset_index()
+
+    def format_summary(self) -> str:
+        summary = self.summary()
+        header = f"Trace {self.trace_id}: {self.root.duration * 1000:.1f} ms total"
+        if summary.empty:
+            return header
+        summary[["seconds", "max_seconds"]] *= 1000
+        summary = summary.rename(columns={"seconds": "total_ms", "max_seconds": "max_ms"})
+        return header + "\n" + summary.to_string(index=False, float_format=lambda v: f"{v:.1f}")
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [s.to_dict() for s in self.spans]
+
+    def write_jsonl(self, destination: Union[str, os.PathLike, IO[str]]):
+        """Append every span as one JSON line"""
+        lines = "".join(json.dumps(record) + "\n" for record in self.to_records())
+        if hasattr(destination, "write"):
+            destination.write(lines)
+        else:
+            with open(destination, "a") as f:
+                f.write(lines)
+
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[Union[Span, _NoopSpan]]:
+    """Time a stage under the active trace; a no-op when none is active"""
+    trace = _active_trace.get()
+    if trace is None:
+        yield _NOOP
+        return
+
+    current = trace._open(name, _active_span.get(), attributes)
+    token = _active_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        current.end_ns = time.time_ns()
+        _active_span.reset(token)
+
+
+def current_span() -> Union[Span, _NoopSpan]:
+    """Innermost open span, to attach counters to without opening a new one"""
+    return _active_span.get() or _NOOP
+
+
+def current_trace() -> Optional[Trace]:
+    return _active_trace.get()
+
+
+def bind(fn: Callable) -> Callable:
+    """Carry the caller's trace into ``fn`` when it runs on a thread pool"""
+    if _active_trace.get() is None:
+        return fn
+    context = contextvars.copy_context()
+
+    def bound(*args, **kwargs):
+        return context.copy().run(fn, *args, **kwargs)
+    return bound
@@ -0,0 +1,49 @@
+"""Micro-benchmark: building query agents per call vs. borrowing them from a pool.
+
+Run from the repository root:
+
+    python benchmarks/bench_agent_pool.py --iterations 2000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+
+from a1_query.agent_pool import AgentPool
+from a1_query.query_to_endpoint import create_understanding_agent
+
+
+def bench_construct(iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        create_understanding_agent()
+    return (time.perf_counter() - start) / iterations
+
+
+def bench_pool(iterations: int) -> float:
+    understanding = AgentPool(create_understanding_agent)
+    understanding.warm_up()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        with understanding.acquire():
+            pass
+    return (time.perf_counter() - start) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Agent construction cost per query")
+    parser.add_argument("--iterations", type=int, default=1000)
+    args = parser.parse_args()
+
+    construct = bench_construct(args.iterations)
+    pooled = bench_pool(args.iterations)
+    print(f"{'mode':<12}{'per query':>14}")
+    print(f"{'construct':<12}{construct * 1e6:>11.1f} us")
+    print(f"{'pooled':<12}{pooled * 1e6:>11.1f} us")
+    print(f"speedup: {construct / pooled:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
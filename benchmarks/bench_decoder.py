@@ -0,0 +1,94 @@
+"""Micro-benchmark: per-row dicts vs. columnar decoding of a results payload.
+
+Run from the repository root:
+
+    python benchmarks/bench_decoder.py --seasons 5 --iterations 20
+"""
+import argparse
+import datetime
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+
+import pandas as pd
+
+from a2_transform.decoder import loads
+from a2_transform.schema import apply_schema
+from a2_transform.transformers.results import process_results_data
+from ergast_fixtures import synthesize
+
+
+def rows_baseline(races):
+    """The previous implementation: one dict per result row, then ``pd.DataFrame(rows)``"""
+    rows = []
+    for race in races:
+        race_info = {
+            'race_id': race.get('round'),
+            'season': race.get('season'),
+            'race_name': race.get('raceName'),
+            'circuit_id': race.get('Circuit', {}).get('circuitId'),
+            'date': race.get('date'),
+            'time': race.get('time'),
+        }
+        for result in race.get('Results', []):
+            driver = result.get('Driver', {})
+            constructor = result.get('Constructor', {})
+            rows.append({
+                **race_info,
+                'driver_id': driver.get('driverId'),
+                'driver_name': f"{driver.get('givenName', '')} {driver.get('familyName', '')}".strip(),
+                'constructor_id': constructor.get('constructorId'),
+                'constructor_name': constructor.get('name'),
+                'grid': result.get('grid'),
+                'laps': result.get('laps'),
+                'position': result.get('position'),
+                'status': result.get('status'),
+                'points': float(result.get('points', 0)),
+            })
+    return apply_schema(pd.DataFrame(rows))
+
+
+def payload(seasons: int) -> bytes:
+    today = datetime.date(2024, 12, 31)
+    races = []
+    for season in range(2024 - seasons + 1, 2025):
+        url = f"http://ergast.com/api/f1/{season}/results.json?limit=1000"
+        races.extend(synthesize(url, today)["MRData"]["RaceTable"]["Races"])
+    return json.dumps({"MRData": {"RaceTable": {"Races": races}}}).encode()
+
+
+def measure(fn, races, iterations: int):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        df = fn(races)
+    elapsed = (time.perf_counter() - start) / iterations
+
+    tracemalloc.start()
+    fn(races)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak, len(df)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Results payload decoding cost")
+    parser.add_argument("--seasons", type=int, default=5)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    body = payload(args.seasons)
+    start = time.perf_counter()
+    races = loads(body)["MRData"]["RaceTable"]["Races"]
+    print(f"payload: {len(body) / 2 ** 20:.1f} MiB, decoded in {(time.perf_counter() - start) * 1000:.1f} ms")
+    print(f"{'mode':<10}{'rows':>8}{'per call':>12}{'peak MiB':>10}")
+    for name, fn in (("rows", rows_baseline), ("columnar", process_results_data)):
+        elapsed, peak, rows = measure(fn, races, args.iterations)
+        print(f"{name:<10}{rows:>8}{elapsed * 1000:>9.1f} ms{peak / 2 ** 20:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
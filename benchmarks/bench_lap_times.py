@@ -0,0 +1,63 @@
+"""Micro-benchmark: fastest-lap extraction over a synthetic season of lap timings.
+
+Run from the repository root:
+
+    python benchmarks/bench_lap_times.py --rounds 22 --laps 60 --drivers 20
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+
+from a2_transform.transformers.laps import fastest_laps, flatten_timings
+
+
+def synthetic_season(rounds: int, laps: int, drivers: int, seed: int = 0):
+    rng = random.Random(seed)
+    races = []
+    for round_num in range(1, rounds + 1):
+        races.append({
+            "season": "2023",
+            "round": str(round_num),
+            "raceName": f"Grand Prix {round_num}",
+            "Circuit": {"circuitName": f"Circuit {round_num}"},
+            "Laps": [{
+                "number": str(lap),
+                "Timings": [{
+                    "driverId": f"driver_{d}",
+                    "position": str(d + 1),
+                    "time": f"1:{rng.uniform(20, 40):06.3f}",
+                } for d in range(drivers)],
+            } for lap in range(1, laps + 1)],
+        })
+    return races
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fastest-lap extraction cost for a season")
+    parser.add_argument("--rounds", type=int, default=22)
+    parser.add_argument("--laps", type=int, default=60)
+    parser.add_argument("--drivers", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    races = synthetic_season(args.rounds, args.laps, args.drivers)
+    best_flatten = best_fastest = float("inf")
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        timings = flatten_timings(races)
+        middle = time.perf_counter()
+        result = fastest_laps(timings)
+        best_flatten = min(best_flatten, middle - start)
+        best_fastest = min(best_fastest, time.perf_counter() - middle)
+
+    print(f"{len(timings)} timing rows -> {len(result)} fastest laps")
+    print(f"{'flatten':<10}{best_flatten * 1e3:>9.1f} ms")
+    print(f"{'fastest':<10}{best_fastest * 1e3:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""End-to-end benchmark: every query in eval/query_index.json through F1QueryProcessor.
+
+Ergast responses are replayed from recorded fixtures (synthetic data where
+nothing was recorded) and the understanding agent is replaced by a stub that
+answers from the rule parser, so runs are offline, deterministic and
+measure the pipeline rather than the network or the model.
+
+Run from the repository root:
+
+    python benchmarks/bench_queries.py --repeat 5 --today 2024-12-31 --save-baseline eval/bench_baseline.json
+    python benchmarks/bench_queries.py --repeat 5 --baseline eval/bench_baseline.json
+
+The committed ``eval/bench_baseline.json`` comes from the first command. It
+pins ``--today``, which dates the synthetic seasons and is the year relative
+time scopes resolve against, so the calls and bytes per query stay the same
+between runs; ``--baseline`` reuses the saved date
+unless ``--today`` is given. Calls and bytes compare across machines,
+latency and memory only against a baseline saved on the same one: re-save
+it locally before comparing timings, and commit a new one when a change
+moves calls or bytes on purpose. ``eval/fixtures/ergast/README.md`` covers
+recording fixtures.
+
+``--base-url`` sends real HTTP requests to another API root instead, e.g. a
+local ``backend/mock_ergast.py`` with injected latency and errors.
+
+With ``--baseline`` the run exits with status 1 if any category regressed by
+more than ``--tolerance``. ``--record`` fetches live responses once and saves
+them as fixtures for later runs.
+"""
+import argparse
+import datetime
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from pathlib import Path
+from types import SimpleNamespace
+
+os.environ.setdefault("F1_STORE", "0")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+
+from a1_query import query_to_endpoint
+from a1_query.agent_pool import AgentPool
+from a1_query.models import QueryParameters
+from a1_query.query_cache import QueryCache
+from a1_query.query_index import query_index
+from a2_transform.fetcher import ErgastFetcher, set_fetcher
+from a2_transform.store import set_store
+from api.endpoint import set_base_url
+from ergast_fixtures import FixtureStore, RecordingFetcher, ReplayFetcher, default_fixture_dir
+from log_config import configure_logging
+from processor import F1QueryProcessor
+
+# Below these absolute differences a change is noise, whatever the ratio
+NOISE_FLOOR = {"p50_ms": 2.0, "p95_ms": 5.0, "calls": 0.0, "bytes": 0.0, "peak_mib": 1.0}
+
+# Fallback when the rule parser understands nothing: this season's drivers' standings
+DEFAULT_PARAMS = QueryParameters(primary_entity="driver", metrics=["standings"], time_scope={"last": 1})
+
+
+class StubUnderstandingAgent:
+    """Stands in for the LLM: answers with the rule parser's best guess, however unsure"""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.memory = SimpleNamespace(clear=lambda: None)
+
+    def run(self, prompt: str):
+        if self.latency:
+            time.sleep(self.latency)
+        return SimpleNamespace(content=self._parameters(prompt))
+
+    async def arun(self, prompt: str):
+        return self.run(prompt)
+
+    @staticmethod
+    def _parameters(prompt: str) -> QueryParameters:
+        query = prompt.split('"')[1] if prompt.count('"') >= 2 else prompt
+        params, _ = query_to_endpoint.rule_parser.parse(query)
+        return params or DEFAULT_PARAMS
+
+
+def run_query(processor: F1QueryProcessor, fetcher, query: str):
+    """Execute one query cold (no parameter cache); returns (seconds, HTTP calls, bytes)"""
+    query_to_endpoint.query_cache.clear()
+    before = fetcher.stats()
+    start = time.perf_counter()
+    processor.execute_query(query)
+    elapsed = time.perf_counter() - start
+    after = fetcher.stats()
+    return elapsed, after["requests"] - before["requests"], after["bytes"] - before["bytes"]
+
+
+def peak_memory(processor: F1QueryProcessor, fetcher, query: str) -> int:
+    tracemalloc.start()
+    try:
+        run_query(processor, fetcher, query)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def percentile(values, pct: float) -> float:
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return ordered[0]
+    return statistics.quantiles(ordered, n=100, method="inclusive")[int(pct) - 1]
+
+
+def benchmark(processor: F1QueryProcessor, fetcher, repeat: int, memory: bool = True, limit=None):
+    """Per-category report: query count, latency p50/p95 and mean calls, bytes and peak memory per query"""
+    samples = defaultdict(lambda: defaultdict(list))
+    queries = list(query_index.queries["queries"].items())[:limit]
+    for _, entry in queries:
+        per_query = samples[entry["category"]]
+        for _ in range(repeat):
+            elapsed, calls, size = run_query(processor, fetcher, entry["query"])
+            per_query["latency"].append(elapsed)
+        per_query["calls"].append(calls)
+        per_query["bytes"].append(size)
+        if memory:
+            per_query["peak"].append(peak_memory(processor, fetcher, entry["query"]))
+
+    report = {}
+    for category, values in samples.items():
+        report[category] = {
+            "queries": len(values["calls"]),
+            "p50_ms": round(percentile(values["latency"], 50) * 1000, 2),
+            "p95_ms": round(percentile(values["latency"], 95) * 1000, 2),
+            "calls": round(statistics.mean(values["calls"]), 2),
+            "bytes": round(statistics.mean(values["bytes"])),
+            "peak_mib": round(max(values["peak"]) / 2 ** 20, 2) if values["peak"] else 0.0,
+        }
+    return report
+
+
+def regressions(report, baseline, tolerance: float):
+    """(category, metric, baseline, current) for every metric worse than baseline beyond tolerance and noise"""
+    found = []
+    for category, metrics in report.items():
+        previous = baseline.get(category)
+        if previous is None:
+            continue
+        for metric, floor in NOISE_FLOOR.items():
+            old, new = previous.get(metric), metrics[metric]
+            if old is None:
+                continue
+            if new > old * (1 + tolerance) and new - old > floor:
+                found.append((category, metric, old, new))
+    return found
+
+
+def print_report(report, baseline=None):
+    header = f"{'category':<18}{'n':>4}{'p50 ms':>10}{'p95 ms':>10}{'calls/q':>9}{'KiB/q':>10}{'peak MiB':>10}"
+    print(header)
+    print("-" * len(header))
+    for category in sorted(report):
+        m = report[category]
+        print(f"{category:<18}{m['queries']:>4}{m['p50_ms']:>10.1f}{m['p95_ms']:>10.1f}"
+              f"{m['calls']:>9.1f}{m['bytes'] / 1024:>10.1f}{m['peak_mib']:>10.1f}")
+        if baseline and category in baseline:
+            b = baseline[category]
+            print(f"{'  baseline':<18}{b['queries']:>4}{b['p50_ms']:>10.1f}{b['p95_ms']:>10.1f}"
+                  f"{b['calls']:>9.1f}{b['bytes'] / 1024:>10.1f}{b['peak_mib']:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-category latency, HTTP calls, bytes and memory for the eval queries")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per query")
+    parser.add_argument("--limit", type=int, help="only the first N queries")
+    parser.add_argument("--parallel", action="store_true", help="run endpoints on the thread pool")
+    parser.add_argument("--fixtures", default=str(default_fixture_dir()), help="recorded response directory")
+    parser.add_argument("--no-synthetic", action="store_true", help="404 for requests without a fixture")
+    parser.add_argument("--base-url", help="fetch over HTTP from this API root (e.g. a mock_ergast.py server)")
+    parser.add_argument("--record", action="store_true", help="fetch live responses and save them as fixtures")
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated seconds per HTTP request")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="simulated seconds per LLM call")
+    parser.add_argument("--today", type=datetime.date.fromisoformat, help="date synthetic seasons are cut at")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--baseline", help="compare against this saved report")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative slowdown (0.2 = 20%%)")
+    parser.add_argument("--save-baseline", help="write this run's report here")
+    args = parser.parse_args()
+
+    configure_logging("quiet")
+    set_store(None)
+    baseline_file = json.loads(Path(args.baseline).read_text()) if args.baseline else None
+    if args.today is None and baseline_file and baseline_file.get("today"):
+        args.today = datetime.date.fromisoformat(baseline_file["today"])
+    if args.today:
+        # Parser and builder resolve "this season", "last 5 seasons", ... against the same date as the data
+        query_to_endpoint.set_current_year(args.today.year)
+    fixtures = FixtureStore(args.fixtures)
+    if args.base_url:
+        set_base_url(args.base_url)
+        fetcher = ErgastFetcher()
+    elif args.record:
+        fetcher = RecordingFetcher(fixtures)
+    else:
+        fetcher = ReplayFetcher(fixtures, synthetic=not args.no_synthetic, latency=args.latency, today=args.today)
+    set_fetcher(fetcher)
+    query_to_endpoint.query_cache = QueryCache(path=os.path.join(tempfile.mkdtemp(), "query_cache.json"))
+    query_to_endpoint.understanding_agents = AgentPool(lambda: StubUnderstandingAgent(args.llm_latency))
+
+    processor = F1QueryProcessor(parallel=args.parallel)
+    report = benchmark(processor, fetcher, max(args.repeat, 1), memory=not args.no_memory, limit=args.limit)
+
+    baseline = baseline_file["categories"] if baseline_file else None
+    print_report(report, baseline)
+
+    if args.save_baseline:
+        Path(args.save_baseline).write_text(json.dumps({
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "repeat": args.repeat,
+            "parallel": args.parallel,
+            "today": args.today.isoformat() if args.today else None,
+            "fixtures": len(fixtures),
+            "categories": report,
+        }, indent=2) + "\n")
+        print(f"\nBaseline saved to {args.save_baseline}")
+
+    if baseline is not None:
+        found = regressions(report, baseline, args.tolerance)
+        if found:
+            print(f"\n{len(found)} regression(s) beyond {args.tolerance:.0%}:")
+            for category, metric, old, new in found:
+                print(f"  {category:<18}{metric:<10}{old:>12} -> {new}")
+            sys.exit(1)
+        print("\nNo regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,7 +8,14 @@ from pathlib import Path
 backend_dir = Path(__file__).parent.parent / "backend"
 sys.path.append(str(backend_dir))
 
-from processor import process_query
+from log_config import configure_logging
+from processor import F1QueryProcessor
+
+@st.cache_resource
+def get_processor() -> F1QueryProcessor:
+    """One processor (agent pool, HTTP session) shared across Streamlit reruns"""
+    configure_logging()
+    return F1QueryProcessor(parallel=True)
 
 def main():
     st.set_page_config(
@@ -30,20 +37,28 @@ def main():
 
     if st.button("Submit Query"):
         if query:
-            with st.spinner("Processing query..."):
-                try:
-                    results = process_query(query)
-                    
-                    # Display results
-                    if isinstance(results, list):
-                        for i, result in enumerate(results, 1):
-                            if isinstance(result, pd.DataFrame) and not result.empty:
-                                st.subheader(f"Result {i}")
-                                st.dataframe(result, use_container_width=True)
-                    else:
-                        st.error("No results found")
-                except Exception as e:
-                    st.error(f"An error occurred: {str(e)}")
+            status = st.empty()
+            status.info("Processing query...")
+            try:
+                # Render each endpoint's table as soon as it is fetched
+                shown = 0
+                for result in get_processor().iter_query(query):
+                    shown += 1
+                    status.info(f"Fetched {shown} endpoint(s)...")
+                    if result.error:
+                        st.warning(f"{result.endpoint}: {result.error}")
+                    elif isinstance(result.data, pd.DataFrame) and not result.data.empty:
+                        st.subheader(f"Result {result.index + 1}")
+                        st.caption(f"{result.endpoint} · {result.elapsed:.2f}s")
+                        st.dataframe(result.data, use_container_width=True)
+                
+                if shown:
+                    status.success(f"Done: {shown} endpoint(s)")
+                else:
+                    status.error("No results found")
+            except Exception as e:
+                status.empty()
+                st.error(f"An error occurred: {str(e)}")
         else:
             st.warning("Please enter a query")
 
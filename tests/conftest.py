@@ -0,0 +1,15 @@
+import os
+import sys
+import tempfile
+
+# Pipeline modules import each other as top-level packages (a1_query,
+# a2_transform, ...), the same way processor.py and the frontend run them.
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend")
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+# Keep the on-disk caches of the pipeline out of the user's home directory
+_CACHE_ROOT = tempfile.mkdtemp(prefix="f1_pipeline_tests_")
+os.environ.setdefault("ERGAST_CACHE_DIR", os.path.join(_CACHE_ROOT, "ergast"))
+os.environ.setdefault("F1_QUERY_CACHE", os.path.join(_CACHE_ROOT, "query_cache.json"))
+os.environ.setdefault("F1_STORE_DIR", os.path.join(_CACHE_ROOT, "store"))
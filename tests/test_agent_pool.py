@@ -0,0 +1,173 @@
+import asyncio
+import queue
+import threading
+import unittest
+
+from a1_query.agent_pool import AgentPool
+from a1_query.query_to_endpoint import create_understanding_agent
+
+
+class TestAgentPool(unittest.TestCase):
+    def test_reuses_warmed_agents(self):
+        pool = AgentPool(create_understanding_agent, size=2)
+        self.assertEqual(pool.warm_up(), 2)
+        with pool.acquire() as first:
+            pass
+        with pool.acquire() as second:
+            pass
+        self.assertIs(first, second)
+        self.assertEqual(pool.stats()["created"], 2)
+
+    def test_agents_are_exclusive_across_threads(self):
+        pool = AgentPool(create_understanding_agent, size=3)
+        in_use, overlaps, lock = set(), [], threading.Lock()
+
+        def worker():
+            for _ in range(50):
+                with pool.acquire(timeout=5) as agent:
+                    with lock:
+                        overlaps.append(id(agent) in in_use)
+                        in_use.add(id(agent))
+                    with lock:
+                        in_use.discard(id(agent))
+
+        threads = [threading.Thread(target=worker) for _ in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertFalse(any(overlaps))
+        self.assertLessEqual(pool.stats()["created"], 3)
+
+    def test_failed_builds_give_their_slot_back(self):
+        attempts = []
+
+        def flaky():
+            attempts.append(1)
+            if len(attempts) <= 2:
+                raise RuntimeError("model unavailable")
+            return create_understanding_agent()
+
+        pool = AgentPool(flaky, size=1)
+        with self.assertRaises(RuntimeError):
+            pool.warm_up()
+        with self.assertRaises(RuntimeError):
+            with pool.acquire(timeout=1):
+                pass
+        self.assertEqual(pool.stats()["created"], 0)
+        with pool.acquire(timeout=1) as agent:
+            self.assertIsNotNone(agent)
+        self.assertEqual(pool.stats()["created"], 1)
+
+    def test_failed_build_wakes_a_waiting_thread(self):
+        building, fail = threading.Event(), threading.Event()
+        calls = []
+
+        def factory():
+            calls.append(1)
+            if len(calls) == 1:
+                building.set()
+                fail.wait(5)
+                raise RuntimeError("model unavailable")
+            return create_understanding_agent()
+
+        pool = AgentPool(factory, size=1)
+        got, errors = [], []
+
+        def first():
+            try:
+                with pool.acquire():
+                    pass
+            except RuntimeError as e:
+                errors.append(e)
+
+        def second():
+            with pool.acquire(timeout=5) as agent:
+                got.append(agent)
+
+        a = threading.Thread(target=first)
+        a.start()
+        building.wait(5)
+        b = threading.Thread(target=second)
+        b.start()
+        b.join(0.2)
+        self.assertTrue(b.is_alive())  # pool is full while the first build runs
+        fail.set()
+        a.join(5)
+        b.join(5)
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(len(got), 1)
+        self.assertEqual(pool.stats()["created"], 1)
+
+    def test_async_acquire_waits_without_blocking_the_loop(self):
+        pool = AgentPool(create_understanding_agent, size=2)
+        in_use, overlaps = set(), []
+
+        async def worker():
+            for _ in range(10):
+                async with pool.aacquire(timeout=5) as agent:
+                    overlaps.append(id(agent) in in_use)
+                    in_use.add(id(agent))
+                    await asyncio.sleep(0)
+                    in_use.discard(id(agent))
+
+        async def main():
+            await asyncio.gather(*(worker() for _ in range(5)))
+
+        asyncio.run(main())
+        self.assertFalse(any(overlaps))
+        self.assertEqual(pool.stats()["created"], 2)
+
+    def test_async_waiters_wake_on_release_and_build_off_the_loop(self):
+        built_on = []
+
+        def factory():
+            built_on.append(threading.current_thread())
+            return create_understanding_agent()
+
+        pool = AgentPool(factory, size=1)
+
+        async def main():
+            async with pool.aacquire() as agent:
+                waiter = asyncio.ensure_future(_borrow(pool))
+                await asyncio.sleep(0.05)
+                self.assertFalse(waiter.done())
+                with self.assertRaises(queue.Empty):
+                    async with pool.aacquire(timeout=0.01):
+                        pass
+            # Released: the waiter gets the same agent without polling
+            self.assertIs(await asyncio.wait_for(waiter, 1), agent)
+
+        asyncio.run(main())
+        self.assertNotIn(threading.main_thread(), built_on)
+
+    def test_release_from_a_thread_wakes_an_async_waiter(self):
+        pool = AgentPool(create_understanding_agent, size=1)
+        borrowed, released = threading.Event(), threading.Event()
+
+        def holder():
+            with pool.acquire():
+                borrowed.set()
+                released.wait(1)
+
+        thread = threading.Thread(target=holder)
+        thread.start()
+        borrowed.wait(1)
+
+        async def main():
+            waiter = asyncio.ensure_future(_borrow(pool))
+            await asyncio.sleep(0.02)
+            released.set()
+            return await asyncio.wait_for(waiter, 1)
+
+        self.assertIsNotNone(asyncio.run(main()))
+        thread.join()
+
+
+async def _borrow(pool):
+    async with pool.aacquire(timeout=5) as agent:
+        return agent
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import datetime
+import os
+import tempfile
+import time
+import unittest
+
+from a2_transform.cache import ResponseCache
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = ResponseCache(self.tmp.name, current_season_ttl=60, current_year=2024)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _age(self, url: str, seconds: float):
+        path = self.cache._path(self.cache.key(url))
+        past = time.time() - seconds
+        os.utime(path, (past, past))
+
+    def _fetched_on(self, url: str, day: datetime.date):
+        self._age(url, time.time() - datetime.datetime.combine(day, datetime.time(12)).timestamp())
+
+    def test_closed_seasons_never_expire(self):
+        url = "http://ergast.com/api/f1/2019/driverStandings.json"
+        self.cache.put(url, b'{"MRData": {}}')
+        self._fetched_on(url, datetime.date(2020, 1, 5))
+        self.assertEqual(self.cache.get(url), b'{"MRData": {}}')
+        self.assertEqual(self.cache.stats()["bytes_saved"], 14)
+
+    def test_season_fetched_mid_year_expires_after_rollover(self):
+        url = "http://ergast.com/api/f1/2023/driverStandings.json"
+        self.cache.put(url, b'{}')
+        self._fetched_on(url, datetime.date(2023, 6, 15))
+        self.assertIsNone(self.cache.get(url))
+        self.assertEqual(self.cache.stats()["expired"], 1)
+
+    def test_current_season_expires(self):
+        url = "http://ergast.com/api/f1/2024/driverStandings.json"
+        self.cache.put(url, b'{}')
+        self.assertIsNotNone(self.cache.get(url))
+        self._age(url, 120)
+        self.assertIsNone(self.cache.get(url))
+        self.assertEqual(self.cache.stats()["expired"], 1)
+
+    def test_evicts_least_recently_used(self):
+        self.cache.max_bytes = 25
+        urls = [f"http://ergast.com/api/f1/201{i}/results.json" for i in range(3)]
+        self.cache.put(urls[0], b"a" * 10)
+        self.cache.put(urls[1], b"b" * 10)
+        self.cache.get(urls[0])
+        self.cache.put(urls[2], b"c" * 10)
+        self.assertIsNotNone(self.cache.get(urls[0]))
+        self.assertIsNone(self.cache.get(urls[1]))
+        self.assertEqual(self.cache.stats()["evictions"], 1)
+
+    def test_index_survives_restart(self):
+        url = "http://ergast.com/api/f1/2020/status.json"
+        self.cache.put(url, b'{}')
+        reopened = ResponseCache(self.tmp.name, current_year=2024)
+        self.assertEqual(reopened.get(url), b'{}')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import asyncio
+import datetime
+import time
+import unittest
+
+from a2_transform import AsyncErgastFetcher, ErgastFetcher
+from a2_transform.transformers.results import RaceResultsTransformer
+from ergast_fixtures import ReplayFetcher
+from mock_ergast import MockErgastServer
+
+TODAY = datetime.date(2024, 12, 31)
+SILVERSTONE = "http://ergast.com/api/f1/circuits/silverstone/results.json"
+
+
+class TestCircuitResults(unittest.TestCase):
+    def test_history_is_one_schedule_call_plus_concurrent_races(self):
+        fetcher = ReplayFetcher(today=TODAY, latency=0.02)
+        start = time.perf_counter()
+        df = RaceResultsTransformer(fetcher=fetcher).transform(SILVERSTONE)
+        wall = time.perf_counter() - start
+
+        seasons = df['season'].unique().tolist()
+        self.assertEqual(seasons, sorted(seasons))
+        self.assertEqual(str(df['season'].dtype), 'Int64')
+        self.assertEqual(df['circuit_id'].unique().tolist(), ['silverstone'])
+        self.assertEqual(len(df), 20 * len(seasons))
+        self.assertEqual(fetcher.stats()['requests'], 1 + len(seasons))
+        # race pages overlap instead of queueing behind each other
+        self.assertLess(wall, 0.02 * len(seasons))
+
+    def test_season_and_driver_narrowing(self):
+        fetcher = ReplayFetcher(today=TODAY)
+        transformer = RaceResultsTransformer(fetcher=fetcher)
+        df = transformer.transform("http://ergast.com/api/f1/2023/drivers/alonso/circuits/silverstone/results.json")
+        self.assertEqual(df['driver_id'].tolist(), ['alonso'])
+        self.assertEqual(df['season'].tolist(), [2023])
+        self.assertEqual(fetcher.stats()['requests'], 2)
+
+        self.assertTrue(transformer.transform("http://ergast.com/api/f1/2023/circuits/nowhere/results.json").empty)
+
+    def test_async_matches_sync(self):
+        with MockErgastServer(today=TODAY) as server:
+            url = f"{server.base_url}/2023/circuits/monza/results.json"
+            sync = RaceResultsTransformer(fetcher=ErgastFetcher()).transform(url)
+
+            fetcher = AsyncErgastFetcher()
+            transformer = RaceResultsTransformer(async_fetcher=fetcher)
+
+            async def run():
+                try:
+                    return await transformer.atransform(url)
+                finally:
+                    await fetcher.aclose()
+
+            self.assertEqual(len(sync), 20)
+            self.assertTrue(sync.equals(asyncio.run(run())))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import datetime
+import json
+import unittest
+
+from a2_transform.decoder import decode_rows, decode_table, field, loads, merge_names, to_frame
+from a2_transform.transformers.results import process_results_data
+from ergast_fixtures import synthesize
+
+RACES = [
+    {'season': '2023', 'round': '1', 'Results': [
+        {'position': '1', 'Driver': {'driverId': 'max_verstappen', 'givenName': 'Max', 'familyName': 'Verstappen'}},
+        {'position': '2', 'Driver': {'driverId': 'perez'}},
+    ]},
+    {'season': '2023', 'round': '2'},
+    {'season': '2023', 'round': '3', 'Results': [{'position': 'R', 'Driver': {}}]},
+]
+
+
+class TestDecodeTable(unittest.TestCase):
+    def test_group_fields_repeat_over_rows(self):
+        columns = decode_table(
+            RACES, 'Results',
+            group_fields=[field('round', 'round')],
+            row_fields=[field('position', 'position'), field('driver_id', 'Driver', 'driverId', default='')],
+        )
+        self.assertEqual(columns['round'].tolist(), ['1', '1', '3'])
+        self.assertEqual(columns['driver_id'].tolist(), ['max_verstappen', 'perez', ''])
+
+    def test_deep_paths_and_missing_keys(self):
+        rows = [{'Timings': [{'time': '1:30.100'}]}, {'Timings': []}, {}]
+        columns = decode_rows(rows, [field('time', 'Timings', 0, 'time')])
+        self.assertEqual(columns['time'].tolist(), ['1:30.100', None, None])
+
+    def test_merge_names_keeps_column_order(self):
+        columns = decode_table(RACES[:1], 'Results', row_fields=[
+            field('given_name', 'Driver', 'givenName', default=''),
+            field('family_name', 'Driver', 'familyName', default=''),
+            field('position', 'position'),
+        ])
+        merged = merge_names(columns)
+        self.assertEqual(list(merged), ['driver_name', 'position'])
+        self.assertEqual(merged['driver_name'].tolist(), ['Max Verstappen', ''])
+
+    def test_to_frame_types_columns(self):
+        df = to_frame(decode_table(RACES, 'Results', row_fields=[field('position', 'position')]))
+        self.assertEqual(str(df['position'].dtype), 'Int64')
+        self.assertEqual(df['position'].isna().tolist(), [False, False, True])
+        self.assertTrue(to_frame({}).empty)
+
+
+class TestResultsParity(unittest.TestCase):
+    def test_matches_row_by_row_decoding(self):
+        url = "http://ergast.com/api/f1/2023/results.json?limit=1000"
+        races = loads(json.dumps(synthesize(url, datetime.date(2024, 12, 31))).encode())
+        races = races['MRData']['RaceTable']['Races']
+        df = process_results_data(races)
+
+        result = races[0]['Results'][0]
+        driver = result['Driver']
+        self.assertEqual(len(df), sum(len(race['Results']) for race in races))
+        self.assertEqual(df['driver_id'][0], driver['driverId'])
+        self.assertEqual(df['driver_name'][0], f"{driver['givenName']} {driver['familyName']}")
+        self.assertEqual(df['points'][0], float(result['points']))
+        self.assertEqual(df['season'][0], 2023)
+        self.assertTrue(process_results_data([]).empty)
+
+
+if __name__ == '__main__':
+    unittest.main()
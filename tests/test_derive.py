@@ -0,0 +1,135 @@
+import asyncio
+import datetime
+import tempfile
+import unittest
+from unittest import mock
+
+import processor
+from a2_transform import AsyncErgastFetcher, EndpointRouter, ErgastFetcher, F1DataStore
+from a2_transform.derive import SharedResultsLoader, can_derive, derive, share_results
+from a2_transform.transformers.results import RaceResultsTransformer
+from a2_transform.transformers.standings import StandingsTransformer
+from a2_transform.transformers.status import StatusTransformer
+from api.endpoint import Endpoint
+from ergast_fixtures import ReplayFetcher
+from mock_ergast import MockErgastServer
+from processor import F1QueryProcessor
+
+TODAY = datetime.date(2024, 12, 31)
+BASE = "http://ergast.com/api/f1"
+
+
+class TestDerive(unittest.TestCase):
+    def setUp(self):
+        self.fetcher = ReplayFetcher(today=TODAY)
+        self.results = RaceResultsTransformer(fetcher=self.fetcher)
+
+    def test_standings_match_the_api(self):
+        # 2019 has no sprints; 2023 standings include sprint points
+        for season in (2019, 2023):
+            results = self.results.transform(Endpoint(kind='results', season=season))
+            sprints = self.results.transform(Endpoint(kind='sprint', season=season))
+            for kind in ('driverStandings', 'constructorStandings'):
+                for round_num in (None, 7):
+                    with self.subTest(season=season, kind=kind, round=round_num):
+                        endpoint = Endpoint(kind=kind, season=season, round=round_num)
+                        derived = derive(endpoint, results, sprints)
+                        fetched = StandingsTransformer(fetcher=self.fetcher).transform(endpoint)
+                        self.assertTrue(derived.equals(fetched[derived.columns]))
+
+    def test_status_matches_the_api(self):
+        results = self.results.transform(Endpoint(kind='results', season=2022))
+        for endpoint in (Endpoint(kind='status', season=2022), Endpoint(kind='status', season=2022, driver='alonso')):
+            with self.subTest(endpoint=str(endpoint)):
+                derived = derive(endpoint, results)
+                fetched = StatusTransformer(fetcher=self.fetcher).transform(endpoint)
+                self.assertEqual(dict(zip(derived['status'].astype(str), derived['count'])),
+                                 dict(zip(fetched['status'].astype(str), fetched['count'])))
+                self.assertAlmostEqual(derived['dnf_rate'].iloc[0], fetched['dnf_rate'].iloc[0])
+
+    def test_missing_inputs_are_not_derived(self):
+        results = self.results.transform(Endpoint(kind='results', season=2023))
+        self.assertIsNone(derive(Endpoint(kind='driverStandings', season=2023), results))  # no sprint results
+        self.assertIsNone(derive(Endpoint(kind='status', season=2022), results))
+        self.assertIsNone(derive(Endpoint(kind='driverStandings', season='current'), results))
+
+    def test_seasons_without_summed_standings_are_not_derived(self):
+        # Dropped scores (drivers to 1990), best car only (constructors to 1978), exclusions
+        for kind, season in (('driverStandings', 1990), ('constructorStandings', 1978),
+                             ('driverStandings', 1997), ('constructorStandings', 2007)):
+            with self.subTest(kind=kind, season=season):
+                self.assertFalse(can_derive(Endpoint(kind=kind, season=season)))
+        self.assertTrue(can_derive(Endpoint(kind='constructorStandings', season=1990)))
+        self.assertTrue(can_derive(Endpoint(kind='status', season=1985)))
+
+    def test_pre_1991_driver_standings_come_from_the_api(self):
+        results = self.results.transform(Endpoint(kind='results', season=1988))
+        self.assertIsNone(derive(Endpoint(kind='driverStandings', season=1988), results))
+
+        router = EndpointRouter(fetcher=self.fetcher)
+        jobs = router.route_all([f"{BASE}/1988/results.json", f"{BASE}/1988/driverStandings.json"])
+        self.assertEqual(share_results(jobs, router.kind_map['results']), jobs)
+
+
+class TestSharedResults(unittest.TestCase):
+    def setUp(self):
+        self.server = MockErgastServer(today=TODAY).start()
+        self.addCleanup(self.server.stop)
+        self.fetcher = ReplayFetcher(today=TODAY)
+
+    def _execute(self, paths, run_async=False):
+        endpoints = [f"{self.server.base_url}/{path}" for path in paths]
+        proc = F1QueryProcessor(parallel=True)
+        async_fetcher = AsyncErgastFetcher()
+        router = EndpointRouter(fetcher=ErgastFetcher(), async_fetcher=async_fetcher)
+
+        async def arun():
+            try:
+                return await proc.aexecute_endpoints("q")
+            finally:
+                await async_fetcher.aclose()
+
+        self.server.reset_stats()
+        with mock.patch.object(processor, 'process_query', return_value=endpoints), \
+                mock.patch.object(processor, 'aprocess_query', return_value=endpoints), \
+                mock.patch.object(proc.validator, 'validate', return_value=True), \
+                mock.patch.object(proc.router, 'kind_map', router.kind_map):
+            return [df for _, df in (asyncio.run(arun()) if run_async else proc.execute_endpoints("q"))]
+
+    def test_results_standings_and_status_cost_one_fetch(self):
+        paths = ["2019/results.json?limit=1000&driver_id=hamilton", "2019/driverStandings.json", "2019/status.json"]
+        for run_async in (False, True):
+            with self.subTest(run_async=run_async):
+                frames = self._execute(paths, run_async)
+                self.assertEqual(self.server.stats()['served'], 1)
+                self.assertEqual(set(frames[0]['driver_id']), {'hamilton'})
+                self.assertEqual(len(frames[1]), 20)
+                self.assertEqual(frames[2]['count'].sum(), 22 * 20)
+
+    def test_sprint_seasons_add_the_sprint_fetch(self):
+        frames = self._execute(["2023/results.json", "2023/constructorStandings.json"])
+        self.assertEqual(self.server.stats()['served'], 2)
+        self.assertEqual(len(frames[1]), 10)
+
+    def test_plans_without_results_are_unchanged(self):
+        router = EndpointRouter(fetcher=self.fetcher)
+        jobs = router.route_all([f"{BASE}/2019/driverStandings.json", f"{BASE}/2019/drivers/hamilton/results.json"])
+        self.assertEqual(share_results(jobs, router.kind_map['results']), jobs)
+
+    def test_stored_results_are_used(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = F1DataStore(tmp)
+            results = RaceResultsTransformer(fetcher=self.fetcher)
+            store.write('results', 2019, results.transform(Endpoint(kind='results', season=2019)))
+            self.fetcher.reset_metrics()
+
+            router = EndpointRouter(fetcher=self.fetcher, store=store)
+            jobs = share_results(router.route_all([f"{BASE}/2019/status.json"]), router.kind_map['results'], store=store)
+            endpoint, loader = jobs[0]
+            self.assertIsInstance(loader, SharedResultsLoader)
+            self.assertFalse(loader.load(endpoint).empty)
+            self.assertEqual(self.fetcher.stats()['requests'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+
+from api.endpoint import BASE_URL, Endpoint
+
+
+class TestEndpoint(unittest.TestCase):
+    def test_parse_round_trips(self):
+        for path in [
+            "/2023/drivers/hamilton/results.json",
+            "/2023/5/qualifying.json",
+            "/2023/circuits/monza/results.json",
+            "/current/last/results.json",
+            "/2023/driverStandings.json",
+            "/2023/1/laps/5.json",
+            "/drivers/hamilton.json",
+        ]:
+            with self.subTest(path=path):
+                self.assertEqual(Endpoint.parse(BASE_URL + path).url, BASE_URL + path)
+
+    def test_fields(self):
+        endpoint = Endpoint.parse(f"{BASE_URL}/2023/5/drivers/hamilton/results.json")
+        self.assertEqual(endpoint.kind, "results")
+        self.assertEqual((endpoint.season, endpoint.round, endpoint.driver), (2023, 5, "hamilton"))
+
+    def test_legacy_circuit_ordering(self):
+        endpoint = Endpoint.parse(f"{BASE_URL}/circuits/monza/2023/results.json")
+        self.assertEqual((endpoint.circuit, endpoint.season), ("monza", 2023))
+        self.assertEqual(endpoint.path, "/2023/circuits/monza/results.json")
+
+    def test_local_filters_stay_out_of_fetch_url(self):
+        endpoint = Endpoint(kind="results", season=2023, filters=(("driver_id", ("hamilton", "alonso")),))
+        endpoint = endpoint.with_params(limit=1000)
+        self.assertEqual(endpoint.url, f"{BASE_URL}/2023/results.json?limit=1000")
+        self.assertEqual(str(endpoint), f"{BASE_URL}/2023/results.json?limit=1000&driver_id=hamilton%2Calonso")
+        self.assertEqual(Endpoint.parse(str(endpoint)), endpoint)
+
+    def test_coerce_passes_descriptors_through(self):
+        endpoint = Endpoint(kind="status", season=2023)
+        self.assertIs(Endpoint.coerce(endpoint), endpoint)
+        self.assertEqual(Endpoint.coerce(endpoint.url), endpoint)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import datetime
+import json
+import tempfile
+import unittest
+
+from a2_transform import EndpointRouter
+from ergast_fixtures import FixtureStore, ReplayFetcher, fixture_name, synthesize
+
+TODAY = datetime.date(2024, 12, 31)
+
+
+class TestSynthesize(unittest.TestCase):
+    def test_pagination_matches_ergast(self):
+        url = "http://ergast.com/api/f1/2023/results.json"
+        first = synthesize(url + "?limit=100&offset=0", TODAY)["MRData"]
+        self.assertEqual(first["total"], "440")
+        self.assertEqual(sum(len(r["Results"]) for r in first["RaceTable"]["Races"]), 100)
+
+        fetcher = ReplayFetcher(today=TODAY)
+        pages = list(fetcher.iter_pages(url, page_size=100))
+        rows = [row for page in pages for race in page["MRData"]["RaceTable"]["Races"] for row in race["Results"]]
+        self.assertEqual(len(pages), 5)
+        self.assertEqual(len(rows), 440)
+        self.assertEqual(fetcher.stats()["requests"], 5)
+
+    def test_filters_and_unraced_rounds(self):
+        hamilton = synthesize("http://ergast.com/api/f1/2024/drivers/hamilton/results.json",
+                              datetime.date(2024, 4, 1))["MRData"]
+        races = hamilton["RaceTable"]["Races"]
+        self.assertEqual(hamilton["total"], str(len(races)))
+        self.assertTrue(all(race["Results"][0]["Driver"]["driverId"] == "hamilton" for race in races))
+        self.assertLess(len(races), 22)
+        self.assertIsNone(synthesize("http://ergast.com/api/f1/2023/unknown.json", TODAY))
+
+    def test_standings_are_consistent_with_results(self):
+        points = {}
+        for kind, key in (("results", "Results"), ("sprint", "SprintResults")):
+            results = synthesize(f"http://ergast.com/api/f1/2023/{kind}.json?limit=1000", TODAY)["MRData"]
+            for race in results["RaceTable"]["Races"]:
+                for row in race[key]:
+                    driver = row["Driver"]["driverId"]
+                    points[driver] = points.get(driver, 0) + float(row["points"])
+        standings = synthesize("http://ergast.com/api/f1/2023/driverStandings.json", TODAY)["MRData"]
+        table = standings["StandingsTable"]["StandingsLists"][0]["DriverStandings"]
+        self.assertEqual({row["Driver"]["driverId"]: float(row["points"]) for row in table}, points)
+
+
+class TestReplayFetcher(unittest.TestCase):
+    def test_recorded_fixture_wins_over_synthetic_data(self):
+        url = "https://api.jolpi.ca/ergast/f1/2023/drivers.json?offset=0&limit=5"
+        self.assertEqual(fixture_name(url), "2023/drivers@limit=5&offset=0.json")
+        with tempfile.TemporaryDirectory() as tmp:
+            store = FixtureStore(tmp)
+            store.save("http://ergast.com/api/f1/2023/drivers.json?limit=5&offset=0",
+                       json.dumps({"MRData": {"total": "0"}}).encode())
+            fetcher = ReplayFetcher(store, synthetic=False)
+            self.assertEqual(fetcher.get_json(url), {"MRData": {"total": "0"}})
+            with self.assertRaises(Exception):
+                fetcher.get_json("http://ergast.com/api/f1/2022/drivers.json")
+
+    def test_transformers_parse_synthetic_payloads(self):
+        router = EndpointRouter(fetcher=ReplayFetcher(today=TODAY))
+        expected = {
+            "http://ergast.com/api/f1/2023/qualifying.json": 440,
+            "http://ergast.com/api/f1/2023/driverStandings.json": 20,
+            "http://ergast.com/api/f1/2023/constructorStandings.json": 10,
+            "http://ergast.com/api/f1/2023/5/laps.json": 20,
+        }
+        for url, rows in expected.items():
+            with self.subTest(url=url):
+                self.assertEqual(len(router.get_transformer(url).transform(url)), rows)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,229 @@
+import asyncio
+import json
+import tempfile
+import threading
+import unittest
+from urllib.parse import parse_qs, urlsplit
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from a2_transform.async_fetcher import AsyncErgastFetcher
+from a2_transform.cache import ResponseCache
+from a2_transform.fetcher import ErgastFetcher
+from a2_transform.transformers.standings import StandingsTransformer
+
+STANDINGS = {
+    "MRData": {
+        "StandingsTable": {
+            "season": "2023",
+            "StandingsLists": [{
+                "season": "2023",
+                "round": "22",
+                "DriverStandings": [{
+                    "position": "1", "points": "575", "wins": "19",
+                    "Driver": {"driverId": "max_verstappen", "givenName": "Max", "familyName": "Verstappen"},
+                    "Constructors": [{"name": "Red Bull"}],
+                }],
+            }],
+        }
+    }
+}
+
+
+class StubErgastHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    failures_left = {}
+    connections = set()
+
+    def do_GET(self):
+        type(self).connections.add(self.client_address)
+        remaining = self.failures_left.get(self.path, 0)
+        if remaining:
+            self.failures_left[self.path] = remaining - 1
+            self._send(503, b'{}')
+        elif self.path.endswith("/missing.json"):
+            self._send(404, b'{}')
+        elif urlsplit(self.path).path.endswith("/paged.json"):
+            self._send(200, json.dumps(self._page()).encode())
+        else:
+            self._send(200, json.dumps(STANDINGS).encode())
+
+    def _page(self) -> dict:
+        """Rows ``offset .. offset+limit`` of a 25-row table, Ergast-style"""
+        query = parse_qs(urlsplit(self.path).query)
+        limit, offset = int(query["limit"][0]), int(query["offset"][0])
+        rows = list(range(offset, min(offset + limit, 25)))
+        return {"MRData": {"limit": str(limit), "offset": str(offset), "total": "25", "rows": rows}}
+
+    def _send(self, status: int, body: bytes):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubServerMixin:
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StubErgastHandler)
+        cls.base = f"http://127.0.0.1:{cls.server.server_port}/api/f1"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+
+class TestErgastFetcher(StubServerMixin, unittest.TestCase):
+    def setUp(self):
+        StubErgastHandler.failures_left.clear()
+        StubErgastHandler.connections.clear()
+        self.fetcher = ErgastFetcher(timeout=2, retries=2, backoff_factor=0)
+
+    def tearDown(self):
+        self.fetcher.close()
+
+    def test_reuses_connection_and_records_metrics(self):
+        for _ in range(5):
+            self.fetcher.get_json(f"{self.base}/2023/driverStandings.json")
+        self.assertEqual(len(StubErgastHandler.connections), 1)
+        stats = self.fetcher.stats()
+        self.assertEqual(stats["requests"], 5)
+        self.assertEqual(stats["bytes"], 5 * len(json.dumps(STANDINGS)))
+        self.assertTrue(all(m.elapsed > 0 for m in self.fetcher.recent()))
+
+    def test_retries_server_errors(self):
+        StubErgastHandler.failures_left["/api/f1/2022/driverStandings.json"] = 2
+        data = self.fetcher.get_json(f"{self.base}/2022/driverStandings.json")
+        self.assertIn("MRData", data)
+        self.assertEqual(self.fetcher.recent()[-1].retries, 2)
+
+    def test_raises_on_client_errors(self):
+        with self.assertRaises(requests.exceptions.HTTPError):
+            self.fetcher.get(f"{self.base}/2023/missing.json")
+        self.assertEqual(self.fetcher.stats()["errors"], 1)
+
+    def test_cached_responses_skip_the_network(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            fetcher = ErgastFetcher(timeout=2, cache=ResponseCache(tmp, current_year=2024))
+            url = f"{self.base}/2019/driverStandings.json"
+            first = fetcher.get_json(url)
+            second = fetcher.get_json(url)
+            fetcher.close()
+        self.assertEqual(first, second)
+        self.assertEqual(fetcher.stats()["requests"], 1)
+        self.assertEqual(fetcher.stats()["cache_hits"], 1)
+
+    def test_iter_pages_follows_total(self):
+        pages = list(self.fetcher.iter_pages(f"{self.base}/2023/1/paged.json?limit=5", page_size=10))
+        self.assertEqual([p["MRData"]["offset"] for p in pages], ["0", "10", "20"])
+        self.assertEqual([row for p in pages for row in p["MRData"]["rows"]], list(range(25)))
+        self.assertEqual(self.fetcher.stats()["requests"], 3)
+
+    def test_iter_pages_single_page(self):
+        pages = list(self.fetcher.iter_pages(f"{self.base}/2023/1/paged.json", page_size=100))
+        self.assertEqual(len(pages), 1)
+        self.assertEqual(len(pages[0]["MRData"]["rows"]), 25)
+
+    def test_transformer_uses_injected_fetcher(self):
+        df = StandingsTransformer(fetcher=self.fetcher).transform(f"{self.base}/2023/driverStandings.json")
+        self.assertEqual(df["driver_id"].tolist(), ["max_verstappen"])
+        self.assertEqual(self.fetcher.stats()["requests"], 1)
+
+
+class TestAsyncErgastFetcher(StubServerMixin, unittest.TestCase):
+    def setUp(self):
+        StubErgastHandler.failures_left.clear()
+        StubErgastHandler.connections.clear()
+        self.fetcher = AsyncErgastFetcher(timeout=2, retries=2, backoff_factor=0)
+
+    def _run(self, coro):
+        async def run():
+            try:
+                return await coro
+            finally:
+                await self.fetcher.aclose()
+        return asyncio.run(run())
+
+    def test_concurrent_requests_share_the_client(self):
+        url = f"{self.base}/2023/driverStandings.json"
+
+        async def fetch_all():
+            return await asyncio.gather(*(self.fetcher.get_json(url) for _ in range(8)))
+
+        results = self._run(fetch_all())
+        self.assertTrue(all(r == STANDINGS for r in results))
+        self.assertLessEqual(len(StubErgastHandler.connections), 8)
+        self.assertEqual(self.fetcher.stats()["requests"], 8)
+
+    def test_retries_server_errors(self):
+        StubErgastHandler.failures_left["/api/f1/2022/driverStandings.json"] = 2
+        data = self._run(self.fetcher.get_json(f"{self.base}/2022/driverStandings.json"))
+        self.assertIn("MRData", data)
+        self.assertEqual(self.fetcher.recent()[-1].retries, 2)
+
+    def test_raises_on_client_errors(self):
+        import httpx
+
+        with self.assertRaises(httpx.HTTPStatusError):
+            self._run(self.fetcher.get(f"{self.base}/2023/missing.json"))
+        self.assertEqual(self.fetcher.stats()["errors"], 1)
+
+    def test_shares_cache_entries_with_sync_fetcher(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ResponseCache(tmp, current_year=2024)
+            url = f"{self.base}/2019/driverStandings.json"
+            sync_fetcher = ErgastFetcher(timeout=2, cache=cache)
+            sync_fetcher.get_json(url, params={"limit": 1000})
+            sync_fetcher.close()
+            self.fetcher.cache = cache
+            data = self._run(self.fetcher.get_json(url, params={"limit": 1000}))
+        self.assertEqual(data, STANDINGS)
+        self.assertEqual(self.fetcher.stats()["requests"], 0)
+        self.assertEqual(self.fetcher.stats()["cache_hits"], 1)
+
+    def test_backoff_is_capped(self):
+        self.fetcher.backoff_factor = 0.5
+        self.assertEqual(self.fetcher._backoff(1, "3"), 3.0)
+        self.assertEqual(self.fetcher._backoff(0, "86400"), AsyncErgastFetcher.BACKOFF_MAX)
+        self.assertEqual(self.fetcher._backoff(0, "-5"), 0.0)
+        self.assertEqual(self.fetcher._backoff(20), AsyncErgastFetcher.BACKOFF_MAX)
+
+    def test_iter_pages_follows_total(self):
+        async def collect():
+            return [p async for p in self.fetcher.iter_pages(f"{self.base}/2023/1/paged.json?limit=5", page_size=10)]
+
+        pages = self._run(collect())
+        self.assertEqual([p["MRData"]["offset"] for p in pages], ["0", "10", "20"])
+        self.assertEqual([row for p in pages for row in p["MRData"]["rows"]], list(range(25)))
+
+    def test_client_is_closed_with_its_loop(self):
+        url = f"{self.base}/2023/driverStandings.json"
+
+        async def fetch():
+            await self.fetcher.get_json(url)
+            return self.fetcher.client
+
+        # No aclose: asyncio.run tearing the loop down must close the client
+        first = asyncio.run(fetch())
+        self.assertTrue(first.is_closed)
+        second = self._run(fetch())
+        self.assertIsNot(second, first)
+        self.assertTrue(second.is_closed)
+        self.assertEqual(self.fetcher._clients, {})
+
+    def test_transformer_atransform(self):
+        transformer = StandingsTransformer(async_fetcher=self.fetcher)
+        df = self._run(transformer.atransform(f"{self.base}/2023/driverStandings.json"))
+        self.assertEqual(df["driver_id"].tolist(), ["max_verstappen"])
+        self.assertEqual(self.fetcher.stats()["requests"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
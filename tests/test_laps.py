@@ -0,0 +1,155 @@
+import asyncio
+import unittest
+from urllib.parse import urlsplit
+
+import pandas as pd
+
+from a2_transform.transformers.laps import (
+    LapTimesTransformer,
+    fastest_laps,
+    flatten_timings,
+    lap_times_to_seconds,
+)
+
+
+def race(round_num, laps):
+    return {
+        'season': '2023',
+        'round': str(round_num),
+        'raceName': f'Race {round_num}',
+        'Circuit': {'circuitName': f'Circuit {round_num}'},
+        'Laps': [
+            {'number': str(n), 'Timings': [
+                {'driverId': driver, 'position': str(pos), 'time': time}
+                for pos, (driver, time) in enumerate(timings, start=1)
+            ]}
+            for n, timings in enumerate(laps, start=1)
+        ],
+    }
+
+
+class StubFetcher:
+    """Serves canned payloads by URL path; a list of payloads is served as pages"""
+
+    def __init__(self, routes):
+        self.routes = routes
+        self.paths = []
+
+    def get_json(self, url, params=None):
+        path = urlsplit(url).path
+        self.paths.append(path)
+        return self.routes[path]
+
+    def iter_pages(self, url, page_size=1000, max_workers=4):
+        path = urlsplit(url).path
+        self.paths.append(path)
+        pages = self.routes[path]
+        yield from pages if isinstance(pages, list) else [pages]
+
+
+class AsyncStubFetcher(StubFetcher):
+    async def get_json(self, url, params=None):
+        return StubFetcher.get_json(self, url, params)
+
+    async def iter_pages(self, url, page_size=1000, max_concurrency=4):
+        for page in StubFetcher.iter_pages(self, url, page_size):
+            yield page
+
+
+def race_table(*races):
+    return {'MRData': {'RaceTable': {'Races': list(races)}}}
+
+
+class TestLapTimeParsing(unittest.TestCase):
+    def test_fixed_width_and_general_formats(self):
+        times = pd.Series(['1:30.100', '58.4', '10:00.000', '1:3a.000', None, 'bad'])
+        parsed = lap_times_to_seconds(times).tolist()
+        self.assertEqual(parsed[:3], [90.1, 58.4, 600.0])
+        self.assertTrue(all(pd.isna(v) for v in parsed[3:]))
+
+    def test_keeps_index(self):
+        parsed = lap_times_to_seconds(pd.Series(['1:29.999'], index=[7]))
+        self.assertEqual(parsed.index.tolist(), [7])
+        self.assertAlmostEqual(parsed[7], 89.999)
+
+
+class TestFastestLaps(unittest.TestCase):
+    def test_flatten_is_one_row_per_timing(self):
+        df = flatten_timings([race(1, [[('hamilton', '1:31.000'), ('alonso', '1:32.000')]] * 3)])
+        self.assertEqual(len(df), 6)
+        self.assertEqual(df['lap_number'].tolist(), [1, 1, 2, 2, 3, 3])
+        self.assertEqual(df['position'].tolist(), [1, 2] * 3)
+
+    def test_fastest_lap_per_driver_per_race(self):
+        races = [
+            race(1, [
+                [('hamilton', '1:31.000'), ('alonso', '1:32.500')],
+                [('hamilton', '1:30.200'), ('alonso', '1:32.000')],
+                [('hamilton', '1:30.900'), ('alonso', 'bad')],
+            ]),
+            race(2, [[('alonso', '1:20.000'), ('hamilton', '1:21.000')]]),
+        ]
+        df = fastest_laps(flatten_timings(races))
+        self.assertEqual(
+            df[['round', 'driver_id', 'fastest_lap_time', 'fastest_lap_number']].values.tolist(),
+            [['1', 'hamilton', 90.2, 2], ['1', 'alonso', 92.0, 2],
+             ['2', 'alonso', 80.0, 1], ['2', 'hamilton', 81.0, 1]],
+        )
+
+    def test_transform(self):
+        payload = race_table(race(5, [[('norris', '1:29.000')]]))
+        df = LapTimesTransformer(fetcher=StubFetcher({'/api/f1/2023/5/laps.json': payload})).transform(
+            "http://ergast.com/api/f1/2023/5/laps.json"
+        )
+        self.assertEqual(df[['race_name', 'driver_id', 'fastest_lap_time']].values.tolist(),
+                         [['Race 5', 'norris', 89.0]])
+
+    def test_transform_without_races(self):
+        df = LapTimesTransformer(fetcher=StubFetcher({'/api/f1/2023/5/laps.json': race_table()})).transform(
+            "http://ergast.com/api/f1/2023/5/laps.json"
+        )
+        self.assertTrue(df.empty)
+
+    def test_laps_split_across_pages(self):
+        # Ergast pages by timing row, so one lap can straddle two pages
+        pages = [
+            race_table(race(1, [[('hamilton', '1:31.000'), ('alonso', '1:30.000')]])),
+            race_table(race(1, [[('hamilton', '1:29.500')]])),
+        ]
+        transformer = LapTimesTransformer(fetcher=StubFetcher({'/api/f1/2023/1/laps.json': pages}))
+        self.assertEqual(len(transformer.timings("http://ergast.com/api/f1/2023/1/laps.json")), 3)
+        df = transformer.transform("http://ergast.com/api/f1/2023/1/laps.json")
+        self.assertEqual(dict(zip(df['driver_id'], df['fastest_lap_time'])), {'hamilton': 89.5, 'alonso': 90.0})
+
+    def test_season_endpoint_covers_completed_rounds(self):
+        schedule = race_table(
+            {'round': '1', 'date': '2023-03-05'},
+            {'round': '2', 'date': '2023-03-19'},
+            {'round': '3', 'date': '2999-01-01'},
+        )
+        fetcher = StubFetcher({
+            '/api/f1/2023/races.json': schedule,
+            '/api/f1/2023/1/laps.json': race_table(race(1, [[('hamilton', '1:31.000')]])),
+            '/api/f1/2023/2/laps.json': race_table(race(2, [[('hamilton', '1:32.000')]])),
+        })
+        df = LapTimesTransformer(fetcher=fetcher).transform("http://ergast.com/api/f1/2023/laps.json")
+        self.assertEqual(df['round'].tolist(), [1, 2])
+        self.assertNotIn('/api/f1/2023/3/laps.json', fetcher.paths)
+
+    def test_atransform_matches_transform(self):
+        routes = {
+            '/api/f1/2023/races.json': race_table({'round': '1', 'date': '2023-03-05'}, {'round': '2', 'date': '2023-03-19'}),
+            '/api/f1/2023/1/laps.json': [
+                race_table(race(1, [[('hamilton', '1:31.000'), ('alonso', '1:30.000')]])),
+                race_table(race(1, [[('hamilton', '1:29.500')]])),
+            ],
+            '/api/f1/2023/2/laps.json': race_table(race(2, [[('hamilton', '1:32.000')]])),
+        }
+        url = "http://ergast.com/api/f1/2023/laps.json"
+        expected = LapTimesTransformer(fetcher=StubFetcher(routes)).transform(url)
+        df = asyncio.run(LapTimesTransformer(async_fetcher=AsyncStubFetcher(routes)).atransform(url))
+        pd.testing.assert_frame_equal(df, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import contextlib
+import io
+import logging
+import os
+import unittest
+from unittest import mock
+
+from a1_query.models import QueryParameters
+from a1_query.url_builder import ErgastURLBuilder
+from log_config import PIPELINE_LOGGERS, configure_logging, parse_levels
+
+
+class CapturingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.DEBUG)
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class TestLogConfig(unittest.TestCase):
+    def setUp(self):
+        self.handler = CapturingHandler()
+        logging.getLogger().addHandler(self.handler)
+
+    def tearDown(self):
+        logging.getLogger().removeHandler(self.handler)
+        for name in (*PIPELINE_LOGGERS, "a2_transform.fetcher"):
+            logging.getLogger(name).setLevel(logging.NOTSET)
+
+    def build_qualifying(self):
+        params = QueryParameters(
+            primary_entity="driver",
+            entity_ids={"drivers": ["hamilton"]},
+            metrics=["qualifying"],
+            time_scope={"years": [2023]},
+        )
+        return ErgastURLBuilder().build_endpoints(params)
+
+    def test_parse_levels(self):
+        self.assertEqual(parse_levels("a1_query=DEBUG, processor=warning,"),
+                         {"a1_query": logging.DEBUG, "processor": logging.WARNING})
+        with self.assertRaises(ValueError):
+            parse_levels("a1_query=LOUD")
+
+    def test_quiet_mode_is_silent_on_the_hot_path(self):
+        configure_logging("quiet")
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            self.build_qualifying()
+        self.assertEqual(stdout.getvalue(), "")
+        self.assertEqual(self.handler.records, [])
+
+    def test_debug_mode_restores_detail(self):
+        configure_logging("debug")
+        self.build_qualifying()
+        messages = [r.getMessage() for r in self.handler.records]
+        self.assertIn("Mapped driver ID hamilton -> hamilton", messages)
+
+    def test_per_module_overrides(self):
+        with mock.patch.dict(os.environ, {"F1_LOG_LEVELS": "a2_transform.fetcher=DEBUG"}):
+            level = configure_logging("quiet", levels={"a1_query": "INFO"})
+        self.assertEqual(level, logging.WARNING)
+        self.assertEqual(logging.getLogger("a2_transform.fetcher").level, logging.DEBUG)
+        self.assertEqual(logging.getLogger("a2_transform").level, logging.WARNING)
+        self.assertEqual(logging.getLogger("a1_query").level, logging.INFO)
+
+    def test_mode_from_environment(self):
+        with mock.patch.dict(os.environ, {"F1_LOG_MODE": "debug"}):
+            self.assertEqual(configure_logging(), logging.DEBUG)
+        with self.assertRaises(ValueError):
+            configure_logging("verbose")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import asyncio
+import datetime
+import time
+import unittest
+from unittest import mock
+
+import requests
+
+from a1_query.models import QueryParameters
+from a1_query.url_builder import ErgastURLBuilder
+from a2_transform import AsyncErgastFetcher, ErgastFetcher
+from api.endpoint import Endpoint, get_base_url, set_base_url
+from mock_ergast import MockErgastServer
+
+TODAY = datetime.date(2024, 12, 31)
+
+
+class TestMockErgastServer(unittest.TestCase):
+    def setUp(self):
+        self.server = MockErgastServer(today=TODAY, seed=1).start()
+        self.addCleanup(self.server.stop)
+
+    def test_pages_through_a_season(self):
+        fetcher = ErgastFetcher()
+        url = f"{self.server.base_url}/2023/results.json"
+        pages = list(fetcher.iter_pages(url, page_size=200))
+        self.assertEqual([len(p["MRData"]["RaceTable"]["Races"]) for p in pages][:1], [10])
+        rows = sum(len(race["Results"]) for p in pages for race in p["MRData"]["RaceTable"]["Races"])
+        self.assertEqual(rows, 440)
+        self.assertEqual(self.server.stats()["served"], 3)
+
+    def test_unknown_routes_are_404(self):
+        response = requests.get(f"{self.server.base_url}/2023/fastestLaps.json")
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(requests.get(f"{self.server.base_url}/2023/driverStandingsByRound.json").status_code, 404)
+        self.assertEqual(requests.get(f"{self.server.base_url}/2023/1/laps.json").status_code, 200)
+
+    def test_base_url_flows_through_the_builder(self):
+        set_base_url(self.server.base_url)
+        self.addCleanup(set_base_url, None)
+        params = QueryParameters(primary_entity="driver", metrics=["standings"], time_scope={"years": [2023]})
+        endpoints = ErgastURLBuilder().build_endpoints(params)
+        self.assertTrue(endpoints)
+        self.assertTrue(all(e.url.startswith(self.server.base_url) for e in endpoints))
+        self.assertEqual(Endpoint(kind="status", season=2023).base_url, get_base_url())
+        self.assertTrue(ErgastURLBuilder.validator.validate(endpoints[0].url))
+
+        data = ErgastFetcher().get_json(endpoints[0].url)
+        self.assertEqual(data["MRData"]["total"], "20")
+
+
+class TestFaultInjection(unittest.TestCase):
+    def test_retries_absorb_injected_errors(self):
+        with MockErgastServer(today=TODAY, error_rate=0.3, error_statuses=(503,), seed=7) as server:
+            fetcher = ErgastFetcher(retries=8, backoff_factor=0.001)
+            for round_num in range(1, 11):
+                fetcher.get_json(f"{server.base_url}/2023/{round_num}/results.json")
+            stats = server.stats()
+            self.assertGreater(stats["injected_errors"], 0)
+            self.assertEqual(stats["served"], 10)
+            self.assertEqual(fetcher.stats()["retries"], stats["injected_errors"])
+
+    def test_latency_is_injected_for_async_clients(self):
+        with MockErgastServer(today=TODAY, latency=0.05) as server:
+            fetcher = AsyncErgastFetcher()
+            intervals = []
+            respond = server.respond
+
+            def timed_respond(url):
+                start = time.perf_counter()
+                try:
+                    return respond(url)
+                finally:
+                    intervals.append((start, time.perf_counter()))
+
+            async def fetch_all():
+                try:
+                    # Client startup and the first connection stay out of the measurement
+                    await fetcher.get_json(f"{server.base_url}/2023/races.json")
+                    intervals.clear()
+                    start = time.perf_counter()
+                    pages = await asyncio.gather(*(
+                        fetcher.get_json(f"{server.base_url}/2023/{r}/qualifying.json") for r in range(1, 9)
+                    ))
+                    return pages, time.perf_counter() - start
+                finally:
+                    await fetcher.aclose()
+
+            with mock.patch.object(server, 'respond', side_effect=timed_respond):
+                pages, wall = asyncio.run(fetch_all())
+            self.assertEqual(len(pages), 8)
+            # concurrent requests overlap their injected delays on the server instead of queueing
+            first_done = min(end for _, end in intervals)
+            self.assertGreater(sum(start < first_done for start, _ in intervals), 1)
+            self.assertLess(wall, 0.05 * 8 * 0.75)
+            self.assertGreaterEqual(min(m.elapsed for m in fetcher.recent()), 0.05)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,198 @@
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+import processor
+from processor import F1QueryProcessor
+
+
+class SlowTransformer:
+    """Sleeps per endpoint and records peak concurrency per host"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def load(self, endpoint) -> pd.DataFrame:
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        return pd.DataFrame([{'endpoint': str(endpoint)}])
+
+
+class TestParallelExecution(unittest.TestCase):
+    def setUp(self):
+        self.endpoints = [
+            f"http://ergast.com/api/f1/{year}/drivers/hamilton/results.json"
+            for year in range(2015, 2023)
+        ]
+        self.transformer = SlowTransformer(delay=0.05)
+
+    def _execute(self, proc: F1QueryProcessor):
+        with mock.patch.object(processor, 'process_query', return_value=self.endpoints), \
+             mock.patch.object(proc.validator, 'validate', return_value=True), \
+             mock.patch.dict(proc.router.kind_map, {'results': self.transformer}):
+            return proc.execute_query("Hamilton's results since 2015")
+
+    def test_parallel_keeps_endpoint_order(self):
+        results = self._execute(F1QueryProcessor(parallel=True, max_workers=8, max_per_host=8))
+        self.assertEqual([df['endpoint'].iloc[0] for df in results], self.endpoints)
+
+    def test_parallel_caps_concurrency_per_host(self):
+        start = time.perf_counter()
+        self._execute(F1QueryProcessor(parallel=True, max_workers=8, max_per_host=2))
+        elapsed = time.perf_counter() - start
+        self.assertEqual(self.transformer.peak, 2)
+        self.assertLess(elapsed, len(self.endpoints) * self.transformer.delay)
+
+    def test_sequential_mode_runs_one_at_a_time(self):
+        self._execute(F1QueryProcessor(parallel=False))
+        self.assertEqual(self.transformer.peak, 1)
+
+
+    def test_execute_sql_over_fetched_tables(self):
+        proc = F1QueryProcessor(parallel=True)
+        seasons = [int(e.split('/')[5]) for e in self.endpoints]
+        points = StubResults()
+        with mock.patch.object(processor, 'process_query', return_value=self.endpoints), \
+             mock.patch.object(proc.validator, 'validate', return_value=True), \
+             mock.patch.dict(proc.router.kind_map, {'results': points}):
+            df = proc.execute_sql("Hamilton's points by season",
+                                  "SELECT season, SUM(points) AS points FROM results GROUP BY season ORDER BY season")
+        self.assertEqual(df['season'].tolist(), seasons)
+        self.assertEqual(df['points'].tolist(), [25.0] * len(seasons))
+
+
+class VariableDelayTransformer:
+    """First endpoint is slow, the rest are fast"""
+
+    def load(self, endpoint) -> pd.DataFrame:
+        time.sleep(0.3 if endpoint.season == 2015 else 0.01)
+        if endpoint.season == 2016:
+            raise RuntimeError("boom")
+        return pd.DataFrame([{'season': endpoint.season}])
+
+    async def aload(self, endpoint) -> pd.DataFrame:
+        await asyncio.sleep(0.3 if endpoint.season == 2015 else 0.01)
+        if endpoint.season == 2016:
+            raise RuntimeError("boom")
+        return pd.DataFrame([{'season': endpoint.season}])
+
+
+class TestStreaming(unittest.TestCase):
+    def setUp(self):
+        self.endpoints = [
+            f"http://ergast.com/api/f1/{year}/drivers/hamilton/results.json"
+            for year in range(2015, 2019)
+        ]
+
+    def _patched(self, proc):
+        return mock.patch.object(processor, 'process_query', return_value=self.endpoints), \
+            mock.patch.dict(proc.router.kind_map, {'results': VariableDelayTransformer()})
+
+    def _apatched(self, proc):
+        return mock.patch.object(processor, 'aprocess_query', mock.AsyncMock(return_value=self.endpoints)), \
+            mock.patch.dict(proc.router.kind_map, {'results': VariableDelayTransformer()})
+
+    def test_iter_query_yields_fast_results_first(self):
+        proc = F1QueryProcessor(parallel=True, max_per_host=8)
+        patch_query, patch_router = self._patched(proc)
+        start = time.perf_counter()
+        with patch_query, patch_router:
+            stream = proc.iter_query("Hamilton's results")
+            first = next(stream)
+            first_latency = time.perf_counter() - start
+            rest = list(stream)
+        self.assertLess(first_latency, 0.2)
+        self.assertNotEqual(first.index, 0)
+        results = sorted([first] + rest, key=lambda r: r.index)
+        self.assertEqual([r.endpoint.season for r in results], [2015, 2016, 2017, 2018])
+        self.assertGreater(results[0].elapsed, 0.25)
+        self.assertEqual(results[1].error, "boom")
+        self.assertTrue(results[1].data.empty)
+
+    def test_execute_query_keeps_plan_order_despite_failures(self):
+        proc = F1QueryProcessor(parallel=True, max_per_host=8)
+        patch_query, patch_router = self._patched(proc)
+        with patch_query, patch_router:
+            results = proc.execute_query("Hamilton's results")
+        self.assertEqual([df['season'].iloc[0] if not df.empty else None for df in results],
+                         [2015, None, 2017, 2018])
+
+    def test_aiter_query(self):
+        proc = F1QueryProcessor(parallel=True, max_per_host=8)
+        patch_query, patch_router = self._apatched(proc)
+
+        async def collect():
+            return [result async for result in proc.aiter_query("Hamilton's results")]
+
+        with patch_query, patch_router:
+            results = asyncio.run(collect())
+        self.assertEqual(results[-1].index, 0)
+        self.assertEqual(sorted(r.index for r in results), [0, 1, 2, 3])
+        self.assertEqual(results[0].error if results[0].index == 1 else results[1].error, "boom")
+
+    def test_concurrent_async_queries_share_one_loop(self):
+        proc = F1QueryProcessor(parallel=True, max_per_host=8)
+        patch_query, patch_router = self._apatched(proc)
+
+        async def run_all():
+            return await asyncio.gather(*(proc.aexecute_query("Hamilton's results") for _ in range(10)))
+
+        start = time.perf_counter()
+        with patch_query, patch_router:
+            all_results = asyncio.run(run_all())
+        # Ten queries overlap on one thread: about one slow endpoint's latency, not ten
+        self.assertLess(time.perf_counter() - start, 1.5)
+        for results in all_results:
+            self.assertEqual([df['season'].iloc[0] if not df.empty else None for df in results],
+                             [2015, None, 2017, 2018])
+
+
+class TestProfiling(unittest.TestCase):
+    def test_profile_records_a_trace_per_query(self):
+        endpoints = [f"http://ergast.com/api/f1/{year}/drivers/hamilton/results.json" for year in (2015, 2016)]
+        with tempfile.TemporaryDirectory() as tmp:
+            trace_file = os.path.join(tmp, "trace.jsonl")
+            proc = F1QueryProcessor(parallel=True, trace_file=trace_file)
+            with mock.patch.object(processor, 'process_query', return_value=endpoints), \
+                 mock.patch.dict(proc.router.kind_map, {'results': StubResults()}):
+                proc.execute_query("Hamilton's results")
+            with open(trace_file) as f:
+                records = [json.loads(line) for line in f]
+
+        summary = proc.last_trace.summary().set_index("stage")
+        self.assertEqual(summary.loc["validate", "calls"], 2)
+        self.assertEqual(summary.loc["route", "calls"], 1)
+        self.assertEqual(len(records), len(proc.last_trace.spans))
+        self.assertEqual({r["trace_id"] for r in records}, {proc.last_trace.trace_id})
+
+    def test_no_trace_without_profile(self):
+        proc = F1QueryProcessor()
+        with mock.patch.object(processor, 'process_query', return_value=[]):
+            proc.execute_query("nothing")
+        self.assertIsNone(proc.last_trace)
+
+
+class StubResults:
+    """One Hamilton win per season endpoint"""
+
+    def load(self, endpoint) -> pd.DataFrame:
+        return pd.DataFrame([{'season': str(endpoint.season), 'race_id': '1',
+                              'driver_id': 'hamilton', 'points': 25.0}])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from a1_query import query_to_endpoint
+from a1_query.models import QueryParameters
+from a1_query.query_cache import QueryCache, normalize_query
+
+PARAMS = QueryParameters(
+    primary_entity="driver",
+    entity_ids={"drivers": ["hamilton"]},
+    metrics=["results"],
+    time_scope={"years": [2023]},
+)
+
+
+class TestQueryCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "queries.json"
+        self.cache = QueryCache(self.path, max_entries=2)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_normalizes_case_whitespace_and_aliases(self):
+        self.assertEqual(
+            normalize_query("  Show me Lewis Hamilton's   2023 race results? "),
+            "show me hamilton 2023 race results",
+        )
+        self.assertEqual(normalize_query("Carlos Sainz Jr wins"), "sainz wins")
+
+    def test_ranges_and_lists_keep_distinct_keys(self):
+        keys = {
+            query: normalize_query(query)
+            for query in ("Hamilton results 2019-2023", "Hamilton results 2019 – 2023",
+                          "Hamilton results 2019, 2023", "Hamilton results 2019 & 2023")
+        }
+        self.assertEqual(keys["Hamilton results 2019-2023"], "hamilton results 2019 to 2023")
+        self.assertEqual(keys["Hamilton results 2019 – 2023"], keys["Hamilton results 2019-2023"])
+        self.assertEqual(keys["Hamilton results 2019, 2023"], "hamilton results 2019 and 2023")
+        self.assertEqual(keys["Hamilton results 2019 & 2023"], keys["Hamilton results 2019, 2023"])
+
+    def test_equivalent_queries_share_an_entry(self):
+        self.cache.put("Show me Lewis Hamilton's 2023 race results", PARAMS)
+        self.assertEqual(self.cache.get("show me hamilton 2023 race results"), PARAMS)
+        self.assertEqual(self.cache.get("Show me Lewis Hamilton's 2023 race results"), PARAMS)
+        stats = self.cache.stats()
+        self.assertEqual((stats["normalized_hits"], stats["exact_hits"]), (1, 1))
+
+    def test_evicts_least_recently_used(self):
+        self.cache.put("a", PARAMS)
+        self.cache.put("b", PARAMS)
+        self.cache.get("a")
+        self.cache.put("c", PARAMS)
+        self.assertIsNone(self.cache.get("b"))
+        self.assertIsNotNone(self.cache.get("a"))
+
+    def test_persists_across_instances(self):
+        self.cache.put("Hamilton 2023 results", PARAMS)
+        self.assertEqual(QueryCache(self.path).get("hamilton 2023 results"), PARAMS)
+
+    def test_process_query_skips_agent_on_hit(self):
+        with mock.patch.object(query_to_endpoint, "query_cache", self.cache), \
+             mock.patch.object(query_to_endpoint.understanding_agents, "acquire") as acquire:
+            self.cache.put("Hamilton 2023 results", PARAMS)
+            endpoints = query_to_endpoint.process_query("hamilton 2023 results")
+        acquire.assert_not_called()
+        self.assertEqual([str(e) for e in endpoints], ["http://ergast.com/api/f1/2023/drivers/hamilton/results.json"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import unittest
+
+from a2_transform import EndpointRouter
+from a2_transform.transformers import (
+    EntityListTransformer,
+    LapTimesTransformer,
+    PitStopsTransformer,
+    RaceResultsTransformer,
+    StandingsTransformer,
+    StatusTransformer,
+    TRANSFORMER_REGISTRY,
+    register_transformer,
+)
+from a2_transform.transformers.base import BaseTransformer
+from api.endpoint import Endpoint
+
+BASE = "http://ergast.com/api/f1"
+
+
+class TestEndpointRouter(unittest.TestCase):
+    def setUp(self):
+        self.router = EndpointRouter()
+
+    def test_dispatch_by_kind(self):
+        cases = {
+            f"{BASE}/2023/drivers/hamilton/results.json": RaceResultsTransformer,
+            f"{BASE}/2023/sprint.json": RaceResultsTransformer,
+            f"{BASE}/2023/driverStandings.json": StandingsTransformer,
+            f"{BASE}/2023/constructorStandings.json": StandingsTransformer,
+            f"{BASE}/2023/5/laps.json": LapTimesTransformer,
+            f"{BASE}/2023/5/laps/10.json": LapTimesTransformer,
+            f"{BASE}/2023/status.json": StatusTransformer,
+            f"{BASE}/2023/5/pitstops.json": PitStopsTransformer,
+            f"{BASE}/2023/drivers.json": EntityListTransformer,
+            f"{BASE}/2023/constructors.json": EntityListTransformer,
+        }
+        for url, cls in cases.items():
+            with self.subTest(url=url):
+                self.assertIsInstance(self.router.get_transformer(url), cls)
+        self.assertIsNone(self.router.get_transformer(f"{BASE}/2023/weather.json"))
+
+    def test_one_instance_per_transformer_class(self):
+        self.assertIs(
+            self.router.kind_map['driverStandings'],
+            self.router.kind_map['constructorStandings'],
+        )
+
+    def test_route_all_keeps_order(self):
+        urls = [f"{BASE}/2023/status.json", f"{BASE}/2023/weather.json", f"{BASE}/2023/results.json"]
+        routed = self.router.route_all(urls)
+        self.assertEqual([str(e) for e, _ in routed], urls)
+        self.assertTrue(all(isinstance(e, Endpoint) for e, _ in routed))
+        self.assertEqual(
+            [type(t) if t else None for _, t in routed],
+            [StatusTransformer, None, RaceResultsTransformer],
+        )
+
+    def test_register_on_router_instance(self):
+        transformer = BaseTransformer()
+        self.router.register('seasons', transformer)
+        self.assertIs(self.router.get_transformer(f"{BASE}/seasons.json"), transformer)
+        self.assertNotIn('seasons', EndpointRouter().kind_map)
+
+    def test_registry_rejects_conflicting_kinds(self):
+        with self.assertRaises(ValueError):
+            @register_transformer('results')
+            class Duplicate(BaseTransformer):
+                pass
+        self.assertIs(TRANSFORMER_REGISTRY['results'], RaceResultsTransformer)
+
+
+class StubFetcher:
+    """Returns one canned payload for every URL"""
+
+    def __init__(self, payload):
+        self.payload = payload
+        self.urls = []
+
+    def get_json(self, url, params=None):
+        self.urls.append(url)
+        return self.payload
+
+
+class TestNewTransformers(unittest.TestCase):
+    def test_pitstops(self):
+        payload = {'MRData': {'RaceTable': {'Races': [{
+            'season': '2023', 'round': '5', 'raceName': 'Miami Grand Prix',
+            'Circuit': {'circuitId': 'miami'},
+            'PitStops': [{'driverId': 'hamilton', 'stop': '1', 'lap': '20', 'time': '16:40:00', 'duration': '22.5'}],
+        }]}}}
+        transformer = PitStopsTransformer(fetcher=StubFetcher(payload))
+        df = transformer.transform(f"{BASE}/2023/5/pitstops.json")
+        self.assertEqual(df.loc[0, 'driver_id'], 'hamilton')
+        self.assertEqual(df.loc[0, 'duration'], 22.5)
+
+    def test_sprint_results(self):
+        payload = {'MRData': {'RaceTable': {'Races': [{
+            'season': '2023', 'round': '4',
+            'SprintResults': [{'Driver': {'driverId': 'max_verstappen'}, 'position': '1', 'points': '8'}],
+        }]}}}
+        fetcher = StubFetcher(payload)
+        df = RaceResultsTransformer(fetcher=fetcher).transform(f"{BASE}/2023/4/sprint.json")
+        self.assertEqual(fetcher.urls, [f"{BASE}/2023/4/sprint.json?limit=1000"])
+        self.assertEqual(df['driver_id'].tolist(), ['max_verstappen'])
+        self.assertEqual(df['points'].tolist(), [8.0])
+
+    def test_drivers_listing(self):
+        payload = {'MRData': {'DriverTable': {'season': '2023', 'Drivers': [
+            {'driverId': 'alonso', 'givenName': 'Fernando', 'familyName': 'Alonso'},
+        ]}}}
+        transformer = EntityListTransformer(fetcher=StubFetcher(payload))
+        df = transformer.transform(f"{BASE}/2023/drivers.json")
+        self.assertEqual(df[['season', 'driver_id', 'driver_name']].values.tolist(),
+                         [[2023, 'alonso', 'Fernando Alonso']])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+from unittest import mock
+
+from a1_query import query_to_endpoint
+from a1_query.models import QueryParameters
+from a1_query.rule_parser import RuleBasedQueryParser
+
+
+class TestRuleBasedQueryParser(unittest.TestCase):
+    def setUp(self):
+        self.parser = RuleBasedQueryParser(current_year=2024)
+
+    def test_driver_results_in_year(self):
+        params = self.parser.parse_confident("How many races has Verstappen won in 2023?")
+        self.assertEqual(params.primary_entity, "driver")
+        self.assertEqual(params.entity_ids, {"drivers": ["max_verstappen"]})
+        self.assertEqual(params.metrics, ["results"])
+        self.assertEqual(params.time_scope, {"years": [2023]})
+
+    def test_comparison_and_relative_time(self):
+        params = self.parser.parse_confident(
+            "How does Lewis Hamilton compare to Charles Leclerc in terms of wins, podiums, and points over the last 5 seasons?"
+        )
+        self.assertEqual(params.entity_ids, {"drivers": ["hamilton", "leclerc"]})
+        self.assertTrue(params.comparison)
+        self.assertEqual(params.time_scope, {"last": 5})
+
+    def test_constructor_range_and_season_standings(self):
+        params = self.parser.parse_confident("What are Red Bull's podium finishes from 2010 to 2023?")
+        self.assertEqual(params.entity_ids, {"constructors": ["red_bull"]})
+        self.assertEqual(params.time_scope, {"range": [2010, 2023]})
+        params = self.parser.parse_confident("Who leads the driver standings in 2023?")
+        self.assertEqual((params.primary_entity, params.metrics), ("season", ["standings"]))
+
+    def test_accented_names(self):
+        params, _ = self.parser.parse("Compare Leclerc and Pérez's DNFs in 2023.")
+        self.assertEqual(params.entity_ids, {"drivers": ["leclerc", "perez"]})
+        self.assertEqual(params.metrics, ["status"])
+
+    def test_low_confidence_for_ambiguous_queries(self):
+        self.assertIsNone(self.parser.parse_confident("Which driver performs best in the rain?"))
+        self.assertIsNone(self.parser.parse_confident(
+            "How does Lando Norris perform in wet vs. dry conditions (wins, DNFs, lap times)?"
+        ))
+
+    def test_undated_queries_fall_back_to_agent(self):
+        for query in (
+            "How often does Fernando Alonso finish in the top 5 after starting outside the top 10?",
+            "Compare Verstappen and Hamilton in terms of race wins and fastest laps.",
+            "Lewis Hamilton results",
+        ):
+            with self.subTest(query=query):
+                params, confidence = self.parser.parse(query)
+                self.assertIsNotNone(params)
+                self.assertLess(confidence, self.parser.CONFIDENCE_THRESHOLD)
+                self.assertIsNone(self.parser.parse_confident(query))
+
+    def test_named_seasons_count_as_dated(self):
+        params = self.parser.parse_confident("Lewis Hamilton results this season")
+        self.assertEqual(params.time_scope, {"years": [2024]})
+        params = self.parser.parse_confident("Lewis Hamilton results last season")
+        self.assertEqual(params.time_scope, {"years": [2023]})
+
+    def test_process_query_bypasses_agent(self):
+        with mock.patch.object(query_to_endpoint.query_cache, "get", return_value=None), \
+             mock.patch.object(query_to_endpoint.understanding_agents, "acquire") as acquire:
+            endpoints = query_to_endpoint.process_query("Show me Lewis Hamilton's race results in 2023")
+        acquire.assert_not_called()
+        self.assertEqual([str(e) for e in endpoints], ["http://ergast.com/api/f1/2023/drivers/hamilton/results.json"])
+
+
+    def test_current_year_is_pinned_for_parser_and_builder(self):
+        query_to_endpoint.set_current_year(2022)
+        self.addCleanup(query_to_endpoint.set_current_year, None)
+        with mock.patch.object(query_to_endpoint.query_cache, "get", return_value=None):
+            endpoints = query_to_endpoint.process_query("Lewis Hamilton results this season")
+            self.assertEqual([str(e) for e in endpoints], ["http://ergast.com/api/f1/2022/drivers/hamilton/results.json"])
+            params = QueryParameters(primary_entity="driver", metrics=["standings"], time_scope={"last": 1})
+            self.assertEqual([e.season for e in query_to_endpoint._build_endpoints("q", params)], [2022])
+
+
+if __name__ == '__main__':
+    unittest.main()
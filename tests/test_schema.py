@@ -0,0 +1,58 @@
+import datetime
+import math
+import unittest
+
+import pandas as pd
+
+from a2_transform.schema import apply_schema
+from a2_transform.transformers.qualifying import QualifyingTransformer
+from ergast_fixtures import ReplayFetcher
+
+QUALIFYING = "http://ergast.com/api/f1/2023/qualifying.json"
+
+
+class TestApplySchema(unittest.TestCase):
+    def test_types_by_column_name(self):
+        df = apply_schema(pd.DataFrame({
+            'season': ['2023', '2023'],
+            'round': ['1', ''],
+            'points': ['25', '18.5'],
+            'driver_id': ['hamilton', 'alonso'],
+            'q1_time': ['1:31.295', ''],
+            'url': ['a', 'b'],
+        }))
+        self.assertEqual(str(df['season'].dtype), 'Int64')
+        self.assertTrue(pd.isna(df['round'][1]))
+        self.assertEqual(df['points'].tolist(), [25.0, 18.5])
+        self.assertIsInstance(df['driver_id'].dtype, pd.CategoricalDtype)
+        self.assertAlmostEqual(df['q1_time'][0], 91.295)
+        self.assertTrue(math.isnan(df['q1_time'][1]))
+        self.assertEqual(df['url'].tolist(), ['a', 'b'])
+
+    def test_pit_stops_over_a_minute(self):
+        df = apply_schema(pd.DataFrame({'stop': ['1', '2', '3'], 'duration': ['22.798', '1:02.345', '33:20.123']}))
+        self.assertEqual(df['duration'].dtype, 'float64')
+        self.assertEqual(df['duration'].round(3).tolist(), [22.798, 62.345, 2000.123])
+
+    def test_typed_frames_are_returned_unchanged(self):
+        df = apply_schema(pd.DataFrame({'season': ['2023'], 'status': ['Finished'], 'is_dnf': [False]}))
+        self.assertIs(apply_schema(df), df)
+        self.assertIs(apply_schema(pd.DataFrame()).empty, True)
+
+
+class TestTransformerOutput(unittest.TestCase):
+    def test_qualifying_is_typed_and_smaller(self):
+        transformer = QualifyingTransformer(fetcher=ReplayFetcher(today=datetime.date(2024, 12, 31)))
+        df = transformer.transform(QUALIFYING)
+        self.assertEqual(len(df), 440)
+        self.assertEqual(str(df['position'].dtype), 'Int64')
+        self.assertEqual(df['q1_time'].dtype, 'float64')
+        self.assertIsInstance(df['constructor_name'].dtype, pd.CategoricalDtype)
+
+        # Every value as the string Ergast sent
+        raw = df.astype(str).astype(object)
+        self.assertLess(df.memory_usage(deep=True).sum() * 2, raw.memory_usage(deep=True).sum())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+import pandas as pd
+
+import processor
+from a1_query import query_to_endpoint
+from a1_query.models import SQLPlan
+from a2_transform.sql import F1SQLEngine, TABLE_SCHEMAS, conform, describe_tables
+from api.endpoint import Endpoint
+from processor import F1QueryProcessor
+
+BASE = "http://ergast.com/api/f1"
+
+RESULTS = pd.DataFrame({
+    'race_id': ['1', '1', '2', '2'],
+    'season': ['2023'] * 4,
+    'driver_id': ['max_verstappen', 'perez', 'perez', 'max_verstappen'],
+    'constructor_id': ['red_bull'] * 4,
+    'position': [1, 2, 1, 2],
+    'points': [25.0, 18.0, 25.0, 18.0],
+})
+QUALIFYING = pd.DataFrame({
+    'season': ['2023'] * 4,
+    'round': ['1', '1', '2', '2'],
+    'driver_id': ['max_verstappen', 'perez', 'perez', 'max_verstappen'],
+    'position': ['1', '2', '1', '9'],
+    'q1_time': ['1:31.295', '1:31.479', '1:28.990', ''],
+})
+
+JOIN = """
+    SELECT r.driver_id, AVG(q.position) AS avg_grid, SUM(r.points) AS points
+    FROM results r JOIN qualifying q USING (season, round, driver_id)
+    GROUP BY r.driver_id ORDER BY points DESC, r.driver_id
+"""
+
+
+class SQLEngineTests:
+    backend = None
+
+    def setUp(self):
+        self.engine = F1SQLEngine(self.backend)
+
+    def tearDown(self):
+        self.engine.close()
+
+    def test_tables_exist_before_any_data(self):
+        tables = self.engine.tables()
+        self.assertEqual(set(tables), {s.name for s in TABLE_SCHEMAS.values()})
+        self.assertEqual(self.engine.query("SELECT COUNT(*) AS n FROM results")['n'].tolist(), [0])
+
+    def test_join_results_and_qualifying(self):
+        self.engine.register_all([
+            (f"{BASE}/2023/results.json", RESULTS),
+            (Endpoint(kind='qualifying', season=2023), QUALIFYING),
+        ])
+        df = self.engine.query(JOIN)
+        self.assertEqual(df.values.tolist(), [['max_verstappen', 5.0, 43.0], ['perez', 1.5, 43.0]])
+
+    def test_overlapping_endpoints_do_not_duplicate_rows(self):
+        self.engine.register('results', RESULTS)
+        self.engine.register('results', RESULTS[RESULTS['driver_id'] == 'perez'])
+        self.assertEqual(self.engine.tables()['results'], 4)
+
+    def test_parameters(self):
+        self.engine.register('results', RESULTS)
+        df = self.engine.query("SELECT SUM(points) AS points FROM results WHERE driver_id = ?", ['perez'])
+        self.assertEqual(df['points'].tolist(), [43.0])
+
+    def test_only_single_selects_run(self):
+        for sql in ("COPY (SELECT 1) TO '/tmp/f1_copy.csv'", "SELECT 1; DROP TABLE results",
+                    "ATTACH ':memory:' AS other", "PRAGMA writable_schema = 1", "DELETE FROM results"):
+            with self.subTest(sql=sql), self.assertRaises(ValueError):
+                self.engine.query(sql)
+        self.assertEqual(self.engine.query("-- totals\nSELECT COUNT(*) AS n FROM results;")['n'].tolist(), [0])
+
+    def test_statements_cannot_write(self):
+        self.engine.register('results', RESULTS)
+        with self.assertRaises(Exception):
+            self.engine.query("WITH t AS (SELECT 1) INSERT INTO results (season) SELECT 2024 FROM t")
+        self.assertEqual(self.engine.query("SELECT COUNT(*) AS n FROM results")['n'].tolist(), [4])
+        self.engine.register('results', RESULTS)  # registering still works after a denied statement
+
+
+class TestSQLiteEngine(SQLEngineTests, unittest.TestCase):
+    backend = 'sqlite'
+
+
+try:
+    import duckdb  # noqa: F401
+except ImportError:
+    duckdb = None
+
+
+@unittest.skipIf(duckdb is None, "duckdb not installed")
+class TestDuckDBEngine(SQLEngineTests, unittest.TestCase):
+    backend = 'duckdb'
+
+    def test_no_file_access(self):
+        with self.assertRaises(duckdb.PermissionException):
+            self.engine.query("SELECT * FROM read_text('/etc/hostname')")
+
+
+class TestConform(unittest.TestCase):
+    def test_stable_columns_and_types(self):
+        df = conform(RESULTS, TABLE_SCHEMAS['results'])
+        self.assertEqual(df.columns.tolist(), TABLE_SCHEMAS['results'].column_names)
+        self.assertEqual(df['round'].tolist(), [1, 1, 2, 2])
+        self.assertTrue(df['grid'].isna().all())
+
+
+class TestPlannedSQL(unittest.TestCase):
+    def test_describe_tables(self):
+        self.assertEqual(describe_tables(['status']),
+                         "status(season INTEGER, status_id INTEGER, status TEXT, count INTEGER, is_dnf BOOLEAN)")
+        self.assertEqual(len(describe_tables().splitlines()), len(TABLE_SCHEMAS))
+
+    def test_sql_agent_sees_the_loaded_tables(self):
+        agent = mock.Mock()
+        agent.run.return_value = SimpleNamespace(content=SQLPlan(sql=JOIN))
+        with mock.patch.object(query_to_endpoint.sql_agents, 'acquire') as acquire:
+            acquire.return_value.__enter__.return_value = agent
+            sql = query_to_endpoint.process_sql("q", {'results': 4, 'qualifying': 4, 'status': 0})
+        self.assertEqual(sql, JOIN)
+        prompt = agent.run.call_args.args[0]
+        self.assertIn(describe_tables(['results', 'qualifying']), prompt)
+        self.assertNotIn("status(", prompt)
+
+    def test_execute_sql_without_sql_uses_the_planner(self):
+        proc = F1QueryProcessor()
+        loaded = [(f"{BASE}/2023/results.json", RESULTS), (Endpoint(kind='qualifying', season=2023), QUALIFYING)]
+        with mock.patch.object(proc, 'execute_endpoints', return_value=loaded), \
+                mock.patch.object(processor, 'process_sql', return_value=JOIN) as plan:
+            df = proc.execute_sql("Average grid and points per Red Bull driver in 2023")
+        self.assertEqual(df.values.tolist(), [['max_verstappen', 5.0, 43.0], ['perez', 1.5, 43.0]])
+        self.assertEqual(plan.call_args.args[1]['results'], 4)
+
+        with mock.patch.object(proc, 'execute_endpoints', return_value=loaded), \
+                mock.patch.object(processor, 'process_sql', return_value=None):
+            self.assertTrue(proc.execute_sql("q").empty)
+
+
+if __name__ == '__main__':
+    unittest.main()
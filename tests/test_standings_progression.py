@@ -0,0 +1,106 @@
+import asyncio
+import datetime
+import tempfile
+import time
+import unittest
+
+from a1_query.models import QueryParameters
+from a1_query.rule_parser import RuleBasedQueryParser
+from a1_query.url_builder import ErgastURLBuilder
+from a2_transform import EndpointRouter, F1DataStore
+from a2_transform.filters import apply_local_filters
+from a2_transform.transformers.standings import StandingsTransformer
+from ergast_fixtures import ReplayFetcher
+from processor import F1QueryProcessor
+
+BASE = ErgastURLBuilder.BASE_URL
+
+
+class TestStandingsProgression(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.store = F1DataStore(self.tmp.name, current_year=2024)
+
+    def progression(self, today, **kwargs):
+        fetcher = ReplayFetcher(today=today, **kwargs)
+        df = StandingsTransformer(fetcher=fetcher, store=self.store).progression([2023, 2024])
+        return df, fetcher.stats()['requests']
+
+    def test_long_format_per_round(self):
+        df, requests = self.progression(datetime.date(2024, 4, 1))
+        rounds = df.groupby('season')['round'].agg(['min', 'max', 'nunique']).to_dict('index')
+        self.assertEqual(rounds, {2023: {'min': 1, 'max': 22, 'nunique': 22}, 2024: {'min': 1, 'max': 3, 'nunique': 3}})
+        self.assertEqual(len(df), 20 * 25)
+        self.assertEqual(requests, 25)
+        self.assertEqual(str(df['round'].dtype), 'Int64')
+
+        # Points never drop from one round to the next
+        points = df.pivot_table(index=['season', 'round'], columns='driver_id', values='points', observed=True)
+        self.assertTrue((points.loc[2023].diff().dropna() >= 0).all().all())
+
+    def test_matches_round_standings(self):
+        df, _ = self.progression(datetime.date(2024, 4, 1))
+        transformer = StandingsTransformer(fetcher=ReplayFetcher(today=datetime.date(2024, 4, 1)))
+        round_5 = transformer.transform("http://ergast.com/api/f1/2023/5/driverStandings.json")
+        stored = df[(df['season'] == 2023) & (df['round'] == 5)]
+        self.assertEqual(stored['driver_id'].tolist(), round_5['driver_id'].tolist())
+        self.assertEqual(stored['points'].tolist(), round_5['points'].tolist())
+
+    def test_incremental_fetches_only_new_rounds(self):
+        self.progression(datetime.date(2024, 4, 1))
+        df, requests = self.progression(datetime.date(2024, 6, 1))
+        # Two standings calls, then rounds 4..7 of 2024 (round 8 came with its standings call)
+        self.assertEqual(requests, 2 + 4)
+        self.assertEqual(df[df['season'] == 2024]['round'].nunique(), 8)
+        self.assertEqual(self.store.manifest('driverStandingsByRound', 2024)['rounds'], list(range(1, 9)))
+
+        _, requests = self.progression(datetime.date(2024, 6, 1))
+        self.assertEqual(requests, 2)
+
+    def test_rounds_are_fetched_concurrently(self):
+        fetcher = ReplayFetcher(today=datetime.date(2024, 12, 31), latency=0.02)
+        start = time.perf_counter()
+        df = StandingsTransformer(fetcher=fetcher).progression(2023, 'constructorStandings', incremental=False)
+        self.assertLess(time.perf_counter() - start, 0.02 * 22)
+        self.assertEqual(len(df), 10 * 22)
+
+
+class TestProgressionEndpoints(unittest.TestCase):
+    def test_query_to_planned_endpoint(self):
+        params = RuleBasedQueryParser(current_year=2024).parse_confident(
+            "Show Lewis Hamilton's championship points after each round in 2023"
+        )
+        self.assertIn("progression", params.metrics)
+        params = QueryParameters(primary_entity="constructor", metrics=["progression"], time_scope={"years": [2023]})
+        self.assertEqual([str(e) for e in ErgastURLBuilder().build_endpoints(params)],
+                         [f"{BASE}/2023/constructorStandingsByRound.json"])
+
+    def test_router_loads_the_progression(self):
+        params = QueryParameters(
+            primary_entity="driver", entity_ids={"drivers": ["hamilton"]}, metrics=["progression"],
+            time_scope={"years": [2023]},
+        )
+        endpoint, = ErgastURLBuilder().build_endpoints(params)
+        self.assertEqual(str(endpoint), f"{BASE}/2023/driverStandingsByRound.json?driver_id=hamilton")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            router = EndpointRouter(fetcher=ReplayFetcher(today=datetime.date(2024, 12, 31)), store=F1DataStore(tmp))
+            (_, transformer), = router.route_all([endpoint])
+            for df in (transformer.load(endpoint), asyncio.run(transformer.aload(endpoint))):
+                df = apply_local_filters(df, endpoint.filter_map)
+                self.assertEqual(df['driver_id'].unique().tolist(), ['hamilton'])
+                self.assertEqual(df['round'].tolist(), list(range(1, 23)))
+
+    def test_processor_routes_planner_kinds_without_url_validation(self):
+        endpoint, = ErgastURLBuilder().build_endpoints(QueryParameters(
+            primary_entity="driver", metrics=["progression"], time_scope={"years": [2023]},
+        ))
+        self.assertFalse(ErgastURLBuilder.validator.validate(endpoint))
+        (routed, transformer), = F1QueryProcessor()._route([endpoint])
+        self.assertEqual(routed, endpoint)
+        self.assertIsInstance(transformer, StandingsTransformer)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,158 @@
+import datetime
+import json
+import tempfile
+import unittest
+
+import pandas as pd
+
+from a2_transform import EndpointRouter, F1DataStore
+from a2_transform.transformers.laps import LapTimesTransformer
+from ingest import ingest, parse_seasons
+
+BASE = "http://ergast.com/api/f1"
+
+RESULTS = pd.DataFrame({
+    'race_id': ['1', '1', '2', '2', '10'],
+    'season': ['2021'] * 5,
+    'circuit_id': ['bahrain', 'bahrain', 'imola', 'imola', 'red_bull_ring'],
+    'driver_id': ['hamilton', 'max_verstappen', 'max_verstappen', 'hamilton', 'max_verstappen'],
+    'constructor_id': ['mercedes', 'red_bull', 'red_bull', 'mercedes', 'red_bull'],
+    'points': [25.0, 18.0, 25.0, 18.0, 26.0],
+})
+
+
+class ExplodingTransformer:
+    """Fails the test if the store falls back to the API"""
+
+    def transform(self, endpoint):
+        raise AssertionError(f"unexpected API fetch for {endpoint}")
+
+
+class TestF1DataStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = F1DataStore(self.tmp.name, current_year=2024)
+        self.store.write('results', 2021, RESULTS)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_partitions_by_round(self):
+        self.assertEqual(self.store.manifest('results', 2021)['rounds'], [1, 2, 10])
+        self.assertTrue(self.store.has('results', 2021))
+        self.assertTrue(self.store.has('results', 2021, 2))
+        self.assertFalse(self.store.has('results', 2021, 3))
+        self.assertFalse(self.store.has('results', 2020))
+
+    def test_append_keeps_stored_rounds(self):
+        self.store.write('results', 2021, RESULTS[RESULTS['race_id'] == '10'].assign(race_id='11'), append=True)
+        manifest = self.store.manifest('results', 2021)
+        self.assertEqual(manifest['rounds'], [1, 2, 10, 11])
+        self.assertEqual(manifest['rows'], 6)
+        self.assertEqual(len(self.store.read('results', [2021])), 6)
+
+    def test_read_pushes_down_filters_and_projection(self):
+        df = self.store.read('results', [2021], columns=['race_id', 'points'], filters={'driver_id': ['max_verstappen']})
+        self.assertEqual(df.columns.tolist(), ['race_id', 'points'])
+        self.assertEqual(df['race_id'].tolist(), ['1', '2', '10'])
+
+    def test_read_endpoint(self):
+        df = self.store.read_endpoint(f"{BASE}/2021/drivers/hamilton/results.json")
+        self.assertEqual(df['points'].tolist(), [25.0, 18.0])
+        df = self.store.read_endpoint(f"{BASE}/2021/2/results.json?driver_id=hamilton%2Cmax_verstappen")
+        self.assertEqual(len(df), 2)
+        df = self.store.read_endpoint(f"{BASE}/2021/circuits/imola/results.json")
+        self.assertEqual(set(df['circuit_id']), {'imola'})
+
+    def test_misses_fall_back(self):
+        self.assertIsNone(self.store.read_endpoint(f"{BASE}/2022/results.json"))
+        self.assertIsNone(self.store.read_endpoint(f"{BASE}/current/results.json"))
+        self.store.write('status', 2021, pd.DataFrame({'status': ['Finished'], 'count': [400]}))
+        # Status rows carry no constructor column, so the store cannot answer this
+        self.assertIsNone(self.store.read_endpoint(f"{BASE}/2021/constructors/ferrari/status.json"))
+        self.assertEqual(self.store.stats()['misses'], 3)
+
+    def test_current_season_goes_stale(self):
+        store = F1DataStore(self.tmp.name, current_season_ttl=60, current_year=2021)
+        self.assertTrue(store.has('results', 2021))
+        store.current_season_ttl = -1
+        self.assertFalse(store.has('results', 2021))
+        self.assertTrue(store.has('results', 2021, 1))
+
+    def test_season_synced_mid_year_goes_stale_after_rollover(self):
+        self.store.write('results', 2023, RESULTS.assign(season='2023'))
+        manifest_path = self.store._season_dir('results', 2023) / '_manifest.json'
+        manifest = json.loads(manifest_path.read_text())
+        manifest['synced_at'] = datetime.datetime(2023, 6, 15).timestamp()
+        manifest_path.write_text(json.dumps(manifest))
+
+        self.assertFalse(self.store.has('results', 2023))
+        self.assertIsNone(self.store.read_endpoint(f"{BASE}/2023/results.json"))
+        self.assertTrue(self.store.has('results', 2023, 1))  # raced rounds stay final
+
+        manifest['synced_at'] = datetime.datetime(2024, 1, 2).timestamp()
+        manifest_path.write_text(json.dumps(manifest))
+        self.assertTrue(self.store.has('results', 2023))
+
+    def test_transformer_load_uses_store(self):
+        transformer = EndpointRouter(store=self.store).kind_map['driverStandings']
+        transformer.transform = ExplodingTransformer().transform
+        self.store.write('driverStandings', 2021, pd.DataFrame({
+            'season': ['2021'], 'driver_id': ['max_verstappen'], 'points': [395.5]
+        }))
+        df = transformer.load(f"{BASE}/2021/driverStandings.json", columns=['driver_id', 'points'])
+        self.assertEqual(df.values.tolist(), [['max_verstappen', 395.5]])
+
+    def test_laps_store_raw_timings(self):
+        timings = pd.DataFrame({
+            'season': ['2021'] * 3, 'round': ['1'] * 3, 'race_name': ['Bahrain'] * 3,
+            'circuit_name': ['Sakhir'] * 3, 'lap_number': [1, 2, 3],
+            'driver_id': ['hamilton'] * 3, 'position': [1, 1, 1],
+            'time': ['1:35.000', '1:34.000', '1:34.500'],
+        })
+        self.store.write('laps', 2021, timings)
+        transformer = LapTimesTransformer(store=self.store)
+        transformer.transform = ExplodingTransformer().transform
+        df = transformer.load(f"{BASE}/2021/1/laps.json")
+        self.assertEqual(df[['driver_id', 'fastest_lap_time', 'fastest_lap_number']].values.tolist(),
+                         [['hamilton', 94.0, 2]])
+
+
+class StubSnapshotTransformer:
+    def __init__(self, df):
+        self.df = df
+        self.calls = []
+
+    def snapshot(self, endpoint):
+        self.calls.append(str(endpoint))
+        return self.df
+
+
+class TestIngest(unittest.TestCase):
+    def test_parse_seasons(self):
+        self.assertEqual(parse_seasons(['2018-2020', '2023', '2019']), [2018, 2019, 2020, 2023])
+
+    def test_ingest_writes_non_empty_snapshots(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = F1DataStore(tmp, current_year=2024)
+            router = EndpointRouter(store=store)
+            router.register('results', StubSnapshotTransformer(RESULTS))
+            router.register('status', StubSnapshotTransformer(pd.DataFrame()))
+            written = ingest([2021], ['results', 'status'], store=store, router=router)
+            self.assertEqual(written, {(2021, 'results'): 5, (2021, 'status'): 0})
+            self.assertTrue(store.has('results', 2021))
+            self.assertFalse(store.has('status', 2021))
+
+    def test_ingest_stores_sprints_from_2021(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = F1DataStore(tmp, current_year=2024)
+            router = EndpointRouter(store=store)
+            sprint = StubSnapshotTransformer(RESULTS.head(1))
+            router.register('sprint', sprint)
+            written = ingest([2020, 2021], ['sprint'], store=store, router=router)
+            self.assertEqual(written, {(2021, 'sprint'): 1})
+            self.assertEqual(sprint.calls, [f"{BASE}/2021/sprint.json"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+import asyncio
+import io
+import json
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from a2_transform.transformers.standings import StandingsTransformer
+from telemetry import Trace, bind, current_span, current_trace, span
+
+STANDINGS = {
+    "MRData": {
+        "StandingsTable": {
+            "season": "2023",
+            "StandingsLists": [{
+                "round": "22",
+                "DriverStandings": [{
+                    "position": "1", "points": "575", "wins": "19",
+                    "Driver": {"driverId": "max_verstappen", "givenName": "Max", "familyName": "Verstappen"},
+                    "Constructors": [{"name": "Red Bull"}],
+                }],
+            }],
+        }
+    }
+}
+
+
+class StubFetcher:
+    def get_json(self, url, params=None):
+        with span("fetch", url=url) as fetch_span:
+            fetch_span.add(cache_misses=1)
+            with span("http") as http_span:
+                http_span.add(bytes=1234)
+            return STANDINGS
+
+
+class TestSpans(unittest.TestCase):
+    def test_span_is_a_noop_without_a_trace(self):
+        with span("anything", rows=3) as s:
+            s.add(rows=1)
+        self.assertIsNone(current_trace())
+        current_span().set(ignored=True)
+
+    def test_spans_nest_under_the_active_span(self):
+        trace = Trace("query")
+
+        def work():
+            with span("outer") as outer:
+                with span("inner") as inner:
+                    inner.add(rows=2)
+                    inner.add(rows=3)
+            return outer, inner
+
+        outer, inner = trace.run(work)
+        trace.finish()
+        self.assertEqual(outer.parent_id, trace.root.span_id)
+        self.assertEqual(inner.parent_id, outer.span_id)
+        self.assertEqual(inner.attributes["rows"], 5)
+        self.assertIsNone(current_trace())
+
+    def test_errors_are_recorded_and_reraised(self):
+        trace = Trace()
+
+        def fail():
+            with span("boom"):
+                raise ValueError("bad payload")
+
+        with self.assertRaises(ValueError):
+            trace.run(fail)
+        self.assertEqual(trace.spans[-1].error, "ValueError: bad payload")
+
+    def test_bind_carries_the_trace_into_worker_threads(self):
+        trace = Trace()
+
+        def fetch(i):
+            with span("page") as s:
+                s.add(bytes=100)
+            return i
+
+        def work():
+            with span("pages"):
+                with ThreadPoolExecutor(max_workers=3) as pool:
+                    return list(pool.map(bind(fetch), range(6)))
+
+        self.assertEqual(trace.run(work), list(range(6)))
+        parent = next(s for s in trace.spans if s.name == "pages")
+        pages = [s for s in trace.spans if s.name == "page"]
+        self.assertEqual(len(pages), 6)
+        self.assertTrue(all(s.parent_id == parent.span_id for s in pages))
+
+    def test_activated_inside_tasks(self):
+        trace = Trace()
+
+        async def stage(i):
+            with trace.activated():
+                with span("task"):
+                    await asyncio.sleep(0)
+
+        async def main():
+            await asyncio.gather(*(stage(i) for i in range(4)))
+
+        asyncio.run(main())
+        self.assertEqual(sum(s.name == "task" for s in trace.spans), 4)
+        self.assertIsNone(current_trace())
+
+
+class TestTraceExport(unittest.TestCase):
+    def setUp(self):
+        self.trace = Trace("query", query="standings")
+        transformer = StandingsTransformer(fetcher=StubFetcher())
+        self.df = self.trace.run(transformer.load, "http://ergast.com/api/f1/2023/driverStandings.json")
+        self.trace.finish()
+
+    def test_summary_aggregates_stages(self):
+        summary = self.trace.summary().set_index("stage")
+        self.assertEqual(summary.loc["transform.driverStandings", "rows"], len(self.df))
+        self.assertEqual(summary.loc["parse", "rows"], 1)
+        self.assertEqual(summary.loc["http", "bytes"], 1234)
+        self.assertEqual(summary.loc["fetch", "cache_misses"], 1)
+        self.assertIn("Trace", self.trace.format_summary())
+
+    def test_jsonl_follows_the_otel_span_shape(self):
+        out = io.StringIO()
+        self.trace.write_jsonl(out)
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(len(records), len(self.trace.spans))
+        root = records[0]
+        self.assertIsNone(root["parent_span_id"])
+        self.assertEqual(len(root["trace_id"]), 32)
+        self.assertEqual(root["attributes"]["query"], "standings")
+        self.assertTrue(all(r["end_time_unix_nano"] >= r["start_time_unix_nano"] for r in records))
+        load = next(r for r in records if r["name"] == "transform.driverStandings")
+        self.assertIsInstance(load["attributes"]["endpoint"], str)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+
+import pandas as pd
+
+from a1_query.models import QueryParameters
+from a1_query.url_builder import ErgastURLBuilder
+from a2_transform.filters import apply_local_filters
+from api.endpoint import Endpoint
+
+BASE = ErgastURLBuilder.BASE_URL
+
+
+def build(**kwargs):
+    params = QueryParameters(primary_entity="driver", **kwargs)
+    return [str(e) for e in ErgastURLBuilder().build_endpoints(params)]
+
+
+class TestEndpointPlanning(unittest.TestCase):
+    def test_duplicates_are_dropped(self):
+        builder = ErgastURLBuilder()
+        endpoint = Endpoint.parse(f"{BASE}/2023/status.json")
+        self.assertEqual(builder._plan_endpoints([endpoint, endpoint]), [endpoint])
+
+    def test_few_drivers_keep_their_own_calls(self):
+        endpoints = build(
+            entity_ids={"drivers": ["hamilton", "alonso"]},
+            metrics=["results"],
+            time_scope={"years": [2023]},
+        )
+        self.assertEqual(endpoints, [
+            f"{BASE}/2023/drivers/hamilton/results.json",
+            f"{BASE}/2023/drivers/alonso/results.json",
+        ])
+
+    def test_many_drivers_coalesce_into_season_call(self):
+        endpoints = build(
+            entity_ids={"drivers": ["max_verstappen", "hamilton", "alonso"]},
+            metrics=["results", "qualifying"],
+            time_scope={"years": [2022, 2023]},
+        )
+        self.assertEqual(endpoints, [
+            f"{BASE}/2022/results.json?limit=1000&driver_id=max_verstappen%2Chamilton%2Calonso",
+            f"{BASE}/2023/results.json?limit=1000&driver_id=max_verstappen%2Chamilton%2Calonso",
+            f"{BASE}/2022/qualifying.json?limit=1000&driver_id=max_verstappen%2Chamilton%2Calonso",
+            f"{BASE}/2023/qualifying.json?limit=1000&driver_id=max_verstappen%2Chamilton%2Calonso",
+        ])
+
+    def test_season_call_subsumes_entity_calls(self):
+        builder = ErgastURLBuilder()
+        planned = builder._plan_endpoints([
+            Endpoint.parse(f"{BASE}/2023/results.json"),
+            Endpoint.parse(f"{BASE}/2023/drivers/hamilton/results.json"),
+        ])
+        self.assertEqual([str(e) for e in planned], [f"{BASE}/2023/results.json"])
+
+    def test_laps_cover_the_whole_season(self):
+        endpoints = build(metrics=["laps"], time_scope={"years": [2023]})
+        self.assertEqual(endpoints, [f"{BASE}/2023/laps.json"])
+        endpoints = build(metrics=["laps"], time_scope={"years": [2023], "rounds": [5]})
+        self.assertEqual(endpoints, [f"{BASE}/2023/5/laps.json"])
+
+    def test_local_filters_round_trip(self):
+        endpoint = Endpoint.parse(f"{BASE}/2023/results.json?limit=1000&driver_id=hamilton%2Calonso")
+        self.assertEqual(endpoint.url, f"{BASE}/2023/results.json?limit=1000")
+        filters = endpoint.filter_map
+        self.assertEqual(filters, {"driver_id": ["hamilton", "alonso"]})
+        df = pd.DataFrame({"driver_id": ["hamilton", "norris", "alonso"], "points": [25, 18, 15]})
+        self.assertEqual(apply_local_filters(df, filters)["driver_id"].tolist(), ["hamilton", "alonso"])
+
+    def test_filter_on_missing_column_matches_nothing(self):
+        df = pd.DataFrame({"constructor_id": ["mercedes", "ferrari"], "points": [25, 18]})
+        filtered = apply_local_filters(df, {"driver_id": ["hamilton"]})
+        self.assertTrue(filtered.empty)
+        self.assertEqual(filtered.columns.tolist(), ["constructor_id", "points"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+
+from a1_query.url_validator import ErgastEndpointValidator
+
+BASE = "http://ergast.com/api/f1"
+
+
+class TestErgastEndpointValidator(unittest.TestCase):
+    def setUp(self):
+        self.validator = ErgastEndpointValidator()
+
+    def test_match_returns_endpoint_kind(self):
+        cases = {
+            f"{BASE}/2023/drivers/hamilton/results.json": "result",
+            f"{BASE}/2023/results.json?limit=1000&driver_id=hamilton": "result",
+            f"{BASE}/2023/drivers/piastri/qualifying.json": "qualifying",
+            f"{BASE}/2023/5/laps.json": "lap",
+            f"{BASE}/2023/5/laps/10.json": "lap",
+            f"{BASE}/2023/laps.json": "lap",
+            f"{BASE}/2023/driverStandings.json": "driverstanding",
+            f"{BASE}/2023/constructorStandings.json": "constructorstanding",
+            f"{BASE}/2023/constructors/ferrari/status.json": "status",
+        }
+        for url, kind in cases.items():
+            with self.subTest(url=url):
+                self.assertEqual(self.validator.match(url), kind)
+                self.assertTrue(self.validator.validate(url))
+
+    def test_rejects_unknown_routes(self):
+        self.assertIsNone(self.validator.match(f"{BASE}/2023/drivers/hamilton/status.json"))
+        self.assertIsNone(self.validator.match(f"{BASE}/2023/laps/10.json"))
+        self.assertFalse(self.validator.validate(f"{BASE}/2023/weather.json"))
+        # Planner-only kinds, expanded by StandingsTransformer rather than fetched
+        self.assertIsNone(self.validator.match(f"{BASE}/2023/driverStandingsByRound.json"))
+        self.assertIsNone(self.validator.match(f"{BASE}/2023/constructorStandingsByRound.json"))
+
+    def test_maps_driver_aliases_per_segment(self):
+        self.assertEqual(
+            self.validator.normalize(f"{BASE}/2023/drivers/carlos_sainz/results.json"),
+            "/f1/2023/drivers/sainz/results.json",
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()